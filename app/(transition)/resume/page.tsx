@@ -2,6 +2,7 @@
 import { promises as fs } from 'node:fs'
 import path from 'node:path'
 import ResumePageContent from '../../components/ResumePageContent'
+import { loadResume } from '../../lib/resumeExport'
 
 export const metadata = {
   description: 'Professional resume of Stefanie Jane, full-stack developer and designer.',
@@ -13,8 +14,7 @@ export default async function ResumePage() {
   const resumePath = path.join(process.cwd(), 'content/resume/resume.md')
   const rawContent = await fs.readFile(resumePath, 'utf-8')
 
-  // Remove frontmatter (everything between --- markers at the start)
-  const content = rawContent.replace(/^---[\s\S]*?---\n*/, '')
+  const resume = await loadResume(path.join(process.cwd(), 'public/resume.json'), rawContent)
 
-  return <ResumePageContent content={content} />
+  return <ResumePageContent resume={resume} />
 }
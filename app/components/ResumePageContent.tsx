@@ -2,7 +2,7 @@
 'use client'
 
 import { motion } from 'framer-motion'
-import React, { useMemo } from 'react'
+import React from 'react'
 import {
   FiAward,
   FiBriefcase,
@@ -18,7 +18,7 @@ import {
 import ReactMarkdown from 'react-markdown'
 import { css } from '../../styled-system/css'
 import { styled } from '../../styled-system/jsx'
-import { parseResume } from '../lib/resumeParser'
+import type { ParsedResume } from '../lib/resumeParser'
 import PageLayout from './PageLayout'
 import PageTitle from './PageTitle'
 
@@ -597,11 +597,9 @@ const MarkdownContent: React.FC<{ content: string }> = ({ content }) => {
 // Component
 // ═══════════════════════════════════════════════════════════════════════════
 
-const ResumePageContent: React.FC<{ content: string }> = ({ content }) => {
-  // Parse the resume markdown
-  const resumeData = useMemo(() => parseResume(content), [content])
-
-  const { name, tagline, contact, summary, skills, experience, projects, speaking, awards, interests } = resumeData
+const ResumePageContent: React.FC<{ resume: ParsedResume }> = ({ resume }) => {
+  // Parsed on the server (or by scripts/resume-pdf), so the client only renders
+  const { name, tagline, contact, summary, skills, experience, projects, speaking, awards, interests } = resume
 
   // Filter out empty skill categories
   const displaySkills = Object.entries(skills).filter(([_, items]) => items.length > 0)
@@ -0,0 +1,29 @@
+// app/lib/resumeExport.ts
+import { createHash } from 'node:crypto'
+import { promises as fs } from 'node:fs'
+import { type ParsedResume, parseResume } from './resumeParser'
+
+// Written by `resume-pdf --formats pdf,json` next to public/resume.pdf
+export async function loadExport(jsonPath: string, rawContent: string): Promise<ParsedResume | null> {
+  try {
+    const { source, ...resume } = JSON.parse(await fs.readFile(jsonPath, 'utf-8'))
+    // The export records a hash of the markdown it came from; ignore a stale one
+    const digest = createHash('sha256').update(rawContent).digest('hex')
+    return source === digest ? (resume as ParsedResume) : null
+  } catch {
+    return null
+  }
+}
+
+// The exported model when it is current, else the markdown parsed here
+export async function loadResume(jsonPath: string, rawContent: string): Promise<ParsedResume> {
+  const exported = await loadExport(jsonPath, rawContent)
+  if (exported) {
+    return exported
+  }
+
+  // Remove frontmatter (everything between --- markers at the start)
+  const content = rawContent.replace(/^---[\s\S]*?---\n*/, '')
+
+  return parseResume(content)
+}
@@ -0,0 +1,343 @@
+"""Rendering backends: headless Chromium through Playwright, or WeasyPrint.
+
+Both print the templated HTML the one pipeline (pipeline.py) builds, behind
+the same interface. A backend is an async context manager with:
+
+- ``print_pdf(html_output, output_path=None, paper=None)``: the PDF bytes,
+  also written to output_path when one is given; paper replaces Letter.
+  A streaming backend writes output_path as it prints and returns None
+- ``stats``: a PoolStats of what it has rendered so far
+- ``name``: "playwright" or "weasyprint"
+
+PlaywrightBackend is the BrowserPool, warm pages and all, and is the only
+one that can capture PNG thumbnails, fit a document to a page count or
+print one in shards.
+
+WeasyPrintBackend renders in-process. It parses the template's stylesheet
+once into a CSS object and shares one FontConfiguration across renders, so
+each document only has its body parsed and laid out.
+
+``--backend auto`` resolves to one of them per job (choose_backend()).
+"""
+
+import asyncio
+import functools
+import re
+import statistics
+import time
+import tracemalloc
+
+from browser_pool import HEAP_USED_JS, BrowserPool, PoolStats
+from fit_pages import pdf_page_count, print_to_pages
+from hermetic import LOCAL_SCHEMES, font_bundle
+from pdf_stream import stream_pdf
+from pipeline import (
+    DEFAULT_RENDER_OPTIONS,
+    PDF_OPTIONS,
+    compiled_template_source,
+    load_html,
+    print_pdf,
+)
+from profiling import profile_stage
+from shards import print_sharded
+
+BACKENDS = ("playwright", "weasyprint")
+AUTO = "auto"
+
+# Markdown above this size goes to Chromium under --backend auto: WeasyPrint
+# lays a document out in Python, and falls behind as the document grows
+AUTO_WEASYPRINT_MAX_BYTES = 64 * 1024
+
+# The template's one stylesheet, parsed once by WeasyPrintBackend
+_STYLE_BLOCK = re.compile(r"<style>(.*?)</style>", re.S)
+
+
+class PlaywrightBackend(BrowserPool):
+    """Print on the warm Chromium pages of a BrowserPool.
+
+    With ``fit_pages``, every document's type is scaled to fill that many
+    pages (see fit_pages); ``last_fit`` is the Fit of the latest one. With
+    ``shards`` above 1, long Letter documents print as that many shards
+    on separate pages at once and are merged (see shards). With
+    ``stream``, other PDFs printed to an output path are streamed to it
+    rather than returned (see pdf_stream); fitted ones are not, as fitting
+    counts the pages of the printed bytes.
+    """
+
+    name = "playwright"
+
+    def __init__(self, *args, fit_pages=None, shards=1, stream=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fit_pages = fit_pages
+        self.shards = shards
+        self.stream = stream
+        self.last_fit = None
+
+    async def print_pdf(self, html_output, output_path=None, paper=None):
+        if self.shards > 1 and paper is None and not self.fit_pages:
+            return await print_sharded(self, html_output, self.shards, output_path)
+        if self.stream and output_path is not None and not self.fit_pages:
+            await self.stream_pdf(html_output, output_path, paper)
+            return None
+        if paper is None and not self.fit_pages:
+            return await self.run(lambda page: print_pdf(page, html_output, output_path))
+        paper = paper or PDF_OPTIONS["format"]
+
+        async def on_page(page):
+            await load_html(page, html_output)
+            if self.fit_pages:
+                pdf, self.last_fit = await print_to_pages(page, self.fit_pages, paper, output_path)
+                return pdf
+            with profile_stage("page.pdf", paper=paper):
+                return await page.pdf(path=output_path, **{**PDF_OPTIONS, "format": paper})
+
+        return await self.run(on_page)
+
+    async def stream_pdf(self, html_output, destination, paper=None):
+        """Print html_output to destination, a path or binary writable, in chunks.
+
+        Returns the number of bytes written.
+        """
+
+        async def on_page(page):
+            await load_html(page, html_output)
+            return await stream_pdf(page, destination, paper)
+
+        return await self.run(on_page)
+
+    async def heap_used(self):
+        """Used JS heap of a pooled page, in bytes."""
+        return await self.run(lambda page: page.evaluate(HEAP_USED_JS))
+
+
+def load_weasyprint():
+    """The weasyprint module and its FontConfiguration class.
+
+    Raises RuntimeError if WeasyPrint or the native libraries it loads
+    (Pango) are missing.
+    """
+    try:
+        import weasyprint
+        from weasyprint.text.fonts import FontConfiguration
+    except (ImportError, OSError) as e:
+        raise RuntimeError(
+            f"The weasyprint backend needs WeasyPrint and Pango "
+            f"(pip install 'resume-pdf[weasyprint]'): {e}"
+        ) from e
+    return weasyprint, FontConfiguration
+
+
+def offline_url_fetcher(weasyprint):
+    """WeasyPrint URL fetcher answering from the font bundle and nothing else."""
+    try:
+        bundle = font_bundle()
+    except FileNotFoundError:
+        bundle = None
+
+    def fetch(url, *args, **kwargs):
+        if url.startswith(LOCAL_SCHEMES):
+            return weasyprint.default_url_fetcher(url, *args, **kwargs)
+        found = bundle.lookup(url) if bundle is not None else None
+        if found is None:
+            raise ValueError(f"Blocked offline: {url}")
+        body, content_type = found
+        return {"string": body, "mime_type": content_type.split(";")[0], "redirected_url": url}
+
+    return fetch
+
+
+def page_css(paper):
+    """@page rule giving WeasyPrint the paper and margins Chromium prints with."""
+    margin = PDF_OPTIONS["margin"]
+    margins = " ".join(margin[side] for side in ("top", "right", "bottom", "left"))
+    return f"@page {{ size: {paper}; margin: {margins}; }}"
+
+
+class WeasyPrintBackend:
+    """Print in-process with WeasyPrint, one document at a time.
+
+    Documents from the page template have its <style> block swapped for the
+    CSS object parsed on start(); any other HTML is rendered as it is.
+    Rendering runs in a worker thread, so the event loop keeps serving
+    while a document is laid out.
+    """
+
+    name = "weasyprint"
+
+    def __init__(self, offline=False):
+        self.offline = offline
+        self.stats = PoolStats()
+        self._weasyprint = None
+        self._font_config = None
+        self._fetcher = None
+        self._style_block = None
+        self._stylesheet = None
+        self._papers = {}
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Load WeasyPrint and parse the template's stylesheet."""
+        if self._weasyprint is not None:
+            return
+        with profile_stage("weasyprint start"):
+            weasyprint, FontConfiguration = load_weasyprint()
+            self._font_config = FontConfiguration()
+            self._fetcher = (
+                offline_url_fetcher(weasyprint) if self.offline else weasyprint.default_url_fetcher
+            )
+            match = _STYLE_BLOCK.search(compiled_template_source())
+            self._style_block = match.group(0)
+            self._stylesheet = weasyprint.CSS(
+                string=match.group(1), font_config=self._font_config, url_fetcher=self._fetcher
+            )
+        self._weasyprint = weasyprint
+
+    async def close(self):
+        self._papers.clear()
+
+    def _paper(self, paper):
+        if paper not in self._papers:
+            self._papers[paper] = self._weasyprint.CSS(
+                string=page_css(paper), font_config=self._font_config
+            )
+        return self._papers[paper]
+
+    def _render(self, html_output, output_path, paper):
+        stylesheets = [self._paper(paper)]
+        if self._style_block in html_output:
+            html_output = html_output.replace(self._style_block, "", 1)
+            stylesheets.insert(0, self._stylesheet)
+        with profile_stage("weasyprint parse"):
+            html = self._weasyprint.HTML(string=html_output, url_fetcher=self._fetcher)
+        with profile_stage("weasyprint layout"):
+            document = html.render(stylesheets=stylesheets, font_config=self._font_config)
+        with profile_stage("weasyprint write_pdf"):
+            pdf = document.write_pdf()
+        if output_path is not None:
+            with open(output_path, "wb") as file:
+                file.write(pdf)
+        return pdf
+
+    async def print_pdf(self, html_output, output_path=None, paper=None):
+        await self.start()
+        self.stats.waiting += 1
+        try:
+            await self._lock.acquire()
+        finally:
+            self.stats.waiting -= 1
+        self.stats.busy += 1
+        try:
+            paper = paper or PDF_OPTIONS["format"]
+            return await asyncio.to_thread(self._render, html_output, output_path, paper)
+        finally:
+            self.stats.busy -= 1
+            self.stats.renders += 1
+            self._lock.release()
+
+
+@functools.cache
+def weasyprint_available():
+    try:
+        load_weasyprint()
+    except RuntimeError:
+        return False
+    return True
+
+
+def choose_backend(requested, input_sizes=(), options=DEFAULT_RENDER_OPTIONS, warm=False):
+    """The backend to render with, and why, for a --backend value.
+
+    ``auto`` takes WeasyPrint for one small document: it needs no browser
+    launch, which dominates a single render, and runs in less memory. It
+    takes Chromium when the job keeps a browser warm (``warm``: batches,
+    variants, --watch, --serve), when a document is larger than
+    AUTO_WEASYPRINT_MAX_BYTES of markdown, when options ask for PNG
+    thumbnails, fitting or shards, or when WeasyPrint cannot load.
+    """
+    if requested != AUTO:
+        return requested, "requested"
+    if warm or len(input_sizes) != 1:
+        return "playwright", "a warm browser prints many documents at once"
+    if "png" in options.formats:
+        return "playwright", "PNG thumbnails need Chromium"
+    if options.fit_pages:
+        return "playwright", "--fit-pages measures the layout in Chromium"
+    if options.shards > 1:
+        return "playwright", "--shards prints on several Chromium pages"
+    if input_sizes[0] > AUTO_WEASYPRINT_MAX_BYTES:
+        return "playwright", "Chromium lays out large documents faster"
+    if not weasyprint_available():
+        return "playwright", "WeasyPrint is not installed"
+    return "weasyprint", "one small document renders without launching a browser"
+
+
+async def measure_backend(backend, html_output, renders):
+    """Latency, memory and output of one backend printing html_output."""
+    start = time.perf_counter()
+    async with backend:
+        pdf = await backend.print_pdf(html_output)
+        first = time.perf_counter() - start
+        warm = []
+        for _ in range(renders):
+            start = time.perf_counter()
+            pdf = await backend.print_pdf(html_output)
+            warm.append(time.perf_counter() - start)
+        # Traced separately: tracemalloc slows the Python-side work down
+        tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        await backend.print_pdf(html_output)
+        peak = tracemalloc.get_traced_memory()[1] - base
+        if tracing:
+            tracemalloc.stop()
+        heap = await backend.heap_used() if isinstance(backend, PlaywrightBackend) else None
+    return {
+        "first_ms": first * 1000,
+        "warm_ms": statistics.median(warm) * 1000 if warm else None,
+        "python_peak_mb": peak / 2**20,
+        "js_heap_mb": heap / 2**20 if heap else None,
+        "pages": pdf_page_count(pdf),
+        "pdf_kb": len(pdf) / 1024,
+    }
+
+
+async def compare_backends(html_output, backends, renders=3):
+    """Measure each backend in turn on html_output; an error string if it failed."""
+    results = {}
+    for backend in backends:
+        try:
+            results[backend.name] = await measure_backend(backend, html_output, renders)
+        except Exception as e:
+            results[backend.name] = str(e)
+    return results
+
+
+def format_comparison(results):
+    """Table of compare_backends() results, one row per backend."""
+
+    def cell(value, width, spec=".1f"):
+        return f"{'-':>{width}}" if value is None else f"{value:>{width}{spec}}"
+
+    lines = [
+        f"{'backend':<11} {'first ms':>9} {'warm ms':>9} {'py peak MB':>10} "
+        f"{'JS heap MB':>10} {'pages':>5} {'PDF KB':>8}"
+    ]
+    for name, result in results.items():
+        if isinstance(result, str):
+            lines.append(f"{name:<11} failed: {result}")
+            continue
+        lines.append(
+            f"{name:<11} {cell(result['first_ms'], 9)} {cell(result['warm_ms'], 9)} "
+            f"{cell(result['python_peak_mb'], 10)} {cell(result['js_heap_mb'], 10)} "
+            f"{cell(result['pages'], 5, 'd')} {cell(result['pdf_kb'], 8)}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Hold the CLI's no-op and cache-hit paths to a startup budget.
+
+Each command runs in a fresh interpreter: once under ``-X importtime`` to
+list what it imported, then --repeat times for its fastest wall time. A
+command fails the check if it imports any of the heavy modules the
+pipeline defers until a stage needs them, or if it takes more than
+--budget-ms longer than a bare ``python -c pass``.
+
+The cache-hit command renders nothing: the checker seeds a throwaway
+cache so the synthetic resume's PDF is already current.
+
+Usage: python bench_startup.py [--budget-ms 250] [--repeat 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from pipeline import DEFAULT_RENDER_OPTIONS, record_outputs, render_key
+from render_cache import RenderCache
+from synthetic_resume import synthetic_resume
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# What the resume-pdf console script runs
+CLI = ["-c", "import sys; from resume_pdf import main; sys.exit(main())"]
+SCRIPT = os.path.join(HERE, "resume_pdf.py")
+LEGACY_CLI = os.path.join(os.path.dirname(HERE), "resume_to_pdf.py")
+
+# Loaded only by the stages that use them
+DEFERRED_MODULES = ("playwright", "weasyprint", "emoji", "bs4", "markdown", "jinja2")
+
+# Over a bare interpreter. The deferred modules alone cost well over this,
+# so pulling one back into the startup path fails the check on any machine
+DEFAULT_BUDGET_MS = 250.0
+
+
+def seed_cache_hit(directory):
+    """Write a resume whose PDF the cache already holds; returns the CLI arguments."""
+    input_path = os.path.join(directory, "resume.md")
+    output_path = os.path.join(directory, "resume.pdf")
+    cache_dir = os.path.join(directory, "cache")
+    md_content = synthetic_resume(100)
+    with open(input_path, "w", encoding="utf-8") as file:
+        file.write(md_content)
+    with open(output_path, "wb") as file:
+        file.write(b"%PDF-1.7\n%%EOF\n")
+    cache = RenderCache(cache_dir)
+    record_outputs(cache, {"pdf": output_path}, render_key(md_content, DEFAULT_RENDER_OPTIONS))
+    cache.save()
+    return [*CLI, input_path, "-o", output_path, "--cache-dir", cache_dir]
+
+
+def imported_modules(argv):
+    """Top-level packages argv imports, and the total import time in ms."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+    )
+    modules, total = set(), 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # the header line
+        modules.add(name.strip().split(".")[0])
+        # Only the outermost imports, so nested ones aren't counted twice
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return modules, total / 1000
+
+
+def fastest_run(argv, repeat):
+    """Lowest wall time of argv over repeat runs, in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *argv], cwd=HERE, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return min(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Allowed time over a bare interpreter (default: {DEFAULT_BUDGET_MS})",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        commands = {
+            "import resume_pdf": ["-c", "import resume_pdf"],
+            "resume-pdf --help": [*CLI, "--help"],
+            "resume_pdf.py --help": [SCRIPT, "--help"],
+            "resume-pdf missing.md": [*CLI, os.path.join(directory, "missing.md")],
+            "resume-pdf (cache hit)": seed_cache_hit(directory),
+            "resume_to_pdf.py --help": [LEGACY_CLI, "--help"],
+        }
+        interpreter = fastest_run(["-c", "pass"], args.repeat)
+        width = max(len(name) for name in commands)
+        print(f"{'command':<{width}} {'wall ms':>8} {'over py':>8} {'import ms':>9}  heavy imports")
+        print(f"{'python -c pass':<{width}} {interpreter:>8.1f}")
+        failures = 0
+        for name, argv in commands.items():
+            modules, import_ms = imported_modules(argv)
+            heavy = sorted(set(DEFERRED_MODULES) & modules)
+            wall = fastest_run(argv, args.repeat)
+            over = wall - interpreter
+            failed = heavy or over > args.budget_ms
+            failures += bool(failed)
+            print(
+                f"{name:<{width}} {wall:>8.1f} {over:>+8.1f} {import_ms:>9.1f}  "
+                f"{', '.join(heavy) or '-'}{'  OVER BUDGET' if failed else ''}"
+            )
+
+    print(f"\n{failures} of {len(commands)} commands over the {args.budget_ms:.0f} ms budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
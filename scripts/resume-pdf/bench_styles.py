@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark Chromium style recalculation and layout for the resume stylesheet.
+
+Each synthetic resume is printed with three stylesheets: the template CSS
+with the sibling-combinator and :has() selectors it used before the DOM pass
+stamped classes, the template CSS as written, and the compiled sheet that
+is actually rendered. Times are Chromium's RecalcStyleDuration and
+LayoutDuration for loading and printing the page.
+
+Usage: python bench_styles.py [--roles 100 500 1000] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import re
+
+from jinja2 import Template
+from playwright.async_api import async_playwright
+
+from pipeline import HTML_TEMPLATE_SOURCE, PDF_OPTIONS, build_resume_html, html_template
+from synthetic_resume import synthetic_resume
+
+# The selectors the stamped classes replaced
+LEGACY_SELECTORS = {
+    "h3.employer": "#experience ~ h3",
+    ".role": "#experience ~ h3 ~ h4",
+    ".in-experience": "#experience ~ h3 ~ p, #experience ~ h3 ~ ul",
+    "li.tech-line": "li:has(strong:first-child)",
+}
+
+
+def legacy_template():
+    source = HTML_TEMPLATE_SOURCE
+    for selector, legacy in LEGACY_SELECTORS.items():
+        source = re.sub(rf"(?<![\w.-]){re.escape(selector)}(?![\w-])", legacy, source)
+    return Template(source)
+
+
+async def style_and_layout(page, session, html_output):
+    """Seconds of style recalculation and layout to load and print html_output."""
+
+    async def totals():
+        metrics = (await session.send("Performance.getMetrics"))["metrics"]
+        values = {metric["name"]: metric["value"] for metric in metrics}
+        return values["RecalcStyleDuration"], values["LayoutDuration"]
+
+    style_before, layout_before = await totals()
+    await page.set_content(html_output)
+    await page.pdf(**PDF_OPTIONS)
+    style_after, layout_after = await totals()
+    return style_after - style_before, layout_after - layout_before
+
+
+async def run(roles_list, repeat):
+    templates = {
+        "combinators": legacy_template(),
+        "authored": Template(HTML_TEMPLATE_SOURCE),
+        "compiled": html_template(),
+    }
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        session = await page.context.new_cdp_session(page)
+        await session.send("Performance.enable")
+
+        print(f"{'roles':>6} {'stylesheet':>12} {'style ms':>9} {'layout ms':>10}")
+        for roles in roles_list:
+            body_html = build_resume_html(synthetic_resume(roles))
+            body = body_html.split("<body>", 1)[1].rsplit("</body>", 1)[0]
+            for name, template in templates.items():
+                html_output = template.render(content=body)
+                samples = [
+                    await style_and_layout(page, session, html_output) for _ in range(repeat)
+                ]
+                style, layout = min(samples, key=sum)
+                print(f"{roles:>6} {name:>12} {style * 1000:>9.1f} {layout * 1000:>10.1f}")
+        await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roles", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.roles, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Time every pipeline stage on a scaling corpus and catch regressions.
+
+``run`` renders synthetic resumes of increasing size (large skill sections,
+an emoji on most lines, links on most skills) with each backend, under the
+profiler, and writes the fastest time of each stage to a results file.
+``compare`` checks a results file against a baseline and exits non-zero
+if any stage got slower than the threshold allows. ``corpus`` writes the
+synthetic resumes out, to render or profile them by hand.
+
+Everything runs offline: the browser gets the font bundle when it has
+been fetched and no network at all otherwise, and WeasyPrint is handed a
+URL fetcher that does the same. Both print through the backends the CLI
+uses, WeasyPrint with its stylesheet parsed once. Stages below
+``--min-ms`` in both files are too noisy to compare and are skipped.
+
+Usage:
+    python bench_suite.py run [--roles 10 100 1000 5000] [--repeat 3]
+                              [--backends playwright weasyprint] [--output FILE]
+    python bench_suite.py compare BASELINE RESULTS [--threshold 0.15] [--min-ms 1]
+    python bench_suite.py corpus DIR [--roles ...]
+"""
+
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+import platform
+import sys
+
+from backends import BACKENDS, PlaywrightBackend, WeasyPrintBackend
+from hermetic import block_network, font_bundle
+from pipeline import build_resume_html, package_version
+from profiling import Profiler, profile_stage
+from synthetic_resume import synthetic_resume
+
+DEFAULT_ROLES = (10, 100, 1000, 5000)
+DEFAULT_RESULTS_PATH = "bench-results.json"
+DEFAULT_BASELINE_PATH = "bench-baseline.json"
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_MIN_MS = 1.0
+
+RESULTS_VERSION = 1
+
+# Heavier than the transform benchmarks' corpus, to load the skill and
+# emoji handling and the link-dense layout
+CORPUS_SKILL_ITEMS = 200
+CORPUS_EMOJI_RATE = 0.8
+CORPUS_LINK_RATE = 0.8
+
+
+def build_corpus(roles):
+    """Synthetic resume markdown for each role count."""
+    return {
+        count: synthetic_resume(
+            count,
+            skill_items=CORPUS_SKILL_ITEMS,
+            emoji_rate=CORPUS_EMOJI_RATE,
+            link_rate=CORPUS_LINK_RATE,
+        )
+        for count in roles
+    }
+
+
+def fastest(samples):
+    """Per stage, the lowest wall and CPU time across samples, in ms."""
+    stages = {}
+    for stats in samples:
+        for name, stage in stats.items():
+            best = stages.setdefault(
+                name, {"wall_ms": float("inf"), "cpu_ms": float("inf"), "calls": stage.calls}
+            )
+            best["wall_ms"] = min(best["wall_ms"], round(stage.wall * 1000, 3))
+            best["cpu_ms"] = min(best["cpu_ms"], round(stage.cpu * 1000, 3))
+    return stages
+
+
+def offline_setup():
+    """BrowserPool context hook keeping the browser offline, and how fonts load."""
+    try:
+        return font_bundle().install, "bundled"
+    except FileNotFoundError:
+        return block_network, "blocked"
+
+
+def open_bench_backend(name):
+    """The named backend, kept offline."""
+    if name == "weasyprint":
+        return WeasyPrintBackend(offline=True)
+    setup, _ = offline_setup()
+    return PlaywrightBackend(size=1, context_setup=setup)
+
+
+async def bench_backend(name, corpus, repeat):
+    """Stage times of each corpus entry printed with the named backend."""
+    results = {}
+    async with open_bench_backend(name) as backend:
+        # Warm the backend so the first size doesn't pay for its start-up
+        await backend.print_pdf(build_resume_html(next(iter(corpus.values()))))
+        for roles, md_content in corpus.items():
+            samples = []
+            for _ in range(repeat):
+                with Profiler(trace_memory=False) as profiler, profile_stage("total"):
+                    html_output = build_resume_html(md_content)
+                    await backend.print_pdf(html_output)
+                samples.append(profiler.stats)
+            results[roles] = fastest(samples)
+            print(f"{name} {roles:>6} roles done", file=sys.stderr)
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "playwright": package_version("playwright"),
+        "weasyprint": package_version("weasyprint"),
+        "fonts": offline_setup()[1],
+    }
+
+
+async def run_benchmarks(roles, backends, repeat):
+    corpus = build_corpus(roles)
+    results = {}
+    for backend in backends:
+        try:
+            results[backend] = await bench_backend(backend, corpus, repeat)
+        except Exception as e:
+            print(f"{backend}: skipped ({e})", file=sys.stderr)
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "repeat": repeat,
+        "corpus": {
+            str(count): hashlib.sha256(md_content.encode("utf-8")).hexdigest()[:16]
+            for count, md_content in corpus.items()
+        },
+        "results": {
+            backend: {str(count): stages for count, stages in sizes.items()}
+            for backend, sizes in results.items()
+        },
+    }
+
+
+def format_results(report):
+    """One table per backend: fastest wall ms of each stage, per size."""
+    tables = []
+    for backend, sizes in report["results"].items():
+        counts = list(sizes)
+        largest = sizes[counts[-1]]
+        stages = sorted(largest, key=lambda name: largest[name]["wall_ms"], reverse=True)
+        width = max(len(backend), *(len(name) for name in stages))
+        lines = [f"{backend:<{width}}" + "".join(f" {count + ' roles':>12}" for count in counts)]
+        for name in stages:
+            cells = (sizes[count].get(name, {}).get("wall_ms") for count in counts)
+            lines.append(
+                f"{name:<{width}}"
+                + "".join(
+                    f" {cell:>12.1f}" if cell is not None else f" {'-':>12}" for cell in cells
+                )
+            )
+        tables.append("\n".join(lines))
+    return "\n\n".join(tables)
+
+
+def load_report(path):
+    if not os.path.isfile(path):
+        raise SystemExit(f"{path} not found; write it with `bench_suite.py run --output {path}`")
+    with open(path, encoding="utf-8") as file:
+        report = json.load(file)
+    if report.get("version") != RESULTS_VERSION:
+        raise SystemExit(f"{path}: unsupported results version {report.get('version')}")
+    return report
+
+
+def compare_reports(baseline, current, threshold, min_ms):
+    """Every stage timed in both reports, as (backend, roles, stage, old, new).
+
+    Returns the rows compared and the rows slower than threshold allows.
+    Stages under min_ms in both reports are left out as noise.
+    """
+    compared, slower = [], []
+    for backend, sizes in current["results"].items():
+        for count, stages in sizes.items():
+            base_stages = baseline["results"].get(backend, {}).get(count, {})
+            for name, stage in stages.items():
+                if name not in base_stages:
+                    continue
+                old, new = base_stages[name]["wall_ms"], stage["wall_ms"]
+                if max(old, new) < min_ms:
+                    continue
+                row = (backend, count, name, old, new)
+                compared.append(row)
+                if new > old * (1 + threshold):
+                    slower.append(row)
+    return compared, slower
+
+
+def compare_command(args):
+    baseline, current = load_report(args.baseline), load_report(args.results)
+    for key in ("environment", "corpus"):
+        if baseline.get(key) != current.get(key):
+            print(f"Warning: the {key} differs from the baseline's", file=sys.stderr)
+
+    compared, slower = compare_reports(baseline, current, args.threshold, args.min_ms)
+    rows = compared if args.all else slower
+    if rows:
+        width = max(len(row[2]) for row in rows)
+        print(f"{'backend':<10} {'roles':>6} {'stage':<{width}} {'base ms':>10} {'ms':>10} change")
+        for backend, count, name, old, new in rows:
+            change = new / old - 1 if old else float("inf")
+            mark = "  SLOWER" if (backend, count, name, old, new) in slower else ""
+            print(
+                f"{backend:<10} {count:>6} {name:<{width}} {old:>10.1f} {new:>10.1f} "
+                f"{change:>+6.0%}{mark}"
+            )
+    print(f"{len(slower)} of {len(compared)} stages slower than +{args.threshold:.0%}")
+    return 1 if slower else 0
+
+
+def run_command(args):
+    report = asyncio.run(run_benchmarks(args.roles, args.backends, args.repeat))
+    if not report["results"]:
+        raise SystemExit("No backend could run")
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+    print(format_results(report))
+    print(f"\nResults written to {args.output}")
+    return 0
+
+
+def corpus_command(args):
+    os.makedirs(args.directory, exist_ok=True)
+    for count, md_content in build_corpus(args.roles).items():
+        path = os.path.join(args.directory, f"synthetic-{count}.md")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(md_content)
+        print(path)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Time every stage and write a results file")
+    run.add_argument("--roles", type=int, nargs="+", default=list(DEFAULT_ROLES))
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    run.add_argument(
+        "--output",
+        default=DEFAULT_RESULTS_PATH,
+        help=f"Results file; save one as {DEFAULT_BASELINE_PATH} to compare against later",
+    )
+    run.set_defaults(handler=run_command)
+
+    compare = commands.add_parser("compare", help="Flag stages slower than the baseline")
+    compare.add_argument("baseline", nargs="?", default=DEFAULT_BASELINE_PATH)
+    compare.add_argument("results", nargs="?", default=DEFAULT_RESULTS_PATH)
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown as a fraction (default: {DEFAULT_THRESHOLD})",
+    )
+    compare.add_argument(
+        "--min-ms",
+        type=float,
+        default=DEFAULT_MIN_MS,
+        help=f"Skip stages faster than this in both files (default: {DEFAULT_MIN_MS})",
+    )
+    compare.add_argument("--all", action="store_true", help="List every stage compared")
+    compare.set_defaults(handler=compare_command)
+
+    corpus = commands.add_parser("corpus", help="Write the synthetic resumes to a directory")
+    corpus.add_argument("directory")
+    corpus.add_argument("--roles", type=int, nargs="+", default=list(DEFAULT_ROLES))
+    corpus.set_defaults(handler=corpus_command)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
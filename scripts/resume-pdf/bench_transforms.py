@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Benchmark the single-pass DOM transforms against the old multi-pass version.
+
+A second table times the whole markdown-to-body stage: Python-Markdown plus
+a BeautifulSoup round trip, against the in-tree ResumeExtension.
+
+Usage: python bench_transforms.py [--roles 100 500 1000] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import time
+
+import markdown
+from bs4 import BeautifulSoup
+
+from pipeline import (
+    MARKDOWN_EXTENSIONS,
+    SKILLS_SECTION_TITLES,
+    markdown_to_body,
+    preprocess_markdown,
+    process_skills_paragraph,
+    transform_html,
+    transforms,
+)
+from synthetic_resume import synthetic_resume
+
+# The separate find_all passes that transform_html used before the
+# TransformRegistry, kept here as the baseline being measured against.
+
+
+def legacy_process_header_section(soup):
+    """Process the header section to ensure proper centering."""
+    # Find the first two paragraphs (tagline and links)
+    paragraphs = soup.find_all("p")[:2]
+
+    for p in paragraphs:
+        # Add a special class to these paragraphs
+        p["class"] = p.get("class", []) + ["header-content"]
+        # Clean up whitespace between elements without destroying the links
+        for br in p.find_all("br"):
+            br.replace_with(" ")
+        # Join text nodes with single spaces
+        for text in p.find_all(string=True):
+            if text.strip():
+                text.replace_with(" " + text.strip() + " ")
+
+
+def legacy_process_job_entries(soup):
+    """Process job entries to combine role and date."""
+    for h4 in soup.find_all("h4"):
+        try:
+            # Find the next paragraph (date)
+            date_p = h4.find_next_sibling("p")
+            if not date_p or not date_p.find("em"):
+                continue
+
+            # Extract the date text from em tag
+            em_tag = date_p.find("em")
+            if not em_tag or not em_tag.string:
+                continue
+
+            date_text = em_tag.string.strip()
+
+            # Add date to h4 as data attribute
+            h4["data-date"] = date_text
+
+            # Create new span for title if h4 has content
+            if h4.string:
+                title_span = soup.new_tag("span")
+                title_span.string = h4.string.strip()
+                h4.string = ""
+                h4.append(title_span)
+
+            # Remove the original date paragraph
+            date_p.decompose()
+
+        except Exception as e:
+            print(f"Warning: Could not process job entry: {str(e)}")
+            continue
+
+
+def legacy_process_name(soup):
+    """Process the name to add gradient effect."""
+    h1 = soup.find("h1")
+    if h1 and h1.string:
+        name_span = soup.new_tag("span")
+        name_span.string = h1.string
+        h1.string = ""
+        h1.append(name_span)
+
+
+def legacy_mark_classes(soup):
+    """Stamp the classes that replaced the stylesheet's structural selectors and :has()."""
+    # #experience ~ h3, and #experience ~ h3 ~ h4, p and ul
+    experience = soup.find("h2", id="experience")
+    employers = experience.find_next_siblings("h3") if experience else []
+    for h3 in employers:
+        h3["class"] = h3.get("class", []) + ["employer"]
+    if employers:
+        for element in employers[0].find_next_siblings(["h4", "p", "ul"]):
+            role = "role" if element.name == "h4" else "in-experience"
+            element["class"] = element.get("class", []) + [role]
+
+    # li:has(strong:first-child)
+    for li in soup.find_all("li"):
+        if li.select_one("strong:first-child"):
+            li["class"] = li.get("class", []) + ["tech-line"]
+
+    # h2:first-of-type and h3:first-of-type
+    for name, first in (("h2", "first-section"), ("h3", "first-subsection")):
+        heading = soup.find(name)
+        if heading is not None:
+            heading["class"] = heading.get("class", []) + [first]
+
+    # #summary + p and #summary + p + p
+    element = soup.find("h2", id="summary")
+    for name in ("summary-first", "summary-second"):
+        element = element and element.find_next_sibling(True)
+        if element is None or element.name != "p":
+            break
+        element["class"] = element.get("class", []) + [name]
+
+
+def legacy_transform(soup):
+    legacy_process_name(soup)
+    legacy_process_header_section(soup)
+    legacy_process_job_entries(soup)
+    legacy_mark_classes(soup)
+    for h3 in soup.find_all("h3"):
+        if h3.text.strip() in SKILLS_SECTION_TITLES:
+            sibling = h3.find_next_sibling()
+            while sibling and sibling.name not in ["h2", "h3"]:
+                if sibling.name == "p":
+                    process_skills_paragraph(sibling, soup)
+                sibling = sibling.find_next_sibling()
+
+
+def single_pass_transform(soup):
+    transforms.apply(soup)
+
+
+def time_transform(transform, html_content, repeat):
+    """Best and median seconds spent in transform, excluding parsing."""
+    samples = []
+    output = ""
+    for _ in range(repeat):
+        soup = BeautifulSoup(html_content, "html.parser")
+        start = time.perf_counter()
+        transform(soup)
+        samples.append(time.perf_counter() - start)
+        output = str(soup)
+    return min(samples), statistics.median(samples), output
+
+
+def soup_round_trip_body(md_content):
+    return transform_html(markdown.markdown(md_content, extensions=MARKDOWN_EXTENSIONS))
+
+
+def time_body(convert, md_content, repeat):
+    """Best seconds spent turning preprocessed markdown into the HTML body."""
+    samples = []
+    output = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = convert(md_content)
+        samples.append(time.perf_counter() - start)
+    return min(samples), output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roles", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'roles':>6} {'multi-pass ms':>14} {'single-pass ms':>15} {'speedup':>8}")
+    for roles in args.roles:
+        md_content = preprocess_markdown(synthetic_resume(roles))
+        html_content = markdown.markdown(md_content, extensions=MARKDOWN_EXTENSIONS)
+        legacy_best, _, legacy_html = time_transform(legacy_transform, html_content, args.repeat)
+        single_best, _, single_html = time_transform(
+            single_pass_transform, html_content, args.repeat
+        )
+        if legacy_html != single_html:
+            raise SystemExit(f"Output differs from the multi-pass transforms at {roles} roles")
+        print(
+            f"{roles:>6} {legacy_best * 1000:>14.1f} {single_best * 1000:>15.1f} "
+            f"{legacy_best / single_best:>7.2f}x"
+        )
+
+    print()
+    print(f"{'roles':>6} {'soup body ms':>14} {'in-tree body ms':>15} {'speedup':>8}")
+    for roles in args.roles:
+        md_content = preprocess_markdown(synthetic_resume(roles))
+        soup_best, soup_html = time_body(soup_round_trip_body, md_content, args.repeat)
+        tree_best, tree_html = time_body(markdown_to_body, md_content, args.repeat)
+        if soup_html != tree_html:
+            raise SystemExit(f"In-tree output differs from BeautifulSoup at {roles} roles")
+        print(
+            f"{roles:>6} {soup_best * 1000:>14.1f} {tree_best * 1000:>15.1f} "
+            f"{soup_best / tree_best:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""Bounded pool of warm Chromium pages for high-volume rendering."""
+
+import asyncio
+import functools
+import os
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+
+from profiling import profile_stage
+
+# Warm pages kept open by default
+DEFAULT_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# Renders a context serves before it is thrown away and rebuilt
+DEFAULT_MAX_RENDERS = 200
+
+# Times a render is retried after the browser or its page dies
+DEFAULT_MAX_RETRIES = 2
+
+# Chromium to attach to over CDP when --cdp-endpoint isn't given, e.g.
+# http://localhost:9222 for one started with --remote-debugging-port=9222
+CDP_ENDPOINT_ENV = "RESUME_PDF_CDP_ENDPOINT"
+
+# How long an attach may take before the pool launches its own browser
+DEFAULT_CDP_TIMEOUT_MS = 3000
+
+# Used JS heap of a page in bytes (performance.memory is Chromium-only)
+HEAP_USED_JS = "() => performance.memory ? performance.memory.usedJSHeapSize : 0"
+
+
+@functools.cache
+def playwright_api():
+    """playwright.async_api, imported when a pool first starts.
+
+    Importing Playwright takes longer than everything else the CLI needs
+    for a cache hit, so it waits until a browser is actually wanted.
+    """
+    from playwright import async_api
+
+    return async_api
+
+
+@dataclass
+class PoolStats:
+    """Counters describing what the pool has done so far."""
+
+    renders: int = 0
+    recycles: int = 0
+    relaunches: int = 0
+    retries: int = 0
+    attached: int = 0
+    attach_failures: int = 0
+    waiting: int = 0
+    busy: int = 0
+
+
+@dataclass(eq=False)
+class _Slot:
+    """One isolated browser context with its single warm page."""
+
+    context: object = None
+    page: object = None
+    generation: int = -1
+    renders: int = 0
+    broken: bool = False
+
+
+class BrowserPool:
+    """Keep ``size`` warm pages on one Chromium and hand them out one at a time.
+
+    Each page lives in its own browser context. A context is recycled after
+    ``max_renders`` uses or once its JS heap passes ``max_heap_mb``, which
+    keeps memory flat over long runs. When every page is busy callers wait
+    for one to free up. If Chromium crashes, the browser is relaunched and
+    the render retried up to ``max_retries`` times.
+
+    ``context_setup``, if given, is awaited with every new context before
+    its page opens, for request routing and the like.
+
+    With a ``cdp_endpoint``, the pool attaches to a Chromium that is
+    already running instead of launching one, and only launches its own
+    if the endpoint can't be reached. Its pages still get fresh contexts
+    of their own; closing the pool closes those and disconnects, leaving
+    the browser running for the next caller.
+    """
+
+    def __init__(
+        self,
+        size=DEFAULT_POOL_SIZE,
+        max_renders=DEFAULT_MAX_RENDERS,
+        max_heap_mb=None,
+        max_retries=DEFAULT_MAX_RETRIES,
+        launch_options=None,
+        context_setup=None,
+        cdp_endpoint=None,
+    ):
+        self.size = max(1, size)
+        self.max_renders = max_renders
+        self.max_heap_mb = max_heap_mb
+        self.max_retries = max_retries
+        self.launch_options = launch_options or {}
+        self.context_setup = context_setup
+        self.cdp_endpoint = cdp_endpoint
+        self.stats = PoolStats()
+        self._playwright = None
+        self._browser = None
+        self._generation = 0
+        self._launch_lock = asyncio.Lock()
+        self._idle: asyncio.Queue[_Slot] = asyncio.Queue()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Launch or attach to Chromium and open every page up front.
+
+        The first borrow calls this automatically, so a pool that is never
+        used never launches a browser.
+        """
+        async with self._launch_lock:
+            if self._playwright is not None:
+                return
+            self._playwright = await playwright_api().async_playwright().start()
+            await self._launch()
+            slots = [_Slot() for _ in range(self.size)]
+            await asyncio.gather(*(self._reset_slot(slot) for slot in slots))
+            for slot in slots:
+                self._idle.put_nowait(slot)
+
+    async def close(self):
+        """Close the browser and stop Playwright.
+
+        The pool's pages go with it; start() opens a new set of them.
+        """
+        # Pages still borrowed go back to the old queue, not the next one
+        self._idle = asyncio.Queue()
+        if self._browser is not None:
+            with suppress(playwright_api().Error):
+                await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _launch(self):
+        self._browser = await self._attach() if self.cdp_endpoint else None
+        if self._browser is None:
+            with profile_stage("browser launch"):
+                self._browser = await self._playwright.chromium.launch(**self.launch_options)
+        self._generation += 1
+
+    async def _attach(self):
+        """Connect to the browser at cdp_endpoint, or None if it can't be reached."""
+        try:
+            with profile_stage("browser attach"):
+                browser = await self._playwright.chromium.connect_over_cdp(
+                    self.cdp_endpoint, timeout=DEFAULT_CDP_TIMEOUT_MS
+                )
+        except playwright_api().Error:
+            self.stats.attach_failures += 1
+            return None
+        self.stats.attached += 1
+        return browser
+
+    async def _relaunch(self, generation):
+        """Replace a dead browser, unless another caller already did."""
+        async with self._launch_lock:
+            if generation != self._generation:
+                return
+            with suppress(playwright_api().Error):
+                await self._browser.close()
+            await self._launch()
+            self.stats.relaunches += 1
+
+    async def _reset_slot(self, slot):
+        """Give slot a fresh context and page on the current browser."""
+        if slot.context is not None and slot.generation == self._generation:
+            with suppress(playwright_api().Error):
+                await slot.context.close()
+        with profile_stage("new page"):
+            slot.context = await self._browser.new_context()
+            if self.context_setup is not None:
+                await self.context_setup(slot.context)
+            slot.page = await slot.context.new_page()
+        slot.generation = self._generation
+        slot.renders = 0
+        slot.broken = False
+
+    async def _needs_recycle(self, slot):
+        if slot.broken or slot.page.is_closed():
+            return True
+        if self.max_renders and slot.renders >= self.max_renders:
+            return True
+        if self.max_heap_mb:
+            try:
+                heap = await slot.page.evaluate(HEAP_USED_JS)
+            except playwright_api().Error:
+                return True
+            return heap >= self.max_heap_mb * 1024 * 1024
+        return False
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a warm page, waiting while every page is busy."""
+        if self._playwright is None:
+            await self.start()
+        idle = self._idle
+        self.stats.waiting += 1
+        try:
+            with profile_stage("page wait"):
+                slot = await idle.get()
+        finally:
+            self.stats.waiting -= 1
+
+        self.stats.busy += 1
+        try:
+            if slot.broken or slot.generation != self._generation:
+                await self._reset_slot(slot)
+            try:
+                yield slot.page
+            except playwright_api().Error:
+                slot.broken = True
+                raise
+            finally:
+                slot.renders += 1
+                self.stats.renders += 1
+            if await self._needs_recycle(slot):
+                self.stats.recycles += 1
+                try:
+                    await self._reset_slot(slot)
+                except playwright_api().Error:
+                    # Picked up again by the next borrower
+                    slot.broken = True
+        finally:
+            self.stats.busy -= 1
+            idle.put_nowait(slot)
+
+    async def run(self, render):
+        """Call ``await render(page)`` on a pooled page, retrying on crashes.
+
+        Only Playwright errors are retried; anything else raised by
+        ``render`` propagates straight away.
+        """
+        for attempt in range(self.max_retries + 1):
+            generation = self._generation
+            try:
+                async with self.page() as page:
+                    return await render(page)
+            except playwright_api().Error:
+                if attempt == self.max_retries:
+                    raise
+                self.stats.retries += 1
+                if not self._browser.is_connected():
+                    await self._relaunch(generation)
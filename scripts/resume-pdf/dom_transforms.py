@@ -0,0 +1,123 @@
+"""Single-pass DOM transforms for BeautifulSoup documents.
+
+Handlers are registered per tag name, optionally guarded by a predicate on
+the traversal context, and all of them run during one document-order walk:
+
+    transforms = TransformRegistry()
+
+    @transforms.on("p", when=lambda p, ctx: ctx.counts["p"] <= 2)
+    def header_paragraph(p, ctx):
+        ...
+
+    transforms.apply(soup)
+"""
+
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from profiling import profiled_handlers
+
+if TYPE_CHECKING:
+    # BeautifulSoup is imported when a document is first walked
+    from bs4 import BeautifulSoup, Tag
+
+Handler = Callable[["Tag", "TransformContext"], None]
+Predicate = Callable[["Tag", "TransformContext"], bool]
+
+
+class TransformContext:
+    """State visible to handlers while the document is walked.
+
+    ``counts`` holds how many elements of each tag have been visited so far,
+    including the current one. ``scope(element)`` is a dict shared by an
+    element and its siblings, for handlers that relate an element to the
+    ones before it under the same parent (sections, date lines).
+    """
+
+    def __init__(self, soup: "BeautifulSoup"):
+        self.soup = soup
+        self.counts: Counter[str] = Counter()
+        self._scopes: dict[int, dict] = defaultdict(dict)
+        self._removed: dict[int, Tag] = {}
+
+    def scope(self, element: "Tag") -> dict:
+        return self._scopes[id(element.parent)]
+
+    def remove(self, element: "Tag"):
+        """Drop element from the document once the walk is over.
+
+        The walk skips the element's remaining handlers and its children
+        straight away. Removing everything at the end costs one scan per
+        parent, where Tag.decompose() rescans the parent for every element.
+        """
+        self._removed[id(element)] = element
+
+    def is_removed(self, element: "Tag") -> bool:
+        return id(element) in self._removed
+
+    def flush_removals(self):
+        by_parent: dict[int, tuple[Tag, set[int]]] = {}
+        for element in self._removed.values():
+            parent = element.parent
+            if parent is not None:
+                by_parent.setdefault(id(parent), (parent, set()))[1].add(id(element))
+        for parent, doomed in by_parent.values():
+            indexes = [i for i, child in enumerate(parent.contents) if id(child) in doomed]
+            for index in reversed(indexes):
+                child = parent.contents[index]
+                child.extract(_self_index=index)
+                child.decompose()
+        self._removed.clear()
+
+
+class TransformRegistry:
+    """Ordered handlers keyed on tag name, applied in a single traversal."""
+
+    def __init__(self):
+        self._handlers: dict[str, list[tuple[Predicate | None, Handler]]] = defaultdict(list)
+
+    def on(self, *tags: str, when: Predicate | None = None):
+        """Register the decorated function for tags, optionally only when ``when`` holds."""
+
+        def register(handler: Handler) -> Handler:
+            for tag in tags:
+                self._handlers[tag].append((when, handler))
+            return handler
+
+        return register
+
+    def apply(self, soup: "BeautifulSoup") -> TransformContext:
+        """Run every matching handler over soup in one document-order walk.
+
+        Handlers for an element run in registration order, before its
+        children are visited. They may rewrite the element's children, or
+        drop the element itself with ``context.remove()``; the walk then
+        skips it and its children.
+        """
+        from bs4 import Tag
+
+        context = TransformContext(soup)
+        handlers = profiled_handlers(self._handlers)
+        stack = [iter(soup.contents[:])]
+        while stack:
+            element = next(stack[-1], None)
+            if element is None:
+                stack.pop()
+                continue
+            # Detached elements lose their parent; checking Tag.decomposed
+            # instead costs a child-tag lookup through Tag.__getattr__
+            if not isinstance(element, Tag) or element.parent is None:
+                continue
+
+            context.counts[element.name] += 1
+            for when, handler in handlers.get(element.name, ()):
+                if when is None or when(element, context):
+                    handler(element, context)
+                    if element.parent is None or context.is_removed(element):
+                        break
+            else:
+                if element.contents:
+                    stack.append(iter(element.contents[:]))
+        context.flush_removals()
+        return context
@@ -0,0 +1,268 @@
+"""Export one parsed resume in several formats from a single browser page.
+
+The markdown is parsed and transformed once. The templated HTML is loaded
+into one page, which prints every paper size and captures the page-one
+thumbnails; the standalone HTML and plain text come from the same HTML
+without touching the browser. The WeasyPrint backend has no page: it
+prints each paper size from the HTML in turn, and captures no thumbnails.
+
+Formats, and the files written next to the PDF path (``resume.pdf``):
+
+- ``pdf``: US Letter, ``resume.pdf``
+- ``pdf-a4``: A4, ``resume-a4.pdf``
+- ``html``: self-contained HTML, ``resume.html``
+- ``png``: page-one thumbnails, ``resume-1200w.png`` per width
+- ``txt``: ATS-friendly plain text, ``resume.txt``
+- ``json``: the resume model for the website's resume page, ``resume.json``
+"""
+
+import base64
+import inspect
+import json
+import mimetypes
+import os
+import re
+
+from browser_pool import BrowserPool
+from fit_pages import print_to_pages
+from hermetic import FONTS_CSS_URL, font_bundle
+from pipeline import (
+    PDF_OPTIONS,
+    build_resume_model,
+    code_digest,
+    finish_pdf,
+    load_html,
+    remove_emojis,
+)
+from profiling import profile_stage
+from render_cache import cache_key
+from reproducible import source_date
+
+EXPORT_FORMATS = ("pdf", "pdf-a4", "html", "png", "txt", "json")
+
+# Paper size printed for each PDF format
+PDF_PAPERS = {"pdf": "Letter", "pdf-a4": "A4"}
+
+# A Letter page in CSS pixels; thumbnails show page one at this size, scaled
+PAGE_WIDTH_PX = 816
+PAGE_HEIGHT_PX = 1056
+
+# The PDF margins, so the thumbnail is laid out like the printed page
+THUMBNAIL_STYLE = "html { padding: 0.5in; }"
+
+_FONT_IMPORT = re.compile(r"@import url\(\s*['\"]?([^'\")]+)['\"]?\s*\);?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def artifact_paths(output_path, formats, thumbnail_widths):
+    """Map each artifact name to the file it is written to, beside output_path."""
+    stem = os.path.splitext(output_path)[0]
+    paths = {}
+    for export_format in formats:
+        if export_format == "pdf":
+            paths["pdf"] = f"{stem}.pdf"
+        elif export_format == "pdf-a4":
+            paths["pdf-a4"] = f"{stem}-a4.pdf"
+        elif export_format == "html":
+            paths["html"] = f"{stem}.html"
+        elif export_format == "txt":
+            paths["txt"] = f"{stem}.txt"
+        elif export_format == "json":
+            paths["json"] = f"{stem}.json"
+        elif export_format == "png":
+            for width in thumbnail_widths:
+                paths[f"png-{width}"] = f"{stem}-{width}w.png"
+        else:
+            raise ValueError(f"Unknown export format {export_format!r}")
+    return paths
+
+
+def artifact_keys(base, names):
+    """Cache key for each named artifact of a render whose PDF key is base.
+
+    The Letter PDF keeps the base key, so switching between single- and
+    multi-format runs reuses it.
+    """
+    exporter = code_digest(inspect.getmodule(artifact_keys))
+    return {name: base if name == "pdf" else cache_key(base, name, exporter) for name in names}
+
+
+async def capture_thumbnails(page, widths):
+    """PNG screenshots of page one of the loaded document, one per width.
+
+    The page is laid out at Letter size in print media and captured at a
+    device scale factor giving each width, on the same page that printed
+    the PDFs.
+    """
+    await page.emulate_media(media="print")
+    await page.add_style_tag(content=THUMBNAIL_STYLE)
+    session = await page.context.new_cdp_session(page)
+    clip = {"x": 0, "y": 0, "width": PAGE_WIDTH_PX, "height": PAGE_HEIGHT_PX}
+    shots = {}
+    try:
+        for width in widths:
+            await session.send(
+                "Emulation.setDeviceMetricsOverride",
+                {
+                    "width": PAGE_WIDTH_PX,
+                    "height": PAGE_HEIGHT_PX,
+                    "deviceScaleFactor": width / PAGE_WIDTH_PX,
+                    "mobile": False,
+                },
+            )
+            shots[width] = await page.screenshot(clip=clip, type="png")
+    finally:
+        await session.send("Emulation.clearDeviceMetricsOverride")
+        await session.detach()
+        # Hand the page back with Playwright's own viewport and media
+        if page.viewport_size:
+            await page.set_viewport_size(page.viewport_size)
+        await page.emulate_media(media=None)
+    return shots
+
+
+def standalone_html(html_output, base_dir):
+    """html_output with its web fonts and local images embedded.
+
+    Fonts come from the offline bundle; without one the Google Fonts import
+    is left as is, and the file still renders with network access.
+    """
+    try:
+        fonts_css = font_bundle().inline_css()
+    except FileNotFoundError:
+        fonts_css = None
+    if fonts_css is not None:
+        html_output = _FONT_IMPORT.sub(
+            lambda match: fonts_css if match.group(1) == FONTS_CSS_URL else match.group(0),
+            html_output,
+        )
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_output, "html.parser")
+    for img in soup.find_all("img", src=True):
+        src = img["src"]
+        if re.match(r"^[a-z][a-z0-9+.-]*:", src, re.I):
+            continue
+        path = os.path.join(base_dir, src)
+        try:
+            with open(path, "rb") as file:
+                data = base64.b64encode(file.read()).decode("ascii")
+        except OSError:
+            continue
+        mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        img["src"] = f"data:{mime};base64,{data}"
+    return str(soup)
+
+
+def _inline_text(element, with_urls=False):
+    """Text of element on one line; with_urls follows each web link with its URL."""
+    from bs4 import NavigableString
+
+    def walk(node):
+        if isinstance(node, NavigableString):
+            return str(node)
+        text = "".join(walk(child) for child in node.children)
+        if with_urls and node.name == "a":
+            href = node.get("href", "")
+            if href.startswith(("http://", "https://")) and href not in text:
+                text = f"{text.strip()} ({href})"
+        return text
+
+    return _WHITESPACE.sub(" ", remove_emojis(walk(element))).strip()
+
+
+def resume_text(html_output):
+    """ATS-friendly plain text of the resume: no emoji, tags or columns."""
+    from bs4 import BeautifulSoup, Tag
+
+    body = BeautifulSoup(html_output, "html.parser").body
+    blocks = []
+    for element in body.children if body else ():
+        if not isinstance(element, Tag):
+            continue
+        classes = element.get("class") or []
+        if element.name == "h1":
+            blocks.append(_inline_text(element).upper())
+        elif element.name == "h2":
+            title = _inline_text(element).upper()
+            blocks.append(f"\n{title}\n{'=' * len(title)}")
+        elif element.name == "h3":
+            blocks.append(f"\n{_inline_text(element)}")
+        elif element.name == "h4":
+            role = _inline_text(element)
+            date = element.get("data-date", "").strip("() ")
+            blocks.append(f"{role} | {date}" if date else role)
+        elif "skills-list" in classes:
+            category = element.find(class_="skill-category")
+            skills = [_inline_text(tag) for tag in element.find_all(class_="skill-tag")]
+            label = f"{_inline_text(category)} " if category else ""
+            blocks.append(label + ", ".join(skills))
+        elif element.name in ("ul", "ol"):
+            blocks.extend(f"- {_inline_text(li)}" for li in element.find_all("li"))
+        else:
+            blocks.append(_inline_text(element, with_urls="header-content" in classes))
+    return "\n".join(block for block in blocks if block.strip()).strip() + "\n"
+
+
+async def export_artifacts(
+    backend, md_content, html_output, paths, options, base_dir, cache=None, resume=None
+):
+    """Write every artifact in paths, printing with backend.
+
+    A Playwright backend lends one page for every PDF and thumbnail. The
+    json export uses resume, the model html_output was built from, when
+    given; otherwise it takes the model from cache when it has it.
+
+    Returns the OptimizeReport for the first PDF when optimizing, else None.
+    """
+    papers = [name for name in paths if name in PDF_PAPERS]
+    widths = [int(name.split("-", 1)[1]) for name in paths if name.startswith("png-")]
+
+    async def on_page(page):
+        await load_html(page, html_output)
+        pdfs = {}
+        for name in papers:
+            if options.fit_pages:
+                pdfs[name], _ = await print_to_pages(page, options.fit_pages, PDF_PAPERS[name])
+                continue
+            with profile_stage("page.pdf", paper=PDF_PAPERS[name]):
+                pdfs[name] = await page.pdf(**{**PDF_OPTIONS, "format": PDF_PAPERS[name]})
+        thumbnails = {}
+        if widths:
+            with profile_stage("thumbnails"):
+                thumbnails = await capture_thumbnails(page, widths)
+        return pdfs, thumbnails
+
+    if isinstance(backend, BrowserPool):
+        pdfs, thumbnails = await backend.run(on_page) if papers or widths else ({}, {})
+    elif widths:
+        raise ValueError(f"PNG thumbnails need --backend playwright, not {backend.name}")
+    else:
+        thumbnails = {}
+        pdfs = {
+            name: await backend.print_pdf(html_output, paper=PDF_PAPERS[name]) for name in papers
+        }
+
+    report = None
+    epoch = source_date(md_content)
+    for name, pdf in pdfs.items():
+        _, pdf_report = await finish_pdf(pdf, paths[name], options, epoch)
+        report = report or pdf_report
+    for width, png in thumbnails.items():
+        with open(paths[f"png-{width}"], "wb") as file:
+            file.write(png)
+    if "html" in paths:
+        with profile_stage("standalone html"), open(paths["html"], "w", encoding="utf-8") as file:
+            file.write(standalone_html(html_output, base_dir))
+    if "txt" in paths:
+        with profile_stage("plain text"), open(paths["txt"], "w", encoding="utf-8") as file:
+            file.write(resume_text(html_output))
+    if "json" in paths:
+        from resume_model import page_data
+
+        if resume is None:
+            resume = build_resume_model(md_content, cache, html_output)
+        data = page_data(resume, md_content)
+        with open(paths["json"], "w", encoding="utf-8") as file:
+            file.write(json.dumps(data, ensure_ascii=False, indent=2) + "\n")
+    return report
@@ -0,0 +1,151 @@
+"""Scale a document's type so it prints on a given number of pages.
+
+The page is laid out at the printable width of the paper in print media,
+and the body font size (which every other size in the template is relative
+to) is binary-searched for the largest scale whose layout height fits the
+pages. Each step is one style change and one height read in the live page;
+the PDF is printed once at the end, and only reprinted a step smaller if
+page breaks pushed it over the count the measurement predicted.
+"""
+
+import io
+import math
+import re
+from dataclasses import dataclass
+
+from pipeline import PDF_OPTIONS
+from profiling import profile_stage
+
+# Font scale searched between, relative to the template's own size
+FIT_MIN_SCALE = 0.6
+FIT_MAX_SCALE = 1.2
+
+# Search stops once the bounds are this close; 6 layout passes over the range
+FIT_TOLERANCE = 0.01
+
+# Smaller scale tried for each reprint when breaks add a page, and how often
+FIT_REPRINT_STEP = 0.97
+FIT_MAX_REPRINTS = 2
+
+# Paper sizes PDF_OPTIONS and the exports print on, in inches, as Playwright has them
+PAPER_INCHES = {"Letter": (8.5, 11.0), "A4": (8.27, 11.7)}
+
+CSS_PX_PER_INCH = 96
+
+_PDF_PAGE = re.compile(rb"/Type\s*/Page\b")
+
+_BASE_FONT_SIZE_JS = "() => parseFloat(getComputedStyle(document.body).fontSize)"
+
+# Applies a body font size in px and returns the laid-out document height
+_LAYOUT_HEIGHT_JS = """([fontSize]) => {
+    document.body.style.fontSize = `${fontSize}px`;
+    return document.documentElement.scrollHeight;
+}"""
+
+
+@dataclass
+class Fit:
+    """The scale a document was printed at, and what it took to find it."""
+
+    target: int
+    scale: float
+    pages: int
+    passes: int = 0
+    reprints: int = 0
+
+    def summary(self):
+        return (
+            f"{self.pages} of {self.target} page(s) at {self.scale:.0%} type size "
+            f"({self.passes} layout passes, {self.reprints} reprints)"
+        )
+
+
+def inches(length):
+    """A CSS length in inches, as PDF_OPTIONS gives its margins."""
+    if not length.endswith("in"):
+        raise ValueError(f"Expected a length in inches: {length}")
+    return float(length[:-2])
+
+
+def printable_px(paper):
+    """Width and height of a page's printable area in CSS pixels."""
+    width, height = PAPER_INCHES[paper]
+    margin = {side: inches(value) for side, value in PDF_OPTIONS["margin"].items()}
+    return (
+        round((width - margin["left"] - margin["right"]) * CSS_PX_PER_INCH),
+        round((height - margin["top"] - margin["bottom"]) * CSS_PX_PER_INCH),
+    )
+
+
+def pdf_page_count(pdf):
+    """Pages in a PDF, counted with pikepdf when it is installed."""
+    try:
+        import pikepdf
+    except ImportError:
+        return len(_PDF_PAGE.findall(pdf))
+    with pikepdf.open(io.BytesIO(pdf)) as document:
+        return len(document.pages)
+
+
+async def fit_to_pages(page, pages, paper="Letter"):
+    """Scale the type of the document loaded in page to fill at most pages.
+
+    The scale found stays applied, ready to print. Returns a Fit whose
+    ``pages`` is the count the layout height predicts.
+    """
+    width, height = printable_px(paper)
+    viewport = page.viewport_size
+    fit = Fit(pages, FIT_MIN_SCALE, 0)
+
+    async def pages_at(scale):
+        fit.passes += 1
+        layout = await page.evaluate(_LAYOUT_HEIGHT_JS, [base * scale])
+        return max(1, math.ceil(layout / height))
+
+    with profile_stage("fit pages", paper=paper, pages=pages):
+        await page.emulate_media(media="print")
+        await page.set_viewport_size({"width": width, "height": height})
+        try:
+            base = await page.evaluate(_BASE_FONT_SIZE_JS)
+            low, high = FIT_MIN_SCALE, FIT_MAX_SCALE
+            if await pages_at(high) <= pages:
+                low = high
+            else:
+                while high - low > FIT_TOLERANCE:
+                    middle = (low + high) / 2
+                    if await pages_at(middle) <= pages:
+                        low = middle
+                    else:
+                        high = middle
+            fit.scale = low
+            fit.pages = await pages_at(low)
+        finally:
+            if viewport:
+                await page.set_viewport_size(viewport)
+            await page.emulate_media(media=None)
+    return fit
+
+
+async def print_to_pages(page, pages, paper="Letter", output_path=None):
+    """Fit the loaded document to pages and print it; returns the PDF and its Fit.
+
+    The PDF is also written to output_path when one is given.
+    """
+    fit = await fit_to_pages(page, pages, paper)
+    base = await page.evaluate(_BASE_FONT_SIZE_JS) / fit.scale
+    while True:
+        with profile_stage("page.pdf", paper=paper):
+            pdf = await page.pdf(**{**PDF_OPTIONS, "format": paper})
+        fit.pages = pdf_page_count(pdf)
+        if fit.pages <= pages or fit.reprints == FIT_MAX_REPRINTS:
+            break
+        if fit.scale * FIT_REPRINT_STEP < FIT_MIN_SCALE:
+            break
+        # Breaks kept together pushed content past the measured height
+        fit.scale *= FIT_REPRINT_STEP
+        fit.reprints += 1
+        await page.evaluate(_LAYOUT_HEIGHT_JS, [base * fit.scale])
+    if output_path is not None:
+        with open(output_path, "wb") as file:
+            file.write(pdf)
+    return pdf, fit
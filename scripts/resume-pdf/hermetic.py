@@ -0,0 +1,187 @@
+"""Hermetic rendering: bundled web fonts and no other network access.
+
+The template imports Inter and Space Grotesk from Google Fonts. In offline
+mode every browser context routes all requests through a FontBundle, which
+answers the Google Fonts stylesheet and font files from a local copy held
+in memory and blocks everything else, so a render never waits on the
+network.
+
+The bundle lives in fonts/ next to this module and is committed, with the
+fonts' OFL license texts, so a fresh checkout renders offline as it is.
+``resume-pdf --fetch-fonts`` only refreshes it from Google Fonts.
+"""
+
+import base64
+import functools
+import hashlib
+import os
+import re
+from urllib.parse import urlsplit
+
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+
+# Must match the @import at the top of the template stylesheet
+FONTS_CSS_URL = (
+    "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600"
+    "&family=Space+Grotesk:wght@400;500;600&display=swap"
+)
+FONTS_CSS_FILE = "fonts.css"
+FONTS_CSS_HOST = "fonts.googleapis.com"
+FONT_FILES_HOST = "fonts.gstatic.com"
+
+# Google serves woff2 only to browsers it recognizes
+FETCH_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/126.0.0.0 Safari/537.36"
+)
+
+# SIL Open Font License texts, committed alongside the font files
+LICENSE_URLS = {
+    "OFL-Inter.txt": "https://raw.githubusercontent.com/google/fonts/main/ofl/inter/OFL.txt",
+    "OFL-SpaceGrotesk.txt": (
+        "https://raw.githubusercontent.com/google/fonts/main/ofl/spacegrotesk/OFL.txt"
+    ),
+}
+
+FONT_URL = re.compile(r"url\((https://fonts\.gstatic\.com/[^)]+)\)")
+
+# Schemes that never leave the process
+LOCAL_SCHEMES = ("about:", "data:", "blob:")
+
+
+def font_file_name(url):
+    """Local file name for a font URL, unique across font families."""
+    return urlsplit(url).path.strip("/").replace("/", "_")
+
+
+class FontBundle:
+    """The Google Fonts stylesheet and its font files, served from memory.
+
+    Files are read from disk the first time they are requested and kept for
+    the life of the process.
+    """
+
+    def __init__(self, fonts_dir=FONTS_DIR):
+        self.fonts_dir = fonts_dir
+        css_path = os.path.join(fonts_dir, FONTS_CSS_FILE)
+        if not os.path.isfile(css_path):
+            raise FileNotFoundError(
+                f"No font bundle in {fonts_dir}; run resume-pdf --fetch-fonts to restore it"
+            )
+        with open(css_path, "rb") as file:
+            self.css = file.read()
+        self._files: dict[str, bytes] = {}
+        self.served = 0
+        self.blocked = 0
+
+    @functools.cached_property
+    def digest(self):
+        """Hash of the stylesheet and every font file, for cache keys."""
+        hasher = hashlib.sha256(self.css)
+        for name in sorted(os.listdir(self.fonts_dir)):
+            if name != FONTS_CSS_FILE and name not in LICENSE_URLS:
+                hasher.update(name.encode("utf-8"))
+                hasher.update(self._read(name) or b"")
+        return hasher.hexdigest()
+
+    def _read(self, name):
+        if name not in self._files:
+            path = os.path.join(self.fonts_dir, name)
+            try:
+                with open(path, "rb") as file:
+                    self._files[name] = file.read()
+            except OSError:
+                return None
+        return self._files[name]
+
+    def lookup(self, url):
+        """The bundled body and content type for url, or None if it is not bundled."""
+        parts = urlsplit(url)
+        host = parts.hostname
+        if host == FONTS_CSS_HOST and parts.path == "/css2":
+            return self.css, "text/css; charset=utf-8"
+        if host == FONT_FILES_HOST:
+            body = self._read(font_file_name(url))
+            return (body, "font/woff2") if body is not None else None
+        return None
+
+    async def handle(self, route):
+        """Serve bundled font requests and block every other network request."""
+        url = route.request.url
+        if url.startswith(LOCAL_SCHEMES):
+            await route.continue_()
+            return
+        found = self.lookup(url)
+        if found is None:
+            self.blocked += 1
+            await route.abort("blockedbyclient")
+            return
+        body, content_type = found
+        self.served += 1
+        # Fonts are fetched in CORS mode from the document's origin
+        await route.fulfill(
+            status=200,
+            body=body,
+            headers={"Content-Type": content_type, "Access-Control-Allow-Origin": "*"},
+        )
+
+    def inline_css(self):
+        """The stylesheet with each font file embedded as a data: URI."""
+
+        def embed(match):
+            data = self._read(font_file_name(match.group(1)))
+            if data is None:
+                return match.group(0)
+            return f"url(data:font/woff2;base64,{base64.b64encode(data).decode('ascii')})"
+
+        return FONT_URL.sub(embed, self.css.decode("utf-8"))
+
+    async def install(self, context):
+        """Route every request made in a browser context through the bundle."""
+        await context.route("**/*", self.handle)
+
+
+async def block_network(context):
+    """Abort every request a browser context makes beyond the page itself."""
+
+    async def handle(route):
+        if route.request.url.startswith(LOCAL_SCHEMES):
+            await route.continue_()
+        else:
+            await route.abort("blockedbyclient")
+
+    await context.route("**/*", handle)
+
+
+@functools.cache
+def font_bundle():
+    """The process-wide FontBundle, so every pool shares one in-memory copy."""
+    return FontBundle()
+
+
+def fetch_fonts(fonts_dir=FONTS_DIR):
+    """Download the Google Fonts stylesheet, its font files and their licenses.
+
+    Everything is written to fonts_dir, replacing the committed bundle.
+    Returns the number of font files written.
+    """
+    import urllib.request
+
+    def download(url):
+        request = urllib.request.Request(url, headers={"User-Agent": FETCH_USER_AGENT})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.read()
+
+    css = download(FONTS_CSS_URL)
+    os.makedirs(fonts_dir, exist_ok=True)
+    urls = sorted(set(FONT_URL.findall(css.decode("utf-8"))))
+    for url in urls:
+        with open(os.path.join(fonts_dir, font_file_name(url)), "wb") as file:
+            file.write(download(url))
+    for name, url in LICENSE_URLS.items():
+        with open(os.path.join(fonts_dir, name), "wb") as file:
+            file.write(download(url))
+    # Written last, so a failed download never leaves a bundle that looks complete
+    with open(os.path.join(fonts_dir, FONTS_CSS_FILE), "wb") as file:
+        file.write(css)
+    return len(urls)
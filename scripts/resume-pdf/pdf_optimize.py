@@ -0,0 +1,240 @@
+"""Shrink printed PDFs: subset fonts, merge duplicate streams, linearize.
+
+Chromium embeds each font with its hinting and layout tables and compresses
+streams at a modest level. optimize_pdf() rewrites a printed PDF so that:
+
+- every embedded TrueType/OpenType CID font keeps only the glyphs the
+  content streams draw, with hinting and shaping tables dropped (glyph IDs
+  are kept, so no content stream needs rewriting);
+- streams with identical bytes and dictionaries are stored once;
+- all streams are recompressed, objects packed into object streams, and the
+  file linearized so a viewer can show page one before the rest arrives.
+
+Needs the optional ``pikepdf`` and ``fonttools`` packages
+(``uv sync --extra optimize``); everything runs locally.
+"""
+
+import hashlib
+import io
+import time
+from dataclasses import dataclass
+
+# Tables a PDF viewer never reads: shaping is already done and hinting is
+# ignored at print resolutions
+DROPPED_FONT_TABLES = [
+    "GSUB",
+    "GPOS",
+    "GDEF",
+    "BASE",
+    "JSTF",
+    "kern",
+    "DSIG",
+    "hdmx",
+    "VDMX",
+    "LTSH",
+]
+
+# Text-showing operators and the operand holding their string(s)
+TEXT_OPERATORS = {"Tj": 0, "'": 0, '"': 2, "TJ": 0}
+
+
+@dataclass
+class OptimizeReport:
+    """Sizes and timing of one optimize_pdf() run."""
+
+    before: int
+    after: int
+    elapsed: float
+    fonts_subset: int = 0
+    streams_merged: int = 0
+
+    def summary(self):
+        saved = 1 - self.after / self.before if self.before else 0
+        return (
+            f"{self.before / 1024:.1f} KB -> {self.after / 1024:.1f} KB "
+            f"(-{saved:.0%}) in {self.elapsed:.2f}s"
+        )
+
+
+def require_libraries():
+    """Import the optional optimizer dependencies, or raise RuntimeError."""
+    try:
+        import pikepdf
+        from fontTools import subset
+    except ImportError as e:
+        raise RuntimeError(
+            "PDF optimization needs pikepdf and fonttools: uv sync --extra optimize"
+        ) from e
+    return pikepdf, subset
+
+
+def optimize_pdf(data: bytes) -> tuple[bytes, OptimizeReport]:
+    """Return an optimized copy of the PDF in data and a report on it."""
+    pikepdf, subset = require_libraries()
+    start = time.perf_counter()
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        fonts_subset = subset_fonts(pdf, pikepdf, subset)
+        streams_merged = merge_duplicate_streams(pdf, pikepdf)
+        out = io.BytesIO()
+        pdf.save(
+            out,
+            compress_streams=True,
+            recompress_flate=True,
+            stream_decode_level=pikepdf.StreamDecodeLevel.generalized,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+            linearize=True,
+            # Derived from the content rather than the clock, so output is repeatable
+            deterministic_id=True,
+        )
+    optimized = out.getvalue()
+    report = OptimizeReport(
+        len(data), len(optimized), time.perf_counter() - start, fonts_subset, streams_merged
+    )
+    return optimized, report
+
+
+def used_glyphs(pdf, pikepdf):
+    """Glyph IDs drawn with each Identity-H font, keyed on the font's objgen.
+
+    Page and form XObject content streams are scanned. Fonts used anywhere
+    that is not scanned (Type3 glyph procedures, annotation appearances) are
+    left out, so they are never subset.
+    """
+    for page in pdf.pages:
+        for annotation in page.obj.get("/Annots", ()):
+            if "/AP" in annotation:
+                # Appearance streams may draw text with any font; stay safe
+                return {}
+
+    glyphs: dict[tuple[int, int], set[int]] = {}
+    unsafe: set[tuple[int, int]] = set()
+    seen: set[tuple[int, int]] = set()
+
+    def scan(owner, resources):
+        fonts = resources.get("/Font", {}) if resources is not None else {}
+        font = None
+        for operands, operator in pikepdf.parse_content_stream(owner):
+            name = str(operator)
+            if name == "Tf":
+                font = fonts.get(operands[0])
+            elif name in TEXT_OPERATORS and font is not None:
+                if font.get("/Encoding") != "/Identity-H":
+                    continue
+                strings = operands[TEXT_OPERATORS[name]]
+                if name != "TJ":
+                    strings = [strings]
+                codes = glyphs.setdefault(font.objgen, set())
+                for string in strings:
+                    if isinstance(string, pikepdf.String):
+                        raw = bytes(string)
+                        codes.update(int.from_bytes(raw[i : i + 2]) for i in range(0, len(raw), 2))
+            elif name == "Do":
+                xobject = resources.get("/XObject", {}).get(operands[0])
+                if (
+                    xobject is not None
+                    and xobject.get("/Subtype") == "/Form"
+                    and xobject.objgen not in seen
+                ):
+                    seen.add(xobject.objgen)
+                    scan(xobject, xobject.get("/Resources", resources))
+        # Type3 fonts draw glyphs with their own resources, which are not scanned
+        for used in fonts.values():
+            if used.get("/Subtype") == "/Type3":
+                for inner in used.get("/Resources", {}).get("/Font", {}).values():
+                    unsafe.add(inner.objgen)
+
+    for page in pdf.pages:
+        scan(page.obj, page.obj.get("/Resources"))
+    return {font: codes for font, codes in glyphs.items() if font not in unsafe}
+
+
+def subset_fonts(pdf, pikepdf, subset):
+    """Subset every embedded Identity-H CID font to the glyphs it draws."""
+    glyphs = used_glyphs(pdf, pikepdf)
+    count = 0
+    for font in pdf.objects:
+        if not isinstance(font, pikepdf.Dictionary) or font.objgen not in glyphs:
+            continue
+        descendants = font.get("/DescendantFonts")
+        if not descendants:
+            continue
+        descendant = descendants[0]
+        # Character codes are glyph IDs only with an identity CIDToGIDMap
+        if descendant.get("/CIDToGIDMap", pikepdf.Name.Identity) != pikepdf.Name.Identity:
+            continue
+        descriptor = descendant.get("/FontDescriptor", {})
+        font_file = descriptor.get("/FontFile2")
+        if font_file is None:
+            font_file = descriptor.get("/FontFile3")
+            if font_file is None or font_file.get("/Subtype") != "/OpenType":
+                continue
+        subset_bytes = _subset_font(font_file.read_bytes(), glyphs[font.objgen], subset)
+        if subset_bytes is None:
+            continue
+        font_file.write(subset_bytes)
+        if "/Length1" in font_file:
+            font_file.Length1 = len(subset_bytes)
+        count += 1
+    return count
+
+
+def _subset_font(font_bytes, glyph_ids, subset):
+    """font_bytes cut down to glyph_ids with glyph IDs unchanged, or None."""
+    options = subset.Options()
+    options.retain_gids = True
+    options.notdef_outline = True
+    options.hinting = False
+    options.layout_features = []
+    options.drop_tables += DROPPED_FONT_TABLES
+    options.glyph_names = False
+    try:
+        font = subset.load_font(io.BytesIO(font_bytes), options, lazy=False)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(gids=sorted({0, *glyph_ids}))
+        subsetter.subset(font)
+        out = io.BytesIO()
+        font.save(out)
+    except Exception:
+        # A font fontTools cannot read is left as Chromium embedded it
+        return None
+    result = out.getvalue()
+    return result if len(result) < len(font_bytes) else None
+
+
+def merge_duplicate_streams(pdf, pikepdf):
+    """Point every reference to a duplicated stream at one copy of it."""
+    first: dict[bytes, object] = {}
+    remap: dict[tuple[int, int], object] = {}
+    for obj in pdf.objects:
+        if not isinstance(obj, pikepdf.Stream):
+            continue
+        hasher = hashlib.sha256(obj.read_raw_bytes())
+        hasher.update(obj.stream_dict.unparse())
+        digest = hasher.digest()
+        if digest in first:
+            remap[obj.objgen] = first[digest]
+        else:
+            first[digest] = obj
+    if not remap:
+        return 0
+
+    def relink(container):
+        items = (
+            container.items() if isinstance(container, pikepdf.Dictionary) else enumerate(container)
+        )
+        for key, value in list(items):
+            if not isinstance(value, pikepdf.Object):
+                continue
+            if value.is_indirect:
+                if value.objgen in remap:
+                    container[key] = remap[value.objgen]
+            elif isinstance(value, (pikepdf.Dictionary, pikepdf.Array)):
+                relink(value)
+
+    for obj in pdf.objects:
+        if isinstance(obj, pikepdf.Stream):
+            relink(obj.stream_dict)
+        elif isinstance(obj, (pikepdf.Dictionary, pikepdf.Array)):
+            relink(obj)
+    relink(pdf.trailer)
+    return len(remap)
@@ -0,0 +1,85 @@
+"""Print a PDF straight to a file in chunks, never holding all of it.
+
+``page.pdf()`` has Chromium hand the finished PDF back to Playwright, which
+reads all of it and delivers it as one base64 payload, so peak memory
+grows with the document. stream_pdf() sends ``Page.printToPDF`` over a CDP
+session with ``transferMode: ReturnAsStream`` itself. It then reads the
+stream with ``IO.read`` a chunk at a time, writing each chunk to the
+destination before reading the next. Memory stays at about one chunk
+whatever the page count.
+
+The parameters are the ones Playwright sends for PDF_OPTIONS, so the bytes
+match what ``page.pdf()`` prints.
+"""
+
+import base64
+import os
+
+from fit_pages import PAPER_INCHES, inches
+from pipeline import PDF_OPTIONS
+from profiling import profile_stage
+
+# Bytes asked of Chromium per IO.read
+STREAM_CHUNK_BYTES = 1024 * 1024
+
+
+def print_to_pdf_params(paper):
+    """Page.printToPDF parameters matching page.pdf(**PDF_OPTIONS), on paper."""
+    width, height = PAPER_INCHES[paper]
+    margin = PDF_OPTIONS["margin"]
+    # Every key Playwright sends, including the ones left at its defaults:
+    # Chromium's own defaults differ for some, such as generateTaggedPDF
+    return {
+        "transferMode": "ReturnAsStream",
+        "landscape": False,
+        "displayHeaderFooter": False,
+        "headerTemplate": "",
+        "footerTemplate": "",
+        "printBackground": PDF_OPTIONS["print_background"],
+        "scale": 1,
+        "paperWidth": width,
+        "paperHeight": height,
+        "marginTop": inches(margin["top"]),
+        "marginBottom": inches(margin["bottom"]),
+        "marginLeft": inches(margin["left"]),
+        "marginRight": inches(margin["right"]),
+        "pageRanges": "",
+        "preferCSSPageSize": False,
+        "generateTaggedPDF": PDF_OPTIONS.get("tagged", False),
+        "generateDocumentOutline": PDF_OPTIONS.get("outline", False),
+    }
+
+
+async def _drain(session, handle, writable, chunk_size):
+    written = 0
+    while True:
+        chunk = await session.send("IO.read", {"handle": handle, "size": chunk_size})
+        data = chunk["data"]
+        data = base64.b64decode(data) if chunk.get("base64Encoded") else data.encode("latin-1")
+        writable.write(data)
+        written += len(data)
+        if chunk.get("eof"):
+            return written
+
+
+async def stream_pdf(page, destination, paper=None, chunk_size=STREAM_CHUNK_BYTES):
+    """Print the document loaded in page to destination, a chunk at a time.
+
+    destination is a path or a binary writable (anything with ``write``).
+    Returns the number of bytes written.
+    """
+    paper = paper or PDF_OPTIONS["format"]
+    session = await page.context.new_cdp_session(page)
+    try:
+        with profile_stage("page.pdf", paper=paper, streamed=True):
+            result = await session.send("Page.printToPDF", print_to_pdf_params(paper))
+            handle = result["stream"]
+            try:
+                if isinstance(destination, str | os.PathLike):
+                    with open(destination, "wb") as file:
+                        return await _drain(session, handle, file, chunk_size)
+                return await _drain(session, handle, destination, chunk_size)
+            finally:
+                await session.send("IO.close", {"handle": handle})
+    finally:
+        await session.detach()
@@ -0,0 +1,1324 @@
+"""The resume-pdf rendering pipeline, shared by the CLI and every other entry point.
+
+Markdown goes through preprocessing, Python-Markdown with the resume DOM
+transforms, and the page template, with each stage cached (see
+stage_keys()), then prints through a backend (see open_backend()). The
+batch, watch, server, variant and export paths all build on the
+functions here; resume_pdf.py is only the command line.
+"""
+
+import asyncio
+import functools
+import glob
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import re
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+
+from browser_pool import DEFAULT_MAX_RENDERS, DEFAULT_POOL_SIZE
+from dom_transforms import TransformRegistry
+from hermetic import font_bundle
+from pdf_optimize import OptimizeReport, optimize_pdf
+from profiling import profile_lane, profile_stage
+from render_cache import RenderCache, cache_key
+from reproducible import etag_path, pin_metadata, source_date, write_etag
+
+# Headings whose following paragraphs are rendered as skill tags
+SKILLS_SECTION_TITLES = [
+    "Programming Languages",
+    "Technical Expertise",
+    "Engineering Leadership",
+]
+
+# Options passed to page.pdf() for every document
+PDF_OPTIONS = {
+    "format": "Letter",
+    "margin": {"top": "0.5in", "bottom": "0.5in", "left": "0.5in", "right": "0.5in"},
+    "print_background": True,
+}
+
+# Number of documents rendered at once in batch mode
+DEFAULT_CONCURRENCY = DEFAULT_POOL_SIZE
+
+# Python-Markdown extensions used to render the body
+# Note: removed "nl2br" extension so text wraps naturally
+MARKDOWN_EXTENSIONS = ["tables", "attr_list"]
+
+# Bump when a change to PDF printing should invalidate cached renders
+RENDERER_VERSION = "1"
+
+# Pipeline stages in order; each one's cache key chains from the previous
+PIPELINE_STAGES = ("markdown", "body", "html", "pdf")
+
+# The typed model branches off the body; the template takes its title
+# from it and the json export the whole of it
+MODEL_STAGE = "model"
+
+# attr_list attribute naming the variants an element belongs to (see
+# variants); only variant selection reads it, so renders drop it
+TAGS_ATTRIBUTE = "tags"
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """How a PDF is produced, beyond the markdown it comes from.
+
+    ``offline`` renders with the bundled fonts and blocks every other
+    request. ``optimize`` post-processes the printed PDF with pdf_optimize.
+    ``reproducible`` pins its timestamps and ID so identical input gives
+    identical bytes, and writes an ETag sidecar next to it. ``formats``
+    lists what to export (see exports.EXPORT_FORMATS), with a page-one
+    thumbnail for each of ``thumbnail_widths`` when it includes png.
+    ``backend`` names the engine that prints (see backends.BACKENDS).
+    ``fit_pages`` scales the type so each PDF fills at most that many pages.
+    ``shards`` prints a long document as that many shards at once, split
+    at its h2s, and merges them.
+    ``stream`` has Chromium write a PDF going straight to its file in
+    chunks, keeping memory flat for very large documents.
+    ``cdp_endpoint`` attaches Chromium renders to a browser that is already
+    running, launching one only if it can't be reached.
+    """
+
+    offline: bool = False
+    optimize: bool = False
+    reproducible: bool = False
+    formats: tuple[str, ...] = ("pdf",)
+    thumbnail_widths: tuple[int, ...] = (1200, 600, 300)
+    backend: str = "playwright"
+    fit_pages: int | None = None
+    shards: int = 1
+    stream: bool = False
+    cdp_endpoint: str | None = None
+
+    @property
+    def pdf_only(self):
+        return self.formats == ("pdf",)
+
+
+DEFAULT_RENDER_OPTIONS = RenderOptions()
+
+# HTML template with CSS styling
+HTML_TEMPLATE_SOURCE = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <title>{{ title | e }}</title>
+        <style>
+            @import url(
+                'https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&family=Space+Grotesk:wght@400;500;600&display=swap'
+            );
+
+            :root {
+                --primary: #00a0a0;          /* Darker Cyan */
+                --primary-light: rgba(0, 160, 160, 0.2);
+                --secondary: #cc00cc;        /* Darker Magenta */
+                --accent: #00a0a0;           /* Darker Cyan accent */
+                --text-dark: #101018;        /* Near black text */
+                --text-header: #00a0a0;      /* Cyan for headers */
+                --text-subheader: #cc00cc;   /* Magenta for subheaders */
+                --link-color: #008080;       /* Darker cyan for links */
+                --background: #ffffff;       /* White background */
+                --background-light: #f0f2f5; /* Light gray for sections */
+                --body-font: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
+            }
+
+            body {
+                font-family: var(--body-font);
+                font-weight: 400;
+                line-height: 1.3;
+                max-width: 1000px;
+                margin: 0 auto;
+                padding: 1em;
+                color: var(--text-dark);
+                font-size: 9pt;
+                background: var(--background);
+            }
+
+            /* Overridden by later h1 rule */
+
+            h2 {
+                color: var(--secondary);
+                font-size: 1.4em;
+                margin: 1.6em 0 0.8em 0;
+                padding: 0.3em 0 0.3em 0.8em;
+                border-left: 4px solid var(--secondary);
+                background: none;
+            }
+
+            h2.first-section {
+                margin-top: 1em;
+            }
+
+            h3 {
+                color: var(--accent);
+                font-size: 1.2em;
+                margin: 1em 0 0.6em 0;
+                padding: 0.3em 0.8em;
+                border-bottom: 1px solid var(--primary-light);
+            }
+
+            /* Special styling for the first employer */
+            h3.first-subsection {
+                margin-top: 0.6em;
+            }
+
+            /* Add a subtle line between employers */
+            h3:not(.first-subsection) {
+                border-top: 1px solid rgba(0, 255, 255, 0.1);
+                padding-top: 0.4em;
+            }
+
+            /* Experience section styling */
+            h3.employer {
+                border-top: 1px solid var(--primary-light);
+                background-color: var(--background-light);
+            }
+
+            /* Old skills styling removed - using .skill-tag class now */
+
+            /* Links styling */
+            a {
+                color: var(--link-color);
+                text-decoration: none;
+                border-bottom: 1px dotted var(--link-color);
+                padding-bottom: 1px;
+            }
+
+            a:hover {
+                color: var(--secondary);
+                border-bottom: 1px solid var(--secondary);
+                text-decoration: none;
+            }
+
+            /* List styling */
+            ul {
+                list-style: none;
+                margin: 0.6em 0 1em 0;
+                padding: 0;
+            }
+
+            li {
+                margin: 0.35em 0;
+                line-height: 1.5;
+                color: var(--text-dark);
+                padding-left: 1.8em;
+                position: relative;
+                border-left: 2px solid var(--primary-light);
+                margin-left: 0.5em;
+            }
+
+            li::before {
+                content: "▹";
+                position: absolute;
+                left: 0.6em;
+                color: var(--accent);
+            }
+
+            /* Technologies: lines - inline flow for links */
+            li.tech-line {
+                border-left-color: var(--secondary);
+            }
+
+            /* Keep technology links inline */
+            li a {
+                white-space: nowrap;
+            }
+
+            /* Date styling */
+            em {
+                color: var(--primary);
+            }
+
+            /* Technologies emphasis */
+            li strong {
+                color: var(--secondary);
+                font-weight: 600;
+            }
+
+            /* Summary section styling */
+            p.summary-first {
+                margin-bottom: 1.5em;
+            }
+
+            p.summary-second {
+                margin-top: 1.5em;
+                font-style: italic;
+                color: var(--primary);
+                text-shadow: 0 0 4px var(--primary-light);
+            }
+
+            /* Ensure header content is properly centered */
+            .header-content {
+                text-align: center !important;
+                margin: 0.5em auto !important;
+                width: 100% !important;
+                display: block !important;
+            }
+
+            /* Style specifically for the links paragraph */
+            .header-content a {
+                display: inline-block;
+                margin: 0 0.5em;
+                color: var(--primary);
+            }
+
+            /* h1 styling moved to Name styling section below */
+
+            /* Skills now use .skills-list class - see above */
+
+            /* Job entry styling */
+            h3 {
+                color: var(--accent);
+                font-size: 1.2em;
+                margin-top: 1.2em;
+                margin-bottom: 0.5em;
+                padding: 0.3em 0;
+                border-bottom: 1px solid var(--primary-light);
+            }
+
+            /* Role container */
+            h4 {
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+                margin: 0.8em 0 0.2em 0;
+                padding: 0.2em 0;
+            }
+
+            /* Role title */
+            h4 span:first-child {
+                color: var(--secondary);
+                font-size: 1.1em;
+                font-weight: 600;
+            }
+
+            /* Convert h4 text to a flex container */
+            h4::after {
+                content: attr(data-date);
+                color: var(--primary);
+                font-size: 0.9em;
+                font-style: italic;
+                font-weight: normal;
+            }
+
+            /* Remove original date paragraph */
+            h4 + p {
+                display: none;
+            }
+
+            /* Role description bullets */
+            ul {
+                margin: 0.6em 0 1em 0.8em;
+            }
+
+            li {
+                margin: 0.35em 0;
+                line-height: 1.5;
+                color: var(--text-dark);
+            }
+
+            /* Technologies emphasis */
+            li strong {
+                color: var(--secondary);
+                font-weight: 600;
+            }
+
+            /* Employer section styling */
+            h3.employer {
+                color: var(--accent);
+                font-size: 1.1em;
+                margin: 1em 0 0.6em 0;
+                padding: 0.2em 0.6em;
+                background: none;
+                border-left: 3px solid var(--accent);
+                font-weight: 500;
+                letter-spacing: 0.02em;
+            }
+
+            /* Role content indentation */
+            .role,
+            .in-experience {
+                margin-left: 1em;
+            }
+
+            /* Name styling - gradient background bar */
+            h1 {
+                font-family: 'Space Grotesk', 'Outfit', sans-serif;
+                font-size: 2.2em;
+                text-align: center;
+                margin: 0.5em 0;
+                padding: 0.5em 1em;
+                text-transform: uppercase;
+                letter-spacing: 0.1em;
+                background: linear-gradient(90deg, #00a0a0 0%, #8800aa 50%, #cc00cc 100%);
+                color: #ffffff;
+                border-radius: 6px;
+                font-weight: 600;
+            }
+
+            /* Name text styling - no background */
+            h1 span {
+                color: #ffffff;
+                font-weight: 600;
+                background: transparent;
+            }
+
+            /* Summary section */
+            p.summary-first {
+                text-align: justify;
+                line-height: 1.5;
+                margin: 0.8em 0;
+            }
+
+            /* Skills list styling */
+            .skills-list {
+                display: flex;
+                flex-wrap: wrap;
+                gap: 0.4em;
+                align-items: center;
+                margin: 0.5em 0;
+                padding-left: 1.2em;
+            }
+
+            .skill-category {
+                font-weight: 600;
+                color: var(--secondary);
+                margin-right: 0.3em;
+                white-space: nowrap;
+                width: 100%;
+                padding-left: 0;
+                margin-left: -1.2em;
+                margin-top: 0.3em;
+            }
+
+            .skill-category:first-child {
+                margin-top: 0;
+            }
+
+            .skill-tag {
+                display: inline-block;
+                background: var(--background-light);
+                border: 1px solid var(--primary-light);
+                padding: 0.15em 0.5em;
+                border-radius: 4px;
+                font-size: 0.9em;
+                color: var(--text-dark);
+                text-decoration: none;
+            }
+
+            a.skill-tag {
+                border-bottom: none;
+            }
+
+            /* Experience section indentation */
+            /* Only indent content under h3 (employers) */
+            .role,
+            .in-experience {
+                margin-left: 1.2em;
+            }
+
+            /* Keep employers (h3) at full width; h2 margins are already 0 */
+            h3.employer {
+                margin-left: 0;
+            }
+
+            /* Adjust employer headers styling */
+            h3.employer {
+                width: 100%;  /* Full width for employers */
+            }
+        </style>
+    </head>
+    <body>
+        {{ content }}
+    </body>
+    </html>
+    """  # noqa: E501
+
+
+@functools.cache
+def compiled_template_source():
+    """HTML_TEMPLATE_SOURCE with its stylesheet compiled and merged.
+
+    The stylesheet is written incrementally; render with the compiled one.
+    """
+    from stylesheet import compile_template_styles
+
+    return compile_template_styles(HTML_TEMPLATE_SOURCE)
+
+
+@functools.cache
+def html_template():
+    """The page template, compiled on first use."""
+    from jinja2 import Template
+
+    return Template(compiled_template_source())
+
+
+def remove_emojis(text):
+    """Remove emojis from the given text."""
+    import emoji
+
+    return emoji.replace_emoji(text, replace="")
+
+
+def process_skills_paragraph(p, soup):
+    """Process skills paragraph to create tag-like spans from pipe-separated items."""
+    items = []
+
+    for content in list(p.contents):
+        if isinstance(content, str):
+            # Split by pipe and process each part
+            text = content.strip()
+            if text:
+                parts = text.split("|")
+                for part in parts:
+                    part = part.strip().strip(":").strip()
+                    if part and part != ":":
+                        items.append(("text", part))
+        elif hasattr(content, "name"):
+            if content.name == "a":
+                # Extract link text and URL
+                link_text = content.get_text().strip()
+                if link_text:
+                    items.append(("link", content))
+            elif content.name == "strong":
+                # This is a category label - add as category header
+                cat_text = content.get_text().strip().rstrip(":")
+                if cat_text:
+                    items.append(("category", cat_text))
+            elif content.name == "br":
+                pass  # Skip line breaks
+
+    # Rebuild the paragraph with proper structure
+    p.clear()
+    p["class"] = p.get("class", []) + ["skills-list"]
+
+    for item_type, item in items:
+        if item_type == "category":
+            # Add category as a label span
+            cat_span = soup.new_tag("span")
+            cat_span["class"] = ["skill-category"]
+            cat_span.string = item + ":"
+            p.append(cat_span)
+            p.append(" ")
+        elif item_type == "link":
+            # Clone the link and add skill class
+            item["class"] = item.get("class", []) + ["skill-tag"]
+            p.append(item)
+            p.append(" ")
+        elif item_type == "text":
+            span = soup.new_tag("span")
+            span["class"] = ["skill-tag"]
+            span.string = item
+            p.append(span)
+            p.append(" ")
+
+
+# DOM transforms, applied together in one traversal by transform_html()
+transforms = TransformRegistry()
+
+
+@transforms.on("h1", when=lambda h1, ctx: ctx.counts["h1"] == 1)
+def process_name(h1, ctx):
+    """Process the name to add gradient effect."""
+    if h1.string:
+        name_span = ctx.soup.new_tag("span")
+        name_span.string = h1.string
+        h1.string = ""
+        h1.append(name_span)
+
+
+# The first two paragraphs are the tagline and links
+@transforms.on("p", when=lambda p, ctx: ctx.counts["p"] <= 2)
+def process_header_section(p, ctx):
+    """Process the header section to ensure proper centering."""
+    # Add a special class to these paragraphs
+    p["class"] = p.get("class", []) + ["header-content"]
+    # Clean up whitespace between elements without destroying the links
+    for br in p.find_all("br"):
+        br.replace_with(" ")
+    # Join text nodes with single spaces
+    for text in p.find_all(string=True):
+        if text.strip():
+            text.replace_with(" " + text.strip() + " ")
+
+
+@transforms.on("h4")
+def queue_job_entry(h4, ctx):
+    """Remember a role heading until its date paragraph turns up."""
+    ctx.scope(h4).setdefault("roles", []).append(h4)
+
+
+@transforms.on("p", when=lambda p, ctx: bool(ctx.scope(p).get("roles")))
+def process_job_entries(p, ctx):
+    """Process job entries to combine role and date."""
+    roles = ctx.scope(p)["roles"]
+    try:
+        # Extract the date text from em tag
+        em_tag = p.find("em")
+        if not em_tag or not em_tag.string:
+            # Every waiting role would have found this same paragraph
+            roles.clear()
+            return
+
+        h4 = roles.pop(0)
+        date_text = em_tag.string.strip()
+
+        # Add date to h4 as data attribute
+        h4["data-date"] = date_text
+
+        # Create new span for title if h4 has content
+        if h4.string:
+            title_span = ctx.soup.new_tag("span")
+            title_span.string = h4.string.strip()
+            h4.string = ""
+            h4.append(title_span)
+
+        # Remove the original date paragraph
+        ctx.remove(p)
+
+    except Exception as e:
+        print(f"Warning: Could not process job entry: {str(e)}")
+
+
+@transforms.on("h2", "h3")
+def track_skills_section(heading, ctx):
+    """Note whether the paragraphs that follow belong to a skills section."""
+    ctx.scope(heading)["skills"] = (
+        heading.name == "h3" and heading.text.strip() in SKILLS_SECTION_TITLES
+    )
+
+
+@transforms.on("p", when=lambda p, ctx: ctx.scope(p).get("skills", False))
+def process_skills(p, ctx):
+    """Turn every paragraph under a skills h3 into skill tags."""
+    process_skills_paragraph(p, ctx.soup)
+
+
+# Classes the stylesheet matches instead of sibling combinators and :has()
+@transforms.on("h2", "h3", "h4", "p", "ul")
+def mark_experience_section(element, ctx):
+    """Stamp employer, role and in-experience classes after the Experience heading."""
+    scope = ctx.scope(element)
+    if element.name == "h2" and element.get("id") == "experience":
+        scope["experience"] = True
+    elif not scope.get("experience"):
+        return
+    elif element.name == "h3":
+        element["class"] = element.get("class", []) + ["employer"]
+        scope["employer"] = True
+    elif scope.get("employer") and element.name != "h2":
+        role = "role" if element.name == "h4" else "in-experience"
+        element["class"] = element.get("class", []) + [role]
+
+
+@transforms.on("li")
+def mark_technology_line(li, ctx):
+    """Stamp tech-line on items with a leading bold label, like Technologies."""
+    if any(strong.find_previous_sibling(True) is None for strong in li.find_all("strong")):
+        li["class"] = li.get("class", []) + ["tech-line"]
+
+
+# Classes the stylesheet matches instead of :first-of-type, so a shard
+# printed on its own styles its headings as the whole document would
+@transforms.on("h2", when=lambda h2, ctx: ctx.counts["h2"] == 1)
+@transforms.on("h3", when=lambda h3, ctx: ctx.counts["h3"] == 1)
+def mark_first_heading(heading, ctx):
+    """Stamp first-section on the first h2 and first-subsection on the first h3."""
+    first = "first-section" if heading.name == "h2" else "first-subsection"
+    heading["class"] = heading.get("class", []) + [first]
+
+
+# #summary + p and #summary + p + p, in order
+SUMMARY_CLASSES = ("summary-first", "summary-second")
+
+
+@transforms.on("h2", "p")
+def mark_summary_paragraphs(element, ctx):
+    """Stamp the paragraphs straight after the Summary heading."""
+    scope = ctx.scope(element)
+    if element.name == "h2":
+        scope["summary"] = [element] if element.get("id") == "summary" else None
+        return
+    chain = scope.get("summary")
+    if not chain:
+        return
+    if len(chain) > len(SUMMARY_CLASSES) or element.find_previous_sibling(True) is not chain[-1]:
+        scope["summary"] = None
+        return
+    element["class"] = element.get("class", []) + [SUMMARY_CLASSES[len(chain) - 1]]
+    chain.append(element)
+
+
+def preprocess_markdown(md_content):
+    """Strip frontmatter and tag the sections the stylesheet targets by id."""
+    # Remove YAML frontmatter (everything between --- markers at the start)
+    md_content = re.sub(r"^---[\s\S]*?---\n*", "", md_content)
+
+    # Add IDs to sections before removing emojis, keeping any attributes
+    # (such as variant tags) the heading already had
+    def section_heading(title, section_id):
+        def replace(match):
+            attributes = f" {match.group(1)[2:-1].strip()}" if match.group(1) else ""
+            return f"## {title} {{: #{section_id}{attributes}}}"
+
+        return replace
+
+    md_content = re.sub(
+        r"^##.*Experience.*?(\{:[^}\n]*\})?[ \t]*$",
+        section_heading("🏢 Experience", "experience"),
+        md_content,
+        flags=re.MULTILINE,
+    )
+    md_content = re.sub(
+        r"^##.*Summary.*?(\{:[^}\n]*\})?[ \t]*$",
+        section_heading("🌠 Summary", "summary"),
+        md_content,
+        flags=re.MULTILINE,
+    )
+
+    # attr_list only reads a list item's attributes from a line of their
+    # own, so move a trailing "{: tags=...}" off the bullet line
+    md_content = re.sub(
+        r"^([ \t]*(?:[-*+]|\d+\.)[ \t].*?)[ \t]*(\{:[^}\n]*\})[ \t]*$",
+        r"\1\n\2",
+        md_content,
+        flags=re.MULTILINE,
+    )
+
+    # Keep emojis - they add personality
+    return md_content
+
+
+def transform_html(html_content, drop_attributes=()):
+    """Apply the resume DOM transforms to rendered markdown HTML.
+
+    drop_attributes are removed from every element that has them.
+    """
+    from bs4 import BeautifulSoup
+
+    # Process the HTML content
+    with profile_stage("beautifulsoup parse"):
+        soup = BeautifulSoup(html_content, "html.parser")
+
+    # Name, header, job entries and skills in a single traversal
+    transforms.apply(soup)
+    for name in drop_attributes:
+        # Skip the search for attributes the markup never mentions
+        if f" {name}=" in html_content:
+            for element in soup.find_all(attrs={name: True}):
+                del element[name]
+
+    # Get the modified HTML content
+    with profile_stage("beautifulsoup serialize"):
+        return str(soup)
+
+
+def markdown_to_body(md_content, keep_tags=False):
+    """Convert preprocessed markdown to the transformed HTML body.
+
+    The transforms normally run inside Python-Markdown on its own tree;
+    documents the extension cannot handle exactly, such as ones with raw
+    HTML, go through BeautifulSoup instead. The variant ``tags`` attributes
+    are removed unless keep_tags is set.
+    """
+    import markdown
+
+    from resume_markdown import ResumeExtension
+
+    dropped = [] if keep_tags else [TAGS_ATTRIBUTE]
+    extension = ResumeExtension(skills_titles=SKILLS_SECTION_TITLES, drop_attributes=dropped)
+    with profile_stage("markdown"):
+        html_content = markdown.Markdown(extensions=[*MARKDOWN_EXTENSIONS, extension]).convert(
+            md_content
+        )
+    if extension.applied:
+        return html_content
+    return transform_html(html_content, dropped)
+
+
+def preprocess(md_content):
+    with profile_stage("preprocess"):
+        return preprocess_markdown(md_content)
+
+
+def parse_model(body):
+    from resume_model import parse_resume
+
+    with profile_stage("model"):
+        return parse_resume(body)
+
+
+def build_resume_body(md_content, cache=None, keep_tags=False):
+    """Run the markdown and DOM stages, returning the transformed body HTML.
+
+    With a RenderCache, cached stages are reused as in build_resume_html().
+    Variants pass keep_tags for the ``tags`` attributes they select by.
+    """
+    if cache is None:
+        return markdown_to_body(preprocess(md_content), keep_tags)
+
+    keys = stage_keys(md_content)
+    key = cache_key(keys["body"], TAGS_ATTRIBUTE) if keep_tags else keys["body"]
+    body = cache.load_stage("body", key)
+    if body is None:
+        preprocessed = cache.load_stage("markdown", keys["markdown"])
+        if preprocessed is None:
+            preprocessed = preprocess(md_content)
+            cache.store_stage("markdown", keys["markdown"], preprocessed)
+        body = markdown_to_body(preprocessed, keep_tags)
+        cache.store_stage("body", key, body)
+    return body
+
+
+def build_resume_model(md_content, cache=None, body=None):
+    """Parse the transformed body into a Resume, through the cache if given.
+
+    Pass the body (or the templated page) when it is already built, so it is
+    not built again.
+    """
+    from resume_model import Resume
+
+    if cache is None:
+        return parse_model(build_resume_body(md_content) if body is None else body)
+
+    key = stage_keys(md_content)[MODEL_STAGE]
+    cached = cache.load_stage(MODEL_STAGE, key)
+    if cached is not None:
+        return Resume.from_json(cached)
+    resume = parse_model(build_resume_body(md_content, cache) if body is None else body)
+    cache.store_stage(MODEL_STAGE, key, resume.to_json())
+    return resume
+
+
+def render_template(body, resume):
+    """Wrap body in the page template, titled from its Resume model."""
+    with profile_stage("jinja"):
+        return html_template().render(content=body, title=resume.title)
+
+
+def build_resume_page(md_content, cache=None):
+    """Run the markdown through every stage up to the final templated HTML.
+
+    Returns the HTML and the Resume model it was titled from, parsed once
+    so the json export can reuse it. With a RenderCache, the latest stage
+    already cached for this input is reused and only the stages after it
+    run, so a stylesheet change skips the markdown and DOM work entirely;
+    when the HTML itself is cached the model is not loaded, and None is
+    returned for it.
+    """
+    if cache is None:
+        body = markdown_to_body(preprocess(md_content))
+        resume = parse_model(body)
+        return render_template(body, resume), resume
+
+    keys = stage_keys(md_content)
+    html_output = cache.load_stage("html", keys["html"])
+    if html_output is not None:
+        return html_output, None
+
+    body = build_resume_body(md_content, cache)
+    resume = build_resume_model(md_content, cache, body)
+    html_output = render_template(body, resume)
+    cache.store_stage("html", keys["html"], html_output)
+    return html_output, resume
+
+
+def build_resume_html(md_content, cache=None):
+    """The final templated HTML of md_content, as built by build_resume_page()."""
+    return build_resume_page(md_content, cache)[0]
+
+
+def code_digest(*functions):
+    """Digest of the source of functions, so editing one invalidates its stage.
+
+    A module can also be given by name, to be read from its file without
+    importing it.
+    """
+    hasher = hashlib.sha256()
+    for function in functions:
+        if isinstance(function, str):
+            with open(importlib.util.find_spec(function).origin, encoding="utf-8") as file:
+                source = file.read()
+        else:
+            source = inspect.getsource(function)
+        hasher.update(source.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def package_version(name):
+    """Installed version of a distribution, or "unknown"."""
+    try:
+        from importlib.metadata import version
+
+        return version(name)
+    except Exception:
+        return "unknown"
+
+
+@functools.cache
+def stage_fingerprints():
+    """Identify the code and settings each pipeline stage depends on."""
+    playwright_version = package_version("playwright")
+    return {
+        "markdown": code_digest(preprocess_markdown),
+        "body": ":".join(
+            [
+                f"markdown-{package_version('markdown')}",
+                json.dumps(MARKDOWN_EXTENSIONS),
+                json.dumps(SKILLS_SECTION_TITLES),
+                code_digest(
+                    markdown_to_body,
+                    transform_html,
+                    process_name,
+                    process_header_section,
+                    queue_job_entry,
+                    process_job_entries,
+                    track_skills_section,
+                    process_skills,
+                    process_skills_paragraph,
+                    mark_experience_section,
+                    mark_technology_line,
+                    mark_first_heading,
+                    mark_summary_paragraphs,
+                    TransformRegistry,
+                    # The in-tree transforms and serializer
+                    "resume_markdown",
+                ),
+            ]
+        ),
+        MODEL_STAGE: code_digest("resume_model"),
+        "html": ":".join(
+            [HTML_TEMPLATE_SOURCE, code_digest("stylesheet"), code_digest("resume_model")]
+        ),
+        "pdf": ":".join(
+            [
+                RENDERER_VERSION,
+                json.dumps(PDF_OPTIONS, sort_keys=True),
+                f"playwright-{playwright_version}",
+                code_digest(print_pdf),
+            ]
+        ),
+    }
+
+
+def stage_keys(md_content):
+    """Chained cache keys for each pipeline stage of md_content.
+
+    Each key covers the previous stage's key plus the stage's own code and
+    settings, so a change invalidates only the stages from that point on.
+    The model's key chains from the body's, outside the render chain.
+    """
+    fingerprints = stage_fingerprints()
+    keys = {}
+    key = cache_key(md_content)
+    for stage in PIPELINE_STAGES:
+        key = cache_key(key, fingerprints[stage])
+        keys[stage] = key
+    keys[MODEL_STAGE] = cache_key(keys["body"], fingerprints[MODEL_STAGE])
+    return keys
+
+
+@functools.cache
+def optimize_fingerprint():
+    """Identify the optimizer code and the libraries it runs on."""
+    return ":".join(
+        [
+            f"pikepdf-{package_version('pikepdf')}",
+            f"fonttools-{package_version('fonttools')}",
+            code_digest(inspect.getmodule(optimize_pdf)),
+        ]
+    )
+
+
+def render_key(md_content, options=DEFAULT_RENDER_OPTIONS):
+    """Cache key for the final PDF of md_content rendered with options.
+
+    Offline renders use the bundled fonts, so their key covers the bundle;
+    optimized ones cover the optimizer, and reproducible ones the date
+    stamped on them.
+    """
+    key = stage_keys(md_content)["pdf"]
+    if options.offline:
+        key = cache_key(key, "offline", font_bundle().digest)
+    if options.reproducible:
+        key = cache_key(
+            key,
+            "reproducible",
+            str(source_date(md_content)),
+            code_digest(inspect.getmodule(pin_metadata)),
+        )
+    if options.optimize:
+        key = cache_key(key, "optimize", optimize_fingerprint())
+    if options.fit_pages:
+        key = cache_key(key, "fit", str(options.fit_pages), code_digest("fit_pages"))
+    if options.shards > 1:
+        key = cache_key(key, "shards", str(options.shards), code_digest("shards"))
+    if options.backend != "playwright":
+        # The pdf stage fingerprint describes Chromium printing
+        key = cache_key(key, options.backend, backend_fingerprint(options.backend))
+    return key
+
+
+@functools.cache
+def backend_fingerprint(name):
+    """Identify a non-default backend's code and the library it prints with."""
+    return ":".join([f"{name}-{package_version(name)}", code_digest("backends")])
+
+
+def context_setup(options=DEFAULT_RENDER_OPTIONS):
+    """BrowserPool context hook for options, or None."""
+    return font_bundle().install if options.offline else None
+
+
+def open_backend(
+    options=DEFAULT_RENDER_OPTIONS,
+    size=DEFAULT_POOL_SIZE,
+    max_renders=DEFAULT_MAX_RENDERS,
+    max_heap_mb=None,
+):
+    """The backend options.backend names, not yet started.
+
+    The pool settings only apply to Chromium; WeasyPrint prints one
+    document at a time in-process. The pool keeps at least a page per
+    shard, so the shards of a document print at once.
+    """
+    from backends import PlaywrightBackend, WeasyPrintBackend
+
+    if options.backend == "weasyprint":
+        return WeasyPrintBackend(offline=options.offline)
+    return PlaywrightBackend(
+        max(size, options.shards),
+        max_renders,
+        max_heap_mb,
+        context_setup=context_setup(options),
+        cdp_endpoint=options.cdp_endpoint,
+        fit_pages=options.fit_pages,
+        shards=options.shards,
+        stream=options.stream,
+    )
+
+
+def resolve_output_path(input_path, output_path=None, output_dir=None):
+    """Work out where the PDF for input_path should be written."""
+    if output_path is not None:
+        return output_path
+
+    if output_dir is None:
+        # Find project root by looking for public/ directory
+        # Start from input file's directory and walk up
+        current_dir = os.path.dirname(os.path.abspath(input_path))
+        for _ in range(5):  # Look up to 5 levels
+            potential_public = os.path.join(current_dir, "public")
+            if os.path.isdir(potential_public):
+                output_dir = potential_public
+                break
+            parent = os.path.dirname(current_dir)
+            if parent == current_dir:  # Reached root
+                break
+            current_dir = parent
+
+        if output_dir is None:
+            # Fallback: create public/ next to input file
+            output_dir = os.path.join(os.path.dirname(input_path), "public")
+
+    # Create public directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f"{base_name}.pdf")
+
+
+def expand_inputs(patterns: Iterable[str]) -> list[str]:
+    """Expand files, directories and glob patterns into markdown paths.
+
+    Directories contribute every ``*.md`` file directly inside them. Order is
+    preserved and duplicates are dropped.
+    """
+    paths: list[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "*.md")))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        paths.extend(matches)
+    return list(dict.fromkeys(paths))
+
+
+@dataclass
+class RenderResult:
+    """Outcome of rendering a single markdown file."""
+
+    input_path: str
+    output_path: str
+    elapsed: float
+    error: str | None = None
+    cached: bool = False
+    # Whether a cache was consulted, so a render that is not a hit was a miss
+    cache_checked: bool = False
+    optimized: OptimizeReport | None = None
+    artifacts: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def print_pdf(page, html_output, output_path=None):
+    """Load html_output into page and print it, returning the PDF bytes.
+
+    The PDF is also written to output_path when one is given. The document
+    is handed to the page from memory, so rendering touches no temp files.
+    """
+    await load_html(page, html_output)
+    with profile_stage("page.pdf"):
+        return await page.pdf(path=output_path, **PDF_OPTIONS)
+
+
+async def load_html(page, html_output):
+    """Load html_output into page and wait until it is ready to print."""
+    with profile_stage("page load"):
+        await page.set_content(html_output, wait_until="load")
+        # Web fonts can still be decoding after the load event
+        await page.evaluate("() => document.fonts.ready.then(() => null)")
+
+
+async def render_pdf(
+    backend, html_output, output_path=None, options=DEFAULT_RENDER_OPTIONS, source_epoch=0
+):
+    """Print html_output with backend (see open_backend()).
+
+    Returns the PDF bytes and, when ``options.optimize`` is set, the
+    OptimizeReport; the PDF is also written to output_path when one is
+    given. A PDF streamed to output_path (``options.stream``) is not
+    returned: its bytes are None. Optimization runs in a worker thread so
+    other documents keep printing meanwhile. Reproducible PDFs are stamped
+    with ``source_epoch`` and get an ETag sidecar beside output_path.
+    """
+    if not (options.optimize or options.reproducible):
+        return await backend.print_pdf(html_output, output_path), None
+    pdf = await backend.print_pdf(html_output)
+    return await finish_pdf(pdf, output_path, options, source_epoch)
+
+
+async def finish_pdf(pdf, output_path=None, options=DEFAULT_RENDER_OPTIONS, source_epoch=0):
+    """Apply the reproducible and optimize steps to printed PDF bytes.
+
+    Returns the final bytes and the OptimizeReport, if any, and writes them
+    (with the ETag sidecar) to output_path when one is given.
+    """
+    if options.reproducible:
+        with profile_stage("pin metadata"):
+            pdf = pin_metadata(pdf, source_epoch)
+    report = None
+    if options.optimize:
+        with profile_stage("optimize"):
+            pdf, report = await asyncio.to_thread(optimize_pdf, pdf)
+    if output_path is not None:
+        with profile_stage("write"):
+            with open(output_path, "wb") as file:
+                file.write(pdf)
+            if options.reproducible:
+                write_etag(output_path, pdf)
+    return pdf, report
+
+
+def output_paths(output_path, options=DEFAULT_RENDER_OPTIONS):
+    """Map each artifact a render with options writes to its path."""
+    if options.pdf_only:
+        return {"pdf": output_path}
+    from exports import artifact_paths
+
+    return artifact_paths(output_path, options.formats, options.thumbnail_widths)
+
+
+def output_keys(key, options, names):
+    """Cache key for each named artifact of a render whose PDF key is key."""
+    if options.pdf_only:
+        return {"pdf": key}
+    from exports import artifact_keys
+
+    return artifact_keys(key, names)
+
+
+def outputs_fresh(cache, output_path, key, options=DEFAULT_RENDER_OPTIONS):
+    """True if every artifact of the render keyed on key is current in cache."""
+    paths = output_paths(output_path, options)
+    keys = output_keys(key, options, paths)
+    if not all(cache.is_fresh(paths[name], keys[name]) for name in paths):
+        return False
+    pdfs = [path for path in paths.values() if path.endswith(".pdf")]
+    return not options.reproducible or all(os.path.isfile(etag_path(path)) for path in pdfs)
+
+
+def record_outputs(cache, paths, key, options=DEFAULT_RENDER_OPTIONS):
+    """Record the artifacts in paths, written by the render keyed on key."""
+    for name, artifact_key in output_keys(key, options, paths).items():
+        cache.record(paths[name], artifact_key)
+
+
+def check_cache(cache, input_path, output_path, options=DEFAULT_RENDER_OPTIONS):
+    """Return a cache-hit RenderResult if output_path is current, else None."""
+    start = time.perf_counter()
+    try:
+        with open(input_path, encoding="utf-8") as file:
+            key = render_key(file.read(), options)
+    except OSError:
+        # Let the render report the problem
+        return None
+    if not outputs_fresh(cache, output_path, key, options):
+        return None
+    return RenderResult(
+        input_path, output_path, time.perf_counter() - start, cached=True, cache_checked=True
+    )
+
+
+async def write_outputs(
+    backend, md_content, html_output, output_path, options, base_dir, cache=None, resume=None
+):
+    """Print html_output to output_path, plus every other format in options.
+
+    base_dir resolves relative image paths for the standalone HTML. The
+    json export reuses resume, the model html_output was built from, or
+    else the one cached in cache. Returns the OptimizeReport, if any, and
+    the path of each artifact written.
+    """
+    if options.pdf_only:
+        _, report = await render_pdf(
+            backend, html_output, output_path, options, source_date(md_content)
+        )
+        return report, {"pdf": output_path}
+    from exports import export_artifacts
+
+    paths = output_paths(output_path, options)
+    report = await export_artifacts(
+        backend, md_content, html_output, paths, options, base_dir, cache, resume
+    )
+    return report, paths
+
+
+async def render_file(
+    backend, input_path, output_path, cache=None, options=DEFAULT_RENDER_OPTIONS
+) -> RenderResult:
+    """Render one markdown file with backend.
+
+    When a cache is given, the new output is recorded in it. The backend
+    must have been built with ``open_backend(options)``.
+    """
+    start = time.perf_counter()
+    try:
+        with profile_lane(input_path):
+            with open(input_path, encoding="utf-8") as file:
+                md_content = file.read()
+            html_output, resume = build_resume_page(md_content, cache)
+            base_dir = os.path.dirname(os.path.abspath(input_path))
+            report, paths = await write_outputs(
+                backend, md_content, html_output, output_path, options, base_dir, cache, resume
+            )
+            if cache is not None:
+                record_outputs(cache, paths, render_key(md_content, options), options)
+    except Exception as e:
+        return RenderResult(input_path, output_path, time.perf_counter() - start, str(e))
+    elapsed = time.perf_counter() - start
+    return RenderResult(
+        input_path, output_path, elapsed, optimized=report, artifacts=list(paths.values())
+    )
+
+
+async def render_many(
+    input_paths: Iterable[str],
+    output_dir=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    backend=None,
+    cache: RenderCache | None = None,
+    force=False,
+    options: RenderOptions = DEFAULT_RENDER_OPTIONS,
+) -> AsyncIterator[RenderResult]:
+    """Render many markdown files through one shared backend.
+
+    Up to ``concurrency`` documents print at once. Results are yielded as each
+    file finishes, so callers can report progress while the batch runs.
+    A failing file produces a result with ``error`` set rather than aborting
+    the batch. Pass ``backend`` to reuse one; otherwise open_backend()
+    builds one sized to ``concurrency`` for this batch.
+
+    With a ``cache``, files whose output is already current are yielded as
+    hits without rendering, and the browser is only launched if something
+    actually needs printing. ``force`` renders everything regardless.
+
+    ``options`` chooses the backend, offline rendering and optimization; a
+    backend passed in must have been built with ``open_backend(options)``.
+    """
+    jobs = [(path, resolve_output_path(path, output_dir=output_dir)) for path in input_paths]
+
+    seen = {}
+    for input_path, output_path in jobs:
+        if output_path in seen:
+            raise ValueError(f"{input_path} and {seen[output_path]} both map to {output_path}")
+        seen[output_path] = input_path
+
+    checked = cache is not None and not force
+    if checked:
+        misses = []
+        for input_path, output_path in jobs:
+            hit = check_cache(cache, input_path, output_path, options)
+            if hit is None:
+                misses.append((input_path, output_path))
+            else:
+                yield hit
+        jobs = misses
+
+    owns_backend = backend is None
+    if backend is None:
+        backend = open_backend(options, concurrency)
+
+    # Bounds how many documents hold built HTML while waiting for a page
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(input_path, output_path):
+        async with semaphore:
+            result = await render_file(backend, input_path, output_path, cache, options)
+        result.cache_checked = checked
+        return result
+
+    tasks = [asyncio.create_task(run(*job)) for job in jobs]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if owns_backend:
+            await backend.close()
+        if cache is not None:
+            cache.save()
+
+
+def report_result(result):
+    """Print one line describing a RenderResult."""
+    if not result.ok:
+        print(f"Error generating PDF for {result.input_path}: {result.error}")
+    elif result.cached:
+        print(f"PDF up to date: {result.output_path} (cache hit)")
+        return
+    miss = ", cache miss" if result.cache_checked else ""
+    if len(result.artifacts) > 1:
+        print(f"Exported {result.input_path} ({result.elapsed:.2f}s{miss}):")
+        for path in result.artifacts:
+            print(f"  {path}")
+    else:
+        print(f"PDF generated: {result.output_path} ({result.elapsed:.2f}s{miss})")
+        if result.optimized is not None:
+            report = result.optimized
+            print(
+                f"  optimized: {report.summary()}, {report.fonts_subset} font(s) subset, "
+                f"{report.streams_merged} duplicate stream(s) merged"
+            )
@@ -0,0 +1,156 @@
+"""Live HTML preview of the resume pipeline, without launching a browser.
+
+Serves the templated HTML that would be printed, and pushes a reload to the
+page over server-sent events whenever the markdown changes.
+"""
+
+import asyncio
+import contextlib
+import html
+import mimetypes
+import os
+import time
+
+from pipeline import build_resume_html
+from watcher import snapshot, wait_for_change
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+
+# Polling is cheap here, so check often to keep edit-to-preview latency low
+POLL_INTERVAL = 0.02
+DEBOUNCE = 0.02
+
+# Seconds between SSE comments that keep idle connections open
+KEEPALIVE_INTERVAL = 15
+
+# Printable width of a Letter page with the 0.5in margins used for the PDF
+PREVIEW_HEAD = """
+<style>
+    html { background: #d8dbe2; }
+    body { width: 7.5in; box-sizing: border-box; margin: 0.5in auto; box-shadow: 0 0 12px #0003; }
+</style>
+<script>
+    new EventSource("/events").onmessage = () => location.reload();
+</script>
+"""
+
+
+class PreviewServer:
+    """Keep the latest rendered HTML and tell connected pages when it changes."""
+
+    def __init__(self, input_path, extra_paths=()):
+        self.input_path = input_path
+        self.paths = [input_path, *extra_paths]
+        self.root = os.path.dirname(os.path.realpath(input_path))
+        self.html = ""
+        self.version = 0
+        self._subscribers: set[asyncio.Queue] = set()
+
+    def rebuild(self):
+        """Re-run the HTML stages; a failure is shown in the page instead."""
+        start = time.perf_counter()
+        try:
+            with open(self.input_path, encoding="utf-8") as file:
+                page = build_resume_html(file.read())
+        except Exception as e:
+            page = f"<!DOCTYPE html><html><body><pre>{html.escape(str(e))}</pre></body></html>"
+            print(f"Error building preview: {str(e)}")
+        self.html = page.replace("</head>", PREVIEW_HEAD + "</head>", 1)
+        self.version += 1
+        for queue in self._subscribers:
+            queue.put_nowait(self.version)
+        return time.perf_counter() - start
+
+    async def watch(self):
+        state = snapshot(self.paths)
+        while True:
+            state = await wait_for_change(self.paths, state, POLL_INTERVAL, DEBOUNCE)
+            elapsed = self.rebuild()
+            print(f"Preview rebuilt in {elapsed * 1000:.0f} ms")
+
+    async def serve_connection(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            try:
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            except ValueError:
+                return
+            path = path.split("?", 1)[0]
+
+            if method != "GET":
+                await self._respond(writer, 405, "text/plain", b"GET only")
+            elif path == "/":
+                await self._respond(writer, 200, "text/html; charset=utf-8", self.html.encode())
+            elif path == "/events":
+                await self._stream_events(writer)
+            else:
+                await self._serve_asset(writer, path)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _stream_events(self, writer):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+        )
+        await writer.drain()
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        self._subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    version = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL)
+                except TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                else:
+                    writer.write(f"data: {version}\n\n".encode())
+                await writer.drain()
+        finally:
+            self._subscribers.discard(queue)
+
+    async def _serve_asset(self, writer, path):
+        """Serve images and other files sitting next to the markdown."""
+        asset = os.path.realpath(os.path.join(self.root, path.lstrip("/")))
+        if not asset.startswith(self.root + os.sep) or not os.path.isfile(asset):
+            await self._respond(writer, 404, "text/plain", b"Not found")
+            return
+        with open(asset, "rb") as file:
+            payload = file.read()
+        content_type = mimetypes.guess_type(asset)[0] or "application/octet-stream"
+        await self._respond(writer, 200, content_type, payload)
+
+    @staticmethod
+    async def _respond(writer, status, content_type, payload):
+        reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Cache-Control: no-store\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+
+async def serve_preview(input_path, host=DEFAULT_HOST, port=DEFAULT_PORT, extra_paths=()):
+    """Serve a live preview of input_path until cancelled."""
+    app = PreviewServer(input_path, extra_paths)
+    app.rebuild()
+    server = await asyncio.start_server(app.serve_connection, host, port)
+    print(f"Previewing {input_path} at http://{host}:{port}/")
+    async with server:
+        await asyncio.gather(server.serve_forever(), app.watch())
+
+
+def run_preview(input_path, host=DEFAULT_HOST, port=DEFAULT_PORT, extra_paths=()):
+    """Sync wrapper for serve_preview() that exits quietly on Ctrl-C."""
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve_preview(input_path, host, port, extra_paths))
@@ -0,0 +1,207 @@
+"""Per-stage profiling: wall and CPU time and memory high-water marks.
+
+Code marks its stages with profile_stage(), a no-op unless a Profiler is
+active:
+
+    with Profiler() as profiler:
+        with profile_stage("markdown"):
+            ...
+    profiler.write_trace("resume-profile.json")
+    print(profiler.summary())
+
+Each stage records its wall time, the process CPU time spent meanwhile and
+the most memory tracemalloc saw allocated above the level at its start.
+The trace is Chrome trace-event JSON (open it in chrome://tracing or
+Perfetto), with one lane per file; the summary aggregates every call of a
+stage across all files.
+
+Stages that wait on the browser overlap when several files render at once.
+Their CPU time and memory then include whatever ran in between; the
+synchronous stages (markdown, transforms, templating) are exact.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+DEFAULT_TRACE_PATH = "resume-profile.json"
+
+# Lane (trace thread id) of the file the current task is rendering
+_lane: contextvars.ContextVar[int] = contextvars.ContextVar("profile_lane", default=0)
+
+_active: "Profiler | None" = None
+
+_NOT_PROFILING = contextlib.nullcontext()
+
+
+@dataclass
+class StageStats:
+    """Every call of one stage, summed."""
+
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak: int = 0
+    lanes: set[int] = field(default_factory=set)
+
+
+@dataclass(eq=False)
+class _Frame:
+    base: int = 0
+    high: int = 0
+
+
+class Profiler:
+    """Collects stage timings while active, as a context manager."""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.events: list[dict] = []
+        self.stats: dict[str, StageStats] = {}
+        self._lanes: dict[str, int] = {}
+        self._open: list[_Frame] = []
+        self._started_tracing = False
+        self._origin = time.perf_counter()
+
+    def __enter__(self):
+        global _active
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._origin = time.perf_counter()
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        _active = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextlib.contextmanager
+    def stage(self, name, **args):
+        """Time the enclosed code as one call of stage name."""
+        frame = _Frame()
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # Resetting the peak loses it for the stages already open
+            for open_frame in self._open:
+                open_frame.high = max(open_frame.high, peak)
+            tracemalloc.reset_peak()
+            frame.base = frame.high = current
+        self._open.append(frame)
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+            self._open.remove(frame)
+            if tracing:
+                frame.high = max(frame.high, tracemalloc.get_traced_memory()[1])
+            self._record(name, start, wall, cpu, frame.high - frame.base, args)
+
+    def timed(self, function, name=None):
+        """function, profiled as a stage (named after it by default) on every call."""
+        name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def lane(self, name):
+        """Put the stages of the current task in the trace lane for name."""
+        if name not in self._lanes:
+            self._lanes[name] = len(self._lanes) + 1
+        token = _lane.set(self._lanes[name])
+        try:
+            yield
+        finally:
+            _lane.reset(token)
+
+    def _record(self, name, start, wall, cpu, peak, args):
+        lane = _lane.get()
+        stats = self.stats.setdefault(name, StageStats())
+        stats.calls += 1
+        stats.wall += wall
+        stats.cpu += cpu
+        stats.peak = max(stats.peak, peak)
+        stats.lanes.add(lane)
+        self.events.append(
+            {
+                "name": name,
+                "cat": "stage",
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": wall * 1e6,
+                "pid": 1,
+                "tid": lane,
+                "args": {"cpu_ms": round(cpu * 1000, 3), "peak_kb": round(peak / 1024, 1), **args},
+            }
+        )
+
+    def trace(self):
+        """The Chrome trace-event document for everything recorded."""
+        names = {0: "main", **{lane: name for name, lane in self._lanes.items()}}
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": lane, "args": {"name": name}}
+            for lane, name in names.items()
+        ]
+        return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path=DEFAULT_TRACE_PATH):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.trace(), file)
+
+    def summary(self):
+        """Table of every stage, slowest first, aggregated across files."""
+        rows = sorted(self.stats.items(), key=lambda item: item[1].wall, reverse=True)
+        width = max([len("stage"), *(len(name) for name in self.stats)])
+        lines = [
+            f"{'stage':<{width}} {'calls':>6} {'files':>5} {'wall ms':>10} "
+            f"{'mean ms':>9} {'cpu ms':>10} {'peak KB':>9}"
+        ]
+        for name, stats in rows:
+            files = len(stats.lanes - {0}) or 1
+            lines.append(
+                f"{name:<{width}} {stats.calls:>6} {files:>5} {stats.wall * 1000:>10.1f} "
+                f"{stats.wall * 1000 / stats.calls:>9.2f} {stats.cpu * 1000:>10.1f} "
+                f"{stats.peak / 1024:>9.1f}"
+            )
+        return "\n".join(lines)
+
+
+def profile_stage(name, **args):
+    """Context manager timing a stage under the active profiler, if any."""
+    return _active.stage(name, **args) if _active is not None else _NOT_PROFILING
+
+
+def profile_lane(name):
+    """Context manager putting the current task's stages in name's lane, if profiling."""
+    return _active.lane(name) if _active is not None else _NOT_PROFILING
+
+
+def profiled(function, name=None):
+    """function, timed on every call as stage name while a profiler is active."""
+    if _active is None:
+        return function
+    return _active.timed(function, name)
+
+
+def profiled_handlers(handlers):
+    """A tag -> [(when, handler)] map with each handler profiled, if profiling."""
+    if _active is None:
+        return handlers
+    return {
+        tag: [(when, _active.timed(handler)) for when, handler in entries]
+        for tag, entries in handlers.items()
+    }
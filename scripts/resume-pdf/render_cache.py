@@ -0,0 +1,156 @@
+"""Content-addressed caches that let unchanged documents and stages skip work."""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from collections import Counter
+
+# Bump when the manifest layout changes
+MANIFEST_VERSION = 1
+
+# Stage blobs kept on disk; the least recently used go first past this
+DEFAULT_MAX_STAGE_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir():
+    """$RESUME_PDF_CACHE_DIR, else resume-pdf under the XDG cache directory."""
+    if os.environ.get("RESUME_PDF_CACHE_DIR"):
+        return os.environ["RESUME_PDF_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "resume-pdf")
+
+
+def cache_key(*parts):
+    """Hash an ordered sequence of str/bytes parts into a hex key."""
+    hasher = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        hasher.update(len(data).to_bytes(8, "big"))
+        hasher.update(data)
+    return hasher.hexdigest()
+
+
+def file_digest(path):
+    """sha256 of a file's contents, or None if it does not exist."""
+    try:
+        with open(path, "rb") as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class RenderCache:
+    """Manifest mapping each output file to the key it was rendered from.
+
+    An entry is only a hit when the key matches and the output on disk still
+    has the digest recorded when it was written, so hand-edited or deleted
+    outputs are regenerated.
+
+    Intermediate pipeline stages are cached alongside the manifest as text
+    blobs addressed by stage name and key, so a partial change can resume
+    from the last stage whose inputs are unchanged. Every edit leaves new
+    blobs behind, so once they pass max_stage_bytes in all, save() removes
+    the least recently used.
+    """
+
+    def __init__(self, cache_dir=None, max_stage_bytes=DEFAULT_MAX_STAGE_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        self.stages_dir = os.path.join(self.cache_dir, "stages")
+        self.max_stage_bytes = max_stage_bytes
+        self.entries: dict[str, dict] = {}
+        self.stage_hits: Counter[str] = Counter()
+        self._dirty = False
+        self._stored = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                manifest = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if manifest.get("version") == MANIFEST_VERSION:
+            self.entries = manifest.get("entries", {})
+
+    def is_fresh(self, output_path, key):
+        """True when output_path was rendered from key and is untouched since."""
+        entry = self.entries.get(os.path.abspath(output_path))
+        if not entry or entry.get("key") != key:
+            return False
+        return entry.get("digest") == file_digest(output_path)
+
+    def record(self, output_path, key):
+        """Remember that output_path now holds the render for key."""
+        self.entries[os.path.abspath(output_path)] = {
+            "key": key,
+            "digest": file_digest(output_path),
+        }
+        self._dirty = True
+
+    def save(self):
+        """Atomically write the manifest if anything changed, and prune the stages."""
+        if self._stored:
+            self.prune_stages()
+            self._stored = False
+        if not self._dirty:
+            return
+        manifest = {"version": MANIFEST_VERSION, "entries": self.entries}
+        _write_atomic(self.manifest_path, json.dumps(manifest, indent=2, sort_keys=True))
+        self._dirty = False
+
+    def prune_stages(self):
+        """Remove the least recently used stage blobs until they fit max_stage_bytes."""
+        blobs = []
+        for directory, _, names in os.walk(self.stages_dir):
+            for name in names:
+                path = os.path.join(directory, name)
+                with contextlib.suppress(FileNotFoundError):
+                    stat = os.stat(path)
+                    blobs.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in blobs)
+        for _, size, path in sorted(blobs):
+            if total <= self.max_stage_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            total -= size
+
+    def _stage_path(self, stage, key):
+        return os.path.join(self.stages_dir, stage, key[:2], key)
+
+    def load_stage(self, stage, key):
+        """Return the cached text output of stage for key, or None."""
+        try:
+            with open(self._stage_path(stage, key), encoding="utf-8") as file:
+                text = file.read()
+        except FileNotFoundError:
+            return None
+        # Marks the blob as recently used for prune_stages()
+        with contextlib.suppress(OSError):
+            os.utime(self._stage_path(stage, key))
+        self.stage_hits[stage] += 1
+        return text
+
+    def store_stage(self, stage, key, text):
+        """Cache the text output of stage under key."""
+        _write_atomic(self._stage_path(stage, key), text)
+        self._stored = True
+
+
+def _write_atomic(path, text):
+    """Write text to path via a temp file so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        raise
@@ -0,0 +1,228 @@
+"""Localhost HTTP server that renders markdown to PDF on a warm backend.
+
+Endpoints:
+
+- ``POST /render`` with markdown as the body returns ``application/pdf``.
+- ``GET /stats`` returns queue depth, coalescing and latency figures as JSON.
+- ``GET /health`` returns ``ok`` once the backend is up.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import statistics
+import time
+from collections import deque
+
+from browser_pool import DEFAULT_POOL_SIZE
+from pipeline import DEFAULT_RENDER_OPTIONS, build_resume_html, open_backend, render_pdf
+from reproducible import source_date
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest markdown body accepted by POST /render
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+# Recent request latencies kept for /stats
+LATENCY_WINDOW = 1000
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Content Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    """Raised while handling a request to answer with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RenderServer:
+    """Serve PDF renders from a backend, sharing identical in-flight work.
+
+    pool is any rendering backend (see backends); its stats feed /stats.
+    """
+
+    def __init__(self, pool, options=DEFAULT_RENDER_OPTIONS):
+        self.pool = pool
+        self.options = options
+        self.requests = 0
+        self.coalesced = 0
+        self.failures = 0
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    async def render(self, md_content: str) -> bytes:
+        """Render markdown to PDF bytes, joining an identical render if one is running."""
+        key = hashlib.sha256(md_content.encode("utf-8")).hexdigest()
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._render(md_content))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shielded so one client hanging up does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _render(self, md_content):
+        html_output = build_resume_html(md_content)
+        pdf, _ = await render_pdf(
+            self.pool, html_output, options=self.options, source_epoch=source_date(md_content)
+        )
+        return pdf
+
+    def stats(self):
+        """Snapshot of queue depth, throughput and latency in milliseconds."""
+        latencies = sorted(self._latencies)
+        latency = {}
+        if latencies:
+            latency = {
+                "count": len(latencies),
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+                "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+                "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+                "max_ms": round(latencies[-1] * 1000, 2),
+            }
+        pool_stats = self.pool.stats
+        return {
+            "queue_depth": pool_stats.waiting,
+            "busy_pages": pool_stats.busy,
+            "in_flight": len(self._in_flight),
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "renders": pool_stats.renders,
+            "recycles": pool_stats.recycles,
+            "relaunches": pool_stats.relaunches,
+            "attached": pool_stats.attached,
+            "latency": latency,
+        }
+
+    async def handle(self, method, path, body):
+        """Dispatch one request; returns (status, content type, payload)."""
+        if path == "/health":
+            return 200, "text/plain; charset=utf-8", b"ok"
+        if path == "/stats":
+            return 200, "application/json", json.dumps(self.stats()).encode("utf-8")
+        if path != "/render":
+            raise HttpError(404, f"No route for {path}")
+        if method != "POST":
+            raise HttpError(405, "POST markdown to /render")
+
+        try:
+            md_content = body.decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise HttpError(400, "Body must be UTF-8 markdown") from e
+
+        self.requests += 1
+        start = time.perf_counter()
+        try:
+            pdf = await self.render(md_content)
+        except Exception:
+            self.failures += 1
+            raise
+        self._latencies.append(time.perf_counter() - start)
+        return 200, "application/pdf", pdf
+
+    async def serve_connection(self, reader, writer):
+        """Handle requests on one keep-alive connection until the client is done."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, "text/plain", b"Malformed request", False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                content_length = headers.get("content-length")
+                if content_length is None and method == "POST":
+                    await self._respond(writer, 400, "text/plain", b"Missing Content-Length", False)
+                    break
+                content_length = content_length or "0"
+                if not (content_length.isascii() and content_length.isdigit()):
+                    await self._respond(writer, 400, "text/plain", b"Invalid Content-Length", False)
+                    break
+                length = int(content_length)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, "text/plain", b"Body too large", False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, content_type, payload = await self.handle(
+                        method, path.split("?", 1)[0], body
+                    )
+                except HttpError as e:
+                    status, content_type, payload = e.status, "text/plain", str(e).encode()
+                except Exception as e:
+                    status, content_type, payload = 500, "text/plain", str(e).encode()
+
+                await self._respond(writer, status, content_type, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, content_type, payload, keep_alive):
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+
+async def serve(
+    host=DEFAULT_HOST,
+    port=DEFAULT_PORT,
+    pool_size=DEFAULT_POOL_SIZE,
+    options=DEFAULT_RENDER_OPTIONS,
+):
+    """Start the rendering backend and serve render requests until cancelled."""
+    async with open_backend(options, size=pool_size) as pool:
+        app = RenderServer(pool, options)
+        server = await asyncio.start_server(app.serve_connection, host, port)
+        warm = f"{pool_size} warm pages" if pool.name == "playwright" else pool.name
+        if pool.stats.attached:
+            warm += f" on {options.cdp_endpoint}"
+        print(f"Render server listening on http://{host}:{port} ({warm})")
+        async with server:
+            await server.serve_forever()
+
+
+def run_server(
+    host=DEFAULT_HOST,
+    port=DEFAULT_PORT,
+    pool_size=DEFAULT_POOL_SIZE,
+    options=DEFAULT_RENDER_OPTIONS,
+):
+    """Sync wrapper for serve() that exits quietly on Ctrl-C."""
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(host, port, pool_size, options))
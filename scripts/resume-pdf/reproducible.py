@@ -0,0 +1,115 @@
+"""Reproducible PDFs: pinned timestamps, stable document IDs and ETags.
+
+Chromium stamps each PDF with the time it was printed and a random document
+ID, so printing the same HTML twice never gives the same bytes.
+pin_metadata() rewrites both in place: the dates become the source date and
+the ID a hash of the document. Replacements keep their original length, so
+the xref offsets Chromium wrote stay valid.
+
+The source date is ``$SOURCE_DATE_EPOCH`` when set (the reproducible-builds
+convention), else the ``date`` in the markdown's frontmatter, else the Unix
+epoch.
+"""
+
+import datetime
+import hashlib
+import os
+import re
+
+FRONTMATTER = re.compile(r"^---\n([\s\S]*?)\n---")
+FRONTMATTER_DATE = re.compile(r"""^date:\s*["']?([^"'\n]+?)["']?\s*$""", re.MULTILINE)
+
+INFO_DATE = re.compile(rb"(/(?:CreationDate|ModDate)\s*)\((D:[^)]*)\)")
+DOCUMENT_ID = re.compile(rb"(/ID\s*\[\s*)<([0-9A-Fa-f]*)>(\s*)<([0-9A-Fa-f]*)>")
+
+# Served next to each output so the site can answer conditional requests
+ETAG_SUFFIX = ".etag"
+
+
+def source_date_epoch(environ=os.environ):
+    """``$SOURCE_DATE_EPOCH`` in seconds, or None when it is unset or empty.
+
+    Raises ValueError unless it is a whole, non-negative number of seconds.
+    """
+    value = environ.get("SOURCE_DATE_EPOCH")
+    if not value:
+        return None
+    if not (value.isascii() and value.isdigit()):
+        raise ValueError(f"SOURCE_DATE_EPOCH must be a whole number of seconds, not {value!r}")
+    return int(value)
+
+
+def source_date(md_content, environ=os.environ):
+    """Seconds since the epoch to stamp on a reproducible PDF of md_content."""
+    epoch = source_date_epoch(environ)
+    if epoch is not None:
+        return epoch
+    frontmatter = FRONTMATTER.match(md_content)
+    match = frontmatter and FRONTMATTER_DATE.search(frontmatter.group(1))
+    if match:
+        try:
+            moment = datetime.datetime.fromisoformat(match.group(1))
+        except ValueError:
+            return 0
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=datetime.UTC)
+        return int(moment.timestamp())
+    return 0
+
+
+def pdf_date(epoch):
+    """PDF date string for epoch, in UTC, as Chromium formats its own."""
+    moment = datetime.datetime.fromtimestamp(epoch, datetime.UTC)
+    return moment.strftime("D:%Y%m%d%H%M%S+00'00'")
+
+
+def pin_metadata(pdf: bytes, epoch: int) -> bytes:
+    """pdf with its Info dates set to epoch and its document ID derived from content."""
+    date = pdf_date(epoch).encode("ascii")
+    compact = date[: len("D:YYYYMMDDHHMMSS")] + b"Z"
+
+    def pin_date(match):
+        original = match.group(2)
+        pinned = date if len(date) <= len(original) else compact
+        # Whitespace after the string keeps every later offset in place
+        padding = b" " * (len(original) - len(pinned))
+        return match.group(1) + b"(" + pinned + b")" + padding
+
+    pdf = INFO_DATE.sub(pin_date, pdf)
+
+    def pin_id(match):
+        first, second = match.group(2), match.group(4)
+        # Hash the document with the ID blanked, so the ID itself never feeds back in
+        blanked = pdf[: match.start()] + pdf[match.end() :]
+        digest = hashlib.sha256(blanked).hexdigest().upper().encode("ascii")
+        return (
+            match.group(1)
+            + b"<"
+            + _repeat(digest, len(first))
+            + b">"
+            + match.group(3)
+            + b"<"
+            + _repeat(digest, len(second))
+            + b">"
+        )
+
+    return DOCUMENT_ID.sub(pin_id, pdf)
+
+
+def _repeat(digest, length):
+    return (digest * (length // len(digest) + 1))[:length]
+
+
+def etag(pdf: bytes) -> str:
+    """Strong ETag for the PDF's bytes."""
+    return f'"{hashlib.sha256(pdf).hexdigest()}"'
+
+
+def etag_path(output_path):
+    return output_path + ETAG_SUFFIX
+
+
+def write_etag(output_path, pdf: bytes):
+    """Write the ETag sidecar for the PDF written to output_path."""
+    with open(etag_path(output_path), "w", encoding="ascii") as file:
+        file.write(etag(pdf) + "\n")
@@ -0,0 +1,508 @@
+"""Python-Markdown extension that applies the resume transforms in the tree.
+
+The BeautifulSoup path serializes the Markdown tree to HTML, parses it back
+and serializes it again. ResumeExtension does the same rewrites on the
+ElementTree that Python-Markdown already built, then writes it out the way
+BeautifulSoup would, so the output is byte-identical with a single parse:
+
+    extension = ResumeExtension(skills_titles=SKILLS_SECTION_TITLES)
+    html = markdown.Markdown(extensions=["tables", extension]).convert(text)
+    if not extension.applied:
+        html = transform_html(html)
+
+Documents holding raw HTML or character references only round-trip exactly
+through a real HTML parser, so for those the tree is left alone and
+``applied`` stays False.
+"""
+
+import re
+import xml.etree.ElementTree as etree
+from collections import Counter, defaultdict
+from collections.abc import Callable
+
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+
+from profiling import profiled_handlers
+
+Handler = Callable[[etree.Element, "TreeContext"], None]
+Predicate = Callable[[etree.Element, "TreeContext"], bool]
+
+# Text the Markdown serializer would pass through as an entity, which the
+# HTML parser then decodes; see markdown.serializers.RE_AMP
+CHARACTER_REFERENCE = re.compile(r"&(?:#[0-9]+|#x[0-9a-f]+|[0-9a-z]+);", re.I)
+
+# Elements BeautifulSoup writes as <br/> when they have no children
+VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+        "basefont",
+        "bgsound",
+        "command",
+        "frame",
+        "image",
+        "isindex",
+        "nextid",
+        "spacer",
+    }
+)
+
+# Attributes BeautifulSoup splits on whitespace and joins with single spaces
+LIST_ATTRIBUTES = {
+    "*": {"class", "accesskey", "dropzone"},
+    "a": {"rel", "rev"},
+    "link": {"rel", "rev"},
+    "td": {"headers"},
+    "th": {"headers"},
+    "form": {"accept-charset"},
+    "object": {"archive"},
+    "area": {"rel"},
+    "icon": {"sizes"},
+    "iframe": {"sandbox"},
+    "output": {"for"},
+}
+
+
+def contents(element):
+    """Children of element as BeautifulSoup sees them: text runs and elements."""
+    nodes = [element.text] if element.text else []
+    for child in element:
+        nodes.append(child)
+        if child.tail:
+            nodes.append(child.tail)
+    return nodes
+
+
+def string_of(element):
+    """Equivalent of BeautifulSoup's Tag.string: the only text inside element, or None."""
+    nodes = contents(element)
+    if len(nodes) != 1:
+        return None
+    node = nodes[0]
+    return node if isinstance(node, str) else string_of(node)
+
+
+def text_of(element):
+    """Equivalent of Tag.get_text()."""
+    return "".join(element.itertext())
+
+
+def add_class(element, name):
+    classes = element.get("class", "").split()
+    element.set("class", " ".join([*classes, name]))
+
+
+def set_string(element, text):
+    """Replace element's children with a span holding text, keeping its tail."""
+    element.text = None
+    del element[:]
+    etree.SubElement(element, "span").text = text
+
+
+def splice_out(parent, doomed, replacement=None):
+    """Remove children of parent whose id is in doomed, keeping the text around them.
+
+    Each removed child's tail, preceded by ``replacement`` when given, joins
+    the text before it, which is what detaching the element from a parsed
+    document leaves behind.
+    """
+    kept = []
+    for child in parent:
+        if id(child) not in doomed:
+            kept.append(child)
+            continue
+        text = (replacement or "") + (child.tail or "")
+        if not text:
+            continue
+        if kept:
+            kept[-1].tail = (kept[-1].tail or "") + text
+        else:
+            parent.text = (parent.text or "") + text
+    parent[:] = kept
+
+
+class TreeContext:
+    """State visible to handlers while the tree is walked.
+
+    Mirrors dom_transforms.TransformContext: ``counts`` of visited tags,
+    ``scope(element)`` shared between siblings, and deferred ``remove()``.
+    """
+
+    def __init__(self, skills_titles=()):
+        self.skills_titles = skills_titles
+        self.counts: Counter[str] = Counter()
+        self._parents: dict[int, etree.Element] = {}
+        self._scopes: dict[int, dict] = defaultdict(dict)
+        self._removed: dict[int, etree.Element] = {}
+
+    def scope(self, element) -> dict:
+        return self._scopes[id(self._parents[id(element)])]
+
+    def previous_sibling(self, element):
+        """The element before element in its parent, or None."""
+        siblings = list(self._parents[id(element)])
+        index = next(index for index, sibling in enumerate(siblings) if sibling is element)
+        return siblings[index - 1] if index else None
+
+    def remove(self, element):
+        self._removed[id(element)] = element
+
+    def is_removed(self, element) -> bool:
+        return id(element) in self._removed
+
+    def flush_removals(self):
+        by_parent: dict[int, tuple[etree.Element, set[int]]] = {}
+        for key in self._removed:
+            parent = self._parents[key]
+            by_parent.setdefault(id(parent), (parent, set()))[1].add(key)
+        for parent, doomed in by_parent.values():
+            splice_out(parent, doomed)
+        self._removed.clear()
+
+
+class TreeTransforms:
+    """Ordered handlers keyed on tag name, applied in one walk of an ElementTree."""
+
+    def __init__(self):
+        self._handlers: dict[str, list[tuple[Predicate | None, Handler]]] = defaultdict(list)
+
+    def on(self, *tags: str, when: Predicate | None = None):
+        """Register the decorated function for tags, optionally only when ``when`` holds."""
+
+        def register(handler: Handler) -> Handler:
+            for tag in tags:
+                self._handlers[tag].append((when, handler))
+            return handler
+
+        return register
+
+    def apply(self, root, skills_titles=()) -> TreeContext:
+        """Run every matching handler below root in document order.
+
+        Same contract as TransformRegistry.apply(): handlers run before the
+        element's children are visited, and a removed element is skipped
+        along with its children.
+        """
+        context = TreeContext(skills_titles)
+        parents = context._parents
+        handlers = profiled_handlers(self._handlers)
+        stack = [(root, iter(list(root)))]
+        while stack:
+            parent, children = stack[-1]
+            element = next(children, None)
+            if element is None:
+                stack.pop()
+                continue
+            parents[id(element)] = parent
+
+            context.counts[element.tag] += 1
+            for when, handler in handlers.get(element.tag, ()):
+                if when is None or when(element, context):
+                    handler(element, context)
+                    if context.is_removed(element):
+                        break
+            else:
+                if len(element):
+                    stack.append((element, iter(list(element))))
+        context.flush_removals()
+        return context
+
+
+# The resume transforms from pipeline.py, written against the ElementTree.
+# Each one must keep producing what its BeautifulSoup counterpart produces.
+transforms = TreeTransforms()
+
+
+@transforms.on("h1", when=lambda h1, ctx: ctx.counts["h1"] == 1)
+def tree_process_name(h1, ctx):
+    name = string_of(h1)
+    if name:
+        set_string(h1, name)
+
+
+def _pad(text):
+    stripped = text.strip()
+    return " " + stripped + " " if stripped else text
+
+
+@transforms.on("p", when=lambda p, ctx: ctx.counts["p"] <= 2)
+def tree_process_header_section(p, ctx):
+    add_class(p, "header-content")
+    # Pad every text run first; the spaces that replace line breaks are
+    # runs of their own in the parsed document and are left as they are
+    p.text = p.text and _pad(p.text)
+    for element in p.iter():
+        if element is not p:
+            element.text = element.text and _pad(element.text)
+            element.tail = element.tail and _pad(element.tail)
+    for element in list(p.iter()):
+        breaks = {id(child) for child in element if child.tag == "br"}
+        if breaks:
+            splice_out(element, breaks, replacement=" ")
+
+
+@transforms.on("h4")
+def tree_queue_job_entry(h4, ctx):
+    ctx.scope(h4).setdefault("roles", []).append(h4)
+
+
+@transforms.on("p", when=lambda p, ctx: bool(ctx.scope(p).get("roles")))
+def tree_process_job_entries(p, ctx):
+    roles = ctx.scope(p)["roles"]
+    em = next(p.iter("em"), None)
+    date = string_of(em) if em is not None else None
+    if not date:
+        roles.clear()
+        return
+
+    h4 = roles.pop(0)
+    h4.set("data-date", date.strip())
+    title = string_of(h4)
+    if title:
+        set_string(h4, title.strip())
+    ctx.remove(p)
+
+
+@transforms.on("h2", "h3")
+def tree_track_skills_section(heading, ctx):
+    ctx.scope(heading)["skills"] = (
+        heading.tag == "h3" and text_of(heading).strip() in ctx.skills_titles
+    )
+
+
+@transforms.on("p", when=lambda p, ctx: ctx.scope(p).get("skills", False))
+def tree_process_skills(p, ctx):
+    items = []
+    for node in contents(p):
+        if isinstance(node, str):
+            for part in node.strip().split("|") if node.strip() else ():
+                part = part.strip().strip(":").strip()
+                if part and part != ":":
+                    items.append(("skill-tag", part))
+        elif node.tag == "a":
+            if text_of(node).strip():
+                items.append(("link", node))
+        elif node.tag == "strong":
+            category = text_of(node).strip().rstrip(":")
+            if category:
+                items.append(("skill-category", category + ":"))
+
+    p.text = None
+    del p[:]
+    add_class(p, "skills-list")
+    for kind, item in items:
+        if kind == "link":
+            add_class(item, "skill-tag")
+            p.append(item)
+        else:
+            text, item = item, etree.SubElement(p, "span", {"class": kind})
+            item.text = text
+        item.tail = " "
+
+
+@transforms.on("h2", "h3", "h4", "p", "ul")
+def tree_mark_experience_section(element, ctx):
+    scope = ctx.scope(element)
+    if element.tag == "h2" and element.get("id") == "experience":
+        scope["experience"] = True
+    elif not scope.get("experience"):
+        return
+    elif element.tag == "h3":
+        add_class(element, "employer")
+        scope["employer"] = True
+    elif scope.get("employer") and element.tag != "h2":
+        add_class(element, "role" if element.tag == "h4" else "in-experience")
+
+
+@transforms.on("li")
+def tree_mark_technology_line(li, ctx):
+    # strong:first-child anywhere inside, the first element of its parent
+    if any(len(parent) and parent[0].tag == "strong" for parent in li.iter()):
+        add_class(li, "tech-line")
+
+
+@transforms.on("h2", when=lambda h2, ctx: ctx.counts["h2"] == 1)
+@transforms.on("h3", when=lambda h3, ctx: ctx.counts["h3"] == 1)
+def tree_mark_first_heading(heading, ctx):
+    add_class(heading, "first-section" if heading.tag == "h2" else "first-subsection")
+
+
+SUMMARY_CLASSES = ("summary-first", "summary-second")
+
+
+@transforms.on("h2", "p")
+def tree_mark_summary_paragraphs(element, ctx):
+    scope = ctx.scope(element)
+    if element.tag == "h2":
+        scope["summary"] = [element] if element.get("id") == "summary" else None
+        return
+    chain = scope.get("summary")
+    if not chain:
+        return
+    if len(chain) > len(SUMMARY_CLASSES) or ctx.previous_sibling(element) is not chain[-1]:
+        scope["summary"] = None
+        return
+    add_class(element, SUMMARY_CLASSES[len(chain) - 1])
+    chain.append(element)
+
+
+def escape(text):
+    """Escape text the way BeautifulSoup's "minimal" formatter does."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def quote(value):
+    """Quote an escaped attribute value like EntitySubstitution.quoted_attribute_value()."""
+    if '"' not in value:
+        return '"' + value + '"'
+    if "'" not in value:
+        return "'" + value + "'"
+    return '"' + value.replace('"', "&quot;") + '"'
+
+
+def _write(write, element):
+    tag = element.tag
+    write("<" + tag)
+    # BeautifulSoup's formatter sorts attributes by name
+    for key, value in sorted(element.attrib.items()):
+        write(" " + key + "=" + quote(escape(value)))
+    if tag in VOID_ELEMENTS and not element.text and not len(element):
+        write("/>")
+    else:
+        write(">")
+        if element.text:
+            write(escape(element.text))
+        for child in element:
+            _write(write, child)
+        write("</" + tag + ">")
+    if element.tail:
+        write(escape(element.tail))
+
+
+def to_soup_html(root):
+    """Serialize the children of root as str(BeautifulSoup(...)) would."""
+    parts: list[str] = []
+    if root.text:
+        parts.append(escape(root.text))
+    for child in root:
+        _write(parts.append, child)
+    return "".join(parts)
+
+
+def round_trips(root):
+    """True when serializing and reparsing would hand back the tree's own text.
+
+    Character references and placeholders for stashed HTML are decoded or
+    expanded on the way through a parser, so their documents cannot take
+    the in-tree path.
+    """
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            return False
+        for text in (element.text, element.tail, *element.attrib.values()):
+            if text and ("\x02" in text or ("&" in text and CHARACTER_REFERENCE.search(text))):
+                return False
+    return True
+
+
+def normalize(root):
+    """Bring the tree to the state a BeautifulSoup parse of its HTML would be in.
+
+    Markdown strips the whitespace around the document and writes attributes
+    in sorted order; the parser lowercases their names, keeping the last of
+    any that collide, and splits list attributes such as class.
+    """
+    if len(root):
+        root.text = root.text and root.text.lstrip()
+        root[-1].tail = root[-1].tail and root[-1].tail.rstrip()
+    else:
+        root.text = root.text and root.text.strip()
+    for element in root.iter():
+        if element is root or not element.attrib:
+            continue
+        items = sorted(element.attrib.items())
+        element.attrib.clear()
+        lists = LIST_ATTRIBUTES["*"] | LIST_ATTRIBUTES.get(element.tag, set())
+        for key, value in items:
+            key = key.lower()
+            element.set(key, " ".join(value.split()) if key in lists else value)
+
+
+def strips_differently(root):
+    """True if removing a trailing date paragraph would leave whitespace at the end.
+
+    Markdown strips its output after serializing, which the reparsed
+    document never is, so such a document has to take the parser path.
+    """
+    last = root[-1] if len(root) else None
+    if last is None or last.tag != "p" or not any(child.tag == "h4" for child in root):
+        return False
+    em = next(last.iter("em"), None)
+    return em is not None and bool(string_of(em))
+
+
+class ResumeTreeprocessor(Treeprocessor):
+    """Apply the resume transforms and switch to a BeautifulSoup-style serializer."""
+
+    def __init__(self, md, extension):
+        super().__init__(md)
+        self.extension = extension
+        self._defaults = None
+
+    def run(self, root):
+        md = self.md
+        if self._defaults is None:
+            self._defaults = (md.serializer, md.stripTopLevelTags)
+        md.serializer, md.stripTopLevelTags = self._defaults
+        self.extension.applied = False
+        if md.htmlStash.html_counter or not round_trips(root) or strips_differently(root):
+            return None
+
+        normalize(root)
+        transforms.apply(root, self.extension.getConfig("skills_titles"))
+        dropped = self.extension.getConfig("drop_attributes")
+        if dropped:
+            for element in root.iter():
+                for name in dropped:
+                    element.attrib.pop(name, None)
+        # normalize() already stripped the document the way convert() would
+        md.serializer, md.stripTopLevelTags = to_soup_html, False
+        self.extension.applied = True
+        return None
+
+
+class ResumeExtension(Extension):
+    """Name, header, job entry and skills transforms for resume markdown."""
+
+    def __init__(self, **kwargs):
+        self.config = {
+            "skills_titles": [[], "h3 titles whose paragraphs become skill tags"],
+            "drop_attributes": [[], "attributes removed from every element"],
+        }
+        self.applied = False
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md):
+        # After "unescape" (priority 0), so the tree holds its final text
+        md.treeprocessors.register(ResumeTreeprocessor(md, self), "resume", -10)
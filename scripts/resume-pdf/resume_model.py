@@ -0,0 +1,376 @@
+"""Typed resume model, parsed once from the transformed body HTML.
+
+The DOM transforms leave the resume's structure in the body: the name in
+the first h1, the tagline and links in the header paragraphs, employers as
+h3 headings with h4 roles carrying ``data-date``, and skills as
+``.skills-list`` paragraphs of ``.skill-tag`` items. parse_resume() reads
+that back into the slotted classes below.
+
+The model is cached as the ``model`` pipeline stage (to_json/from_json),
+and the page template takes its title from it. page_data() gives the JSON
+the website's resume page loads instead of parsing the markdown itself; it
+has the ``ParsedResume`` shape of app/lib/resumeParser.ts.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass, field
+
+# h2 keywords that identify a section, checked in order; others are named
+# after their heading, as in the site's parser
+SECTION_KEYWORDS = (
+    ("summary", ("summar", "about", "profile")),
+    ("skills", ("skill", "technical", "expertise")),
+    ("experience", ("experience", "work", "employ")),
+    ("projects", ("project", "open source")),
+    ("education", ("educat", "academic")),
+    ("awards", ("award", "recognition", "achievement")),
+    ("speaking", ("speak", "talk", "conference", "presentation")),
+    ("interests", ("interest", "hobb")),
+)
+
+# Item-list sections the site always expects, even when empty
+LIST_SECTIONS = ("awards", "speaking", "education", "interests")
+
+# Link aggregator hosts, shown as "Links" rather than a website
+AGGREGATOR = re.compile(r"linktr\.ee|bio\.link|carrd\.co|beacons\.ai", re.I)
+
+_WHITESPACE = re.compile(r"\s+")
+_SKILL_SEPARATOR = re.compile(r"[,|]")
+
+
+@dataclass(slots=True)
+class Link:
+    text: str
+    url: str
+
+
+@dataclass(slots=True)
+class Skill:
+    name: str
+    url: str | None = None
+
+
+@dataclass(slots=True)
+class SkillCategory:
+    name: str
+    skills: list[Skill] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Role:
+    title: str
+    period: str = ""
+    bullets: list[str] = field(default_factory=list)
+    technologies: list[Skill] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Employer:
+    name: str
+    url: str | None = None
+    roles: list[Role] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Project:
+    name: str
+    url: str | None = None
+    description: str = ""
+
+
+@dataclass(slots=True)
+class Resume:
+    """Everything the resume says, by section; bullets are inline markdown."""
+
+    name: str = ""
+    tagline: str = ""
+    links: list[Link] = field(default_factory=list)
+    summary: list[str] = field(default_factory=list)
+    skills: list[SkillCategory] = field(default_factory=list)
+    employers: list[Employer] = field(default_factory=list)
+    projects: list[Project] = field(default_factory=list)
+    lists: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def title(self):
+        """Document title: the name without emoji."""
+        import emoji
+
+        return _WHITESPACE.sub(" ", emoji.replace_emoji(self.name, replace="")).strip()
+
+    def contact(self):
+        """Header links by channel, matched on their URLs."""
+        urls = [link.url for link in self.links]
+
+        def first(predicate):
+            return next((url for url in urls if predicate(url)), None)
+
+        email = first(lambda url: url.startswith("mailto:"))
+        linkedin = first(lambda url: re.search("linkedin", url, re.I))
+        github = first(lambda url: re.search("github", url, re.I))
+        aggregator = first(AGGREGATOR.search)
+        others = (linkedin, github, aggregator)
+        website = first(lambda url: re.match(r"https?://", url, re.I) and url not in others)
+        contact = {
+            "email": email and email.removeprefix("mailto:"),
+            "linkedin": linkedin,
+            "github": github,
+            "links": aggregator,
+            "website": website,
+        }
+        return {channel: url for channel, url in contact.items() if url}
+
+    def to_json(self):
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        return cls(
+            data["name"],
+            data["tagline"],
+            [Link(**link) for link in data["links"]],
+            data["summary"],
+            [
+                SkillCategory(category["name"], [Skill(**skill) for skill in category["skills"]])
+                for category in data["skills"]
+            ],
+            [
+                Employer(
+                    employer["name"],
+                    employer["url"],
+                    [
+                        Role(
+                            role["title"],
+                            role["period"],
+                            role["bullets"],
+                            [Skill(**skill) for skill in role["technologies"]],
+                        )
+                        for role in employer["roles"]
+                    ],
+                )
+                for employer in data["employers"]
+            ],
+            [Project(**project) for project in data["projects"]],
+            data["lists"],
+        )
+
+
+def section_kind(heading):
+    """Section a heading's text introduces, e.g. "experience"."""
+    lower = heading.lower()
+    for kind, keywords in SECTION_KEYWORDS:
+        if any(keyword in lower for keyword in keywords):
+            return kind
+    return re.sub(r"[^a-z0-9]", "_", lower.strip())
+
+
+def parse_resume(html):
+    """Resume model of transformed body HTML, or of a full templated page."""
+    import emoji
+    from bs4 import BeautifulSoup, Tag
+
+    soup = BeautifulSoup(html, "html.parser")
+    resume = Resume()
+    section = None
+    category = employer = role = None
+
+    for element in (soup.body or soup).children:
+        if not isinstance(element, Tag):
+            continue
+        name = element.name
+        if name == "h1" and section is None:
+            resume.name = resume.name or _text(element)
+        elif name == "h2":
+            section = section_kind(emoji.replace_emoji(_text(element), replace=""))
+            category = employer = role = None
+        elif section is None:
+            if name == "p":
+                links = element.find_all("a", href=True)
+                resume.links.extend(Link(_text(link), link["href"]) for link in links)
+                if not links and not resume.tagline:
+                    resume.tagline = _text(element)
+        elif section == "summary":
+            if name == "p":
+                resume.summary.append(_text(element))
+        elif section == "skills":
+            if name == "h3":
+                category = SkillCategory(_text(element))
+                resume.skills.append(category)
+            elif name in ("p", "ul", "ol"):
+                category = _read_skills(element, category, resume.skills)
+        elif section == "experience":
+            if name == "h3":
+                link = element.find("a", href=True)
+                employer = Employer(_text(element), link["href"] if link else None)
+                resume.employers.append(employer)
+                role = None
+            elif name == "h4" and employer is not None:
+                role = Role(_text(element), element.get("data-date", "").strip("() "))
+                employer.roles.append(role)
+            elif name == "p" and role is not None and not role.period and element.find("em"):
+                role.period = _text(element).strip("_() ")
+            elif name in ("ul", "ol") and role is not None:
+                for item in element.find_all("li", recursive=False):
+                    technologies = _technologies(item)
+                    if technologies is not None:
+                        role.technologies = technologies
+                    else:
+                        role.bullets.append(_markdown(item.children))
+        elif name in ("ul", "ol"):
+            for item in element.find_all("li", recursive=False):
+                if section == "projects":
+                    project = _project(item)
+                    if project is not None:
+                        resume.projects.append(project)
+                else:
+                    resume.lists.setdefault(section, []).append(_markdown(item.children))
+    return resume
+
+
+def page_data(resume, md_content):
+    """The JSON document the website's resume page loads.
+
+    ``source`` is the sha256 of the markdown it was built from, so the page
+    can tell a stale export from a current one.
+    """
+    skills = {}
+    for category in resume.skills:
+        if category.skills:
+            skills.setdefault(category.name, []).extend(_skill(skill) for skill in category.skills)
+    experience = [
+        {
+            "company": employer.name,
+            **({"companyUrl": employer.url} if employer.url else {}),
+            "position": role.title,
+            "period": role.period,
+            "bullets": role.bullets,
+            "technologies": [_skill(skill) for skill in role.technologies],
+        }
+        for employer in resume.employers
+        for role in employer.roles
+    ]
+    projects = [
+        {
+            "name": project.name,
+            **({"url": project.url} if project.url else {}),
+            "description": project.description,
+        }
+        for project in resume.projects
+    ]
+    return {
+        "source": hashlib.sha256(md_content.encode("utf-8")).hexdigest(),
+        "name": resume.name,
+        "tagline": resume.tagline,
+        "contact": resume.contact(),
+        "summary": "\n\n".join(resume.summary),
+        "skills": skills,
+        "experience": experience,
+        "projects": projects,
+        **{section: [] for section in LIST_SECTIONS},
+        **resume.lists,
+    }
+
+
+def _skill(skill):
+    return {"name": skill.name, "url": skill.url} if skill.url else {"name": skill.name}
+
+
+def _text(element):
+    return _WHITESPACE.sub(" ", element.get_text()).strip()
+
+
+def _markdown(nodes):
+    """Inline markdown for a run of nodes: links, bold, italics and code."""
+    from bs4 import NavigableString
+
+    def walk(node):
+        if isinstance(node, NavigableString):
+            return str(node)
+        inner = "".join(walk(child) for child in node.children)
+        if node.name == "a" and node.get("href"):
+            return f"[{inner.strip()}]({node['href']})"
+        if node.name in ("strong", "b"):
+            return f"**{inner.strip()}**"
+        if node.name in ("em", "i"):
+            return f"_{inner.strip()}_"
+        if node.name == "code":
+            return f"`{inner}`"
+        if node.name in ("ul", "ol"):
+            return ""
+        return inner
+
+    return _WHITESPACE.sub(" ", "".join(walk(node) for node in nodes)).strip()
+
+
+def _read_skills(element, category, categories):
+    """Add the skills in element to category; bold labels open new categories.
+
+    Returns the category the next element's skills belong in.
+    """
+    from bs4 import NavigableString
+
+    nodes = element.children
+    if element.name in ("ul", "ol"):
+        nodes = [node for item in element.find_all("li") for node in item.children]
+    for node in nodes:
+        if isinstance(node, NavigableString):
+            skills = [Skill(part) for part in _split(str(node))]
+        elif node.name == "strong" or "skill-category" in (node.get("class") or []):
+            category = SkillCategory(_text(node).rstrip(":").strip())
+            categories.append(category)
+            continue
+        else:
+            skills = [Skill(_text(node), node.get("href") if node.name == "a" else None)]
+        if category is None:
+            category = SkillCategory("Skills")
+            categories.append(category)
+        category.skills.extend(skill for skill in skills if skill.name)
+    return category
+
+
+def _split(text):
+    parts = (part.strip().strip(":").strip() for part in _SKILL_SEPARATOR.split(text))
+    return [part for part in parts if part]
+
+
+def _technologies(item):
+    """Skills listed in a "Technologies:" item, or None for any other item."""
+    from bs4 import NavigableString
+
+    label = item.find("strong")
+    if label is None or label.find_previous_sibling(True) is not None:
+        return None
+    if not _text(label).lower().startswith("technolog"):
+        return None
+    skills = []
+    for node in label.next_siblings:
+        if isinstance(node, NavigableString):
+            skills.extend(Skill(part) for part in _split(str(node)))
+        elif node.name == "a":
+            skills.append(Skill(_text(node), node.get("href")))
+        elif _text(node):
+            skills.append(Skill(_text(node)))
+    return skills
+
+
+def _project(item):
+    """Project from "**[Name](url)**: description" and its variations."""
+    from bs4 import Tag
+
+    lead = next((node for node in item.children if str(node).strip()), None)
+    if isinstance(lead, Tag) and lead.name in ("strong", "a"):
+        link = lead if lead.name == "a" else lead.find("a", href=True)
+        name = _text(link if link is not None else lead)
+        url = link.get("href") if link is not None else None
+        description = _markdown(lead.next_siblings).lstrip(":* ").strip()
+        return Project(name, url, description)
+    match = re.match(r"^(.+?):\s+(.+)$", _markdown(item.children))
+    if match is None:
+        return None
+    link = re.match(r"\[(.+?)\]\((.+?)\)", match.group(1))
+    if link:
+        return Project(link.group(1).replace("**", ""), link.group(2), match.group(2))
+    return Project(match.group(1).replace("**", ""), None, match.group(2))
@@ -3,621 +3,486 @@
 
 import argparse
 import asyncio
+import importlib.util
 import os
-import re
 import sys
-import tempfile
-
-import emoji
-import markdown
-from bs4 import BeautifulSoup
-from jinja2 import Template
-from playwright.async_api import async_playwright
-
-
-def remove_emojis(text):
-    """Remove emojis from the given text."""
-    return emoji.replace_emoji(text, replace="")
-
-
-def process_skills_paragraph(p, soup):
-    """Process skills paragraph to create tag-like spans from pipe-separated items."""
-    items = []
-
-    for content in list(p.contents):
-        if isinstance(content, str):
-            # Split by pipe and process each part
-            text = content.strip()
-            if text:
-                parts = text.split("|")
-                for part in parts:
-                    part = part.strip().strip(":").strip()
-                    if part and part != ":":
-                        items.append(("text", part))
-        elif hasattr(content, 'name'):
-            if content.name == "a":
-                # Extract link text and URL
-                link_text = content.get_text().strip()
-                if link_text:
-                    items.append(("link", content))
-            elif content.name == "strong":
-                # This is a category label - add as category header
-                cat_text = content.get_text().strip().rstrip(":")
-                if cat_text:
-                    items.append(("category", cat_text))
-            elif content.name == "br":
-                pass  # Skip line breaks
-
-    # Rebuild the paragraph with proper structure
-    p.clear()
-    p["class"] = p.get("class", []) + ["skills-list"]
-
-    for item_type, item in items:
-        if item_type == "category":
-            # Add category as a label span
-            cat_span = soup.new_tag("span")
-            cat_span["class"] = ["skill-category"]
-            cat_span.string = item + ":"
-            p.append(cat_span)
-            p.append(" ")
-        elif item_type == "link":
-            # Clone the link and add skill class
-            item["class"] = item.get("class", []) + ["skill-tag"]
-            p.append(item)
-            p.append(" ")
-        elif item_type == "text":
-            span = soup.new_tag("span")
-            span["class"] = ["skill-tag"]
-            span.string = item
-            p.append(span)
-            p.append(" ")
-
-
-def process_header_section(soup):
-    """Process the header section to ensure proper centering."""
-    # Find the first two paragraphs (tagline and links)
-    paragraphs = soup.find_all("p")[:2]
-
-    for p in paragraphs:
-        # Add a special class to these paragraphs
-        p["class"] = p.get("class", []) + ["header-content"]
-        # Clean up whitespace between elements without destroying the links
-        for br in p.find_all("br"):
-            br.replace_with(" ")
-        # Join text nodes with single spaces
-        for text in p.find_all(string=True):
-            if text.strip():
-                text.replace_with(" " + text.strip() + " ")
-
-
-def process_job_entries(soup):
-    """Process job entries to combine role and date."""
-    for h4 in soup.find_all("h4"):
+from dataclasses import replace
+
+from browser_pool import CDP_ENDPOINT_ENV, DEFAULT_MAX_RENDERS
+from hermetic import fetch_fonts, font_bundle
+from pdf_optimize import require_libraries
+from pipeline import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RENDER_OPTIONS,
+    MODEL_STAGE,
+    PIPELINE_STAGES,
+    RenderOptions,
+    build_resume_html,
+    check_cache,
+    expand_inputs,
+    open_backend,
+    render_file,
+    render_many,
+    report_result,
+    resolve_output_path,
+)
+from profiling import DEFAULT_TRACE_PATH, Profiler
+from render_cache import RenderCache
+from reproducible import source_date_epoch
+
+
+def report_attach(backend, options):
+    """Say so if the backend launched Chromium because options.cdp_endpoint was unreachable."""
+    if options.cdp_endpoint and backend.stats.attach_failures:
+        print(f"CDP endpoint {options.cdp_endpoint} unreachable, launched Chromium instead")
+
+
+async def create_styled_resume_async(
+    input_path, output_path=None, cache=None, force=False, options=DEFAULT_RENDER_OPTIONS
+):
+    """Create a styled PDF resume from a markdown input file.
+
+    With a cache, an output that is already current is left untouched and
+    no backend is started.
+    """
+    output_path = resolve_output_path(input_path, output_path)
+
+    if cache is not None and not force:
+        hit = check_cache(cache, input_path, output_path, options)
+        if hit is not None:
+            report_result(hit)
+            return
+
+    async with open_backend(options, size=1) as backend:
+        result = await render_file(backend, input_path, output_path, cache, options)
+    result.cache_checked = cache is not None and not force
+    report_attach(backend, options)
+    if cache is not None:
+        cache.save()
+    if not result.ok:
+        raise RuntimeError(result.error)
+    report_result(result)
+    if getattr(backend, "last_fit", None) is not None:
+        print(f"Fit to pages: {backend.last_fit.summary()}")
+
+
+def create_styled_resume(
+    input_path, output_path=None, cache=None, force=False, options=DEFAULT_RENDER_OPTIONS
+):
+    """Sync wrapper for create_styled_resume_async."""
+    asyncio.run(create_styled_resume_async(input_path, output_path, cache, force, options))
+
+
+async def create_styled_resumes_async(
+    input_paths,
+    output_dir=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    max_renders=DEFAULT_MAX_RENDERS,
+    max_heap_mb=None,
+    cache=None,
+    force=False,
+    options=DEFAULT_RENDER_OPTIONS,
+):
+    """Render a batch of markdown files, printing each result.
+
+    Returns the number of files that failed.
+    """
+    failures = 0
+    hits = 0
+    backend = open_backend(options, concurrency, max_renders, max_heap_mb)
+    try:
+        async for result in render_many(
+            input_paths, output_dir, concurrency, backend, cache, force, options
+        ):
+            report_result(result)
+            failures += not result.ok
+            hits += result.cached
+    finally:
+        await backend.close()
+
+    stats = backend.stats
+    print(f"Cache: {hits} hit(s), {stats.renders} render(s)")
+    if cache is not None and cache.stage_hits:
+        stages = (*PIPELINE_STAGES[:-1], MODEL_STAGE)
+        reused = ", ".join(f"{stage} {cache.stage_hits[stage]}" for stage in stages)
+        print(f"Stages reused: {reused}")
+    if stats.renders:
+        print(
+            f"Pool: {stats.renders} renders, {stats.recycles} contexts recycled, "
+            f"{stats.relaunches} browser relaunches, {stats.retries} retries"
+        )
+    report_attach(backend, options)
+    return failures
+
+
+def render_inputs(args, input_files, options):
+    """Render input_files as the parsed command line asks; returns the exit status."""
+    if args.variants:
+        from variants import create_variants_async
+
+        if len(input_files) > 1 or args.output:
+            print("Error: --variants takes a single input file and writes to --output-dir")
+            return 1
         try:
-            # Find the next paragraph (date)
-            date_p = h4.find_next_sibling("p")
-            if not date_p or not date_p.find("em"):
-                continue
-
-            # Extract the date text from em tag
-            em_tag = date_p.find("em")
-            if not em_tag or not em_tag.string:
-                continue
-
-            date_text = em_tag.string.strip()
-
-            # Add date to h4 as data attribute
-            h4["data-date"] = date_text
-
-            # Create new span for title if h4 has content
-            if h4.string:
-                title_span = soup.new_tag("span")
-                title_span.string = h4.string.strip()
-                h4.string = ""
-                h4.append(title_span)
+            failures = asyncio.run(
+                create_variants_async(
+                    input_files[0],
+                    args.variants,
+                    args.output_dir,
+                    args.concurrency,
+                    RenderCache(args.cache_dir),
+                    args.force,
+                    options,
+                )
+            )
+        except Exception as e:
+            print(f"Error generating variants: {str(e)}")
+            return 1
+        return 1 if failures else 0
 
-            # Remove the original date paragraph
-            date_p.decompose()
+    if args.output and len(input_files) > 1:
+        print("Error: --output only applies to a single input; use --output-dir")
+        return 1
 
-        except Exception as e:
-            print(f"Warning: Could not process job entry: {str(e)}")
-            continue
+    try:
+        cache = RenderCache(args.cache_dir)
+        if len(input_files) == 1 and args.output_dir is None:
+            create_styled_resume(input_files[0], args.output, cache, args.force, options)
+            return 0
+        failures = asyncio.run(
+            create_styled_resumes_async(
+                input_files,
+                args.output_dir,
+                args.concurrency,
+                args.recycle_after,
+                args.max_heap_mb,
+                cache,
+                args.force,
+                options,
+            )
+        )
+        return 1 if failures else 0
+    except Exception as e:
+        print(f"Error generating PDF: {str(e)}")
+        return 1
 
 
-def process_name(soup):
-    """Process the name to add gradient effect."""
-    h1 = soup.find("h1")
-    if h1 and h1.string:
-        name_span = soup.new_tag("span")
-        name_span.string = h1.string
-        h1.string = ""
-        h1.append(name_span)
+def backend_error(backend, options=DEFAULT_RENDER_OPTIONS):
+    """Why backend cannot render with options, or None if it can."""
+    if options.shards > 1 and importlib.util.find_spec("pikepdf") is None:
+        return "--shards merges the shards with pikepdf (pip install 'resume-pdf[optimize]')"
+    if backend != "weasyprint":
+        return None
+    from backends import load_weasyprint
 
+    try:
+        load_weasyprint()
+    except RuntimeError as e:
+        return str(e)
+    if "png" in options.formats:
+        return "PNG thumbnails need --backend playwright"
+    if options.fit_pages:
+        return "--fit-pages needs --backend playwright"
+    if options.shards > 1:
+        return "--shards needs --backend playwright"
+    return None
+
+
+def compare_inputs(input_path, options):
+    """Print each backend's latency, memory and page count rendering input_path."""
+    from backends import BACKENDS, compare_backends, format_comparison
 
-async def create_styled_resume_async(input_path, output_path=None):
-    """Create a styled PDF resume from a markdown input file."""
-    # Read the markdown content
     with open(input_path, encoding="utf-8") as file:
-        md_content = file.read()
+        html_output = build_resume_html(file.read())
+    backends = [open_backend(replace(options, backend=name), size=1) for name in BACKENDS]
+    print(format_comparison(asyncio.run(compare_backends(html_output, backends))))
+    return 0
 
-    # Remove YAML frontmatter (everything between --- markers at the start)
-    md_content = re.sub(r"^---[\s\S]*?---\n*", "", md_content)
 
-    # Add IDs to sections before removing emojis
-    md_content = re.sub(
-        r"^##.*Experience.*$",
-        "## 🏢 Experience {: #experience}",
-        md_content,
-        flags=re.MULTILINE,
+def main(argv=None):
+    """Main function to parse arguments and generate the PDF resume."""
+    from backends import AUTO, BACKENDS, choose_backend
+
+    parser = argparse.ArgumentParser(description="Convert markdown resume to PDF")
+    parser.add_argument(
+        "input_files",
+        nargs="*",
+        help="Markdown files, directories or glob patterns (e.g. 'content/posts/*.md')",
     )
-    md_content = re.sub(
-        r"^##.*Summary.*$",
-        "## 🌠 Summary {: #summary}",
-        md_content,
-        flags=re.MULTILINE,
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Output path for the PDF file (default: public/[input_name].pdf)",
+        default=None,
     )
-
-    # Keep emojis - they add personality
-
-    # Convert Markdown to HTML
-    # Note: removed "nl2br" extension so text wraps naturally
-    html_content = markdown.markdown(
-        md_content, extensions=["tables", "attr_list"]
+    parser.add_argument(
+        "--output-dir",
+        help="Directory for batch output (default: the nearest public/ directory)",
+        default=None,
     )
-
-    # Process the HTML content
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Process name
-    process_name(soup)
-
-    # Process header section
-    process_header_section(soup)
-
-    # Process job entries
-    process_job_entries(soup)
-
-    # Process skills section - find all paragraphs under skills h3s
-    skills_section_titles = [
-        "Programming Languages",
-        "Technical Expertise",
-        "Engineering Leadership",
-    ]
-
-    for h3 in soup.find_all("h3"):
-        if h3.text.strip() in skills_section_titles:
-            # Process ALL sibling paragraphs until next h2/h3
-            sibling = h3.find_next_sibling()
-            while sibling and sibling.name not in ["h2", "h3"]:
-                if sibling.name == "p":
-                    process_skills_paragraph(sibling, soup)
-                sibling = sibling.find_next_sibling()
-
-    # Get the modified HTML content
-    html_content = str(soup)
-
-    # HTML template with CSS styling
-    template = Template(
-        """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <style>
-            @import url(
-                'https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&family=Space+Grotesk:wght@400;500;600&display=swap'
-            );
-
-            :root {
-                --primary: #00a0a0;          /* Darker Cyan */
-                --primary-light: rgba(0, 160, 160, 0.2);
-                --secondary: #cc00cc;        /* Darker Magenta */
-                --accent: #00a0a0;           /* Darker Cyan accent */
-                --text-dark: #101018;        /* Near black text */
-                --text-header: #00a0a0;      /* Cyan for headers */
-                --text-subheader: #cc00cc;   /* Magenta for subheaders */
-                --link-color: #008080;       /* Darker cyan for links */
-                --background: #ffffff;       /* White background */
-                --background-light: #f0f2f5; /* Light gray for sections */
-                --body-font: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
-            }
-
-            body {
-                font-family: var(--body-font);
-                font-weight: 400;
-                line-height: 1.3;
-                max-width: 1000px;
-                margin: 0 auto;
-                padding: 1em;
-                color: var(--text-dark);
-                font-size: 9pt;
-                background: var(--background);
-            }
-
-            /* Overridden by later h1 rule */
-
-            h2 {
-                color: var(--secondary);
-                font-size: 1.4em;
-                margin: 1.6em 0 0.8em 0;
-                padding: 0.3em 0 0.3em 0.8em;
-                border-left: 4px solid var(--secondary);
-                background: none;
-            }
-
-            h2:first-of-type {
-                margin-top: 1em;
-            }
-
-            h3 {
-                color: var(--accent);
-                font-size: 1.2em;
-                margin: 1em 0 0.6em 0;
-                padding: 0.3em 0.8em;
-                border-bottom: 1px solid var(--primary-light);
-            }
-
-            /* Experience section styling */
-            #experience ~ h3 {
-                border-top: 1px solid var(--primary-light);
-                background-color: var(--background-light);
-            }
-
-            /* Old skills styling removed - using .skill-tag class now */
-
-            /* Links styling */
-            a {
-                color: var(--link-color);
-                text-decoration: none;
-                border-bottom: 1px dotted var(--link-color);
-                padding-bottom: 1px;
-            }
-
-            a:hover {
-                color: var(--secondary);
-                border-bottom: 1px solid var(--secondary);
-                text-decoration: none;
-            }
-
-            /* List styling */
-            ul {
-                list-style: none;
-                margin: 0.6em 0 1em 0;
-                padding: 0;
-            }
-
-            li {
-                margin: 0.35em 0;
-                line-height: 1.5;
-                color: var(--text-dark);
-                padding-left: 1.8em;
-                position: relative;
-                border-left: 2px solid var(--primary-light);
-                margin-left: 0.5em;
-            }
-
-            li::before {
-                content: "▹";
-                position: absolute;
-                left: 0.6em;
-                color: var(--accent);
-            }
-
-            /* Technologies: lines - inline flow for links */
-            li:has(strong:first-child) {
-                border-left-color: var(--secondary);
-            }
-
-            /* Keep technology links inline */
-            li a {
-                white-space: nowrap;
-            }
-
-            /* Date styling */
-            em {
-                color: var(--primary);
-            }
-
-            /* Technologies emphasis */
-            li strong {
-                color: var(--secondary);
-                font-weight: 600;
-            }
-
-            /* Summary section styling */
-            #summary + p {
-                margin-bottom: 1.5em;
-            }
-
-            #summary + p + p {
-                margin-top: 1.5em;
-                font-style: italic;
-                color: var(--primary);
-                text-shadow: 0 0 4px var(--primary-light);
-            }
-
-            /* Ensure header content is properly centered */
-            .header-content {
-                text-align: center !important;
-                margin: 0.5em auto !important;
-                width: 100% !important;
-                display: block !important;
-            }
-
-            /* Style specifically for the links paragraph */
-            .header-content a {
-                display: inline-block;
-                margin: 0 0.5em;
-                color: var(--primary);
-            }
-
-            /* h1 styling moved to Name styling section below */
-
-            /* Skills now use .skills-list class - see above */
-
-            /* Job entry styling */
-            h3 {
-                color: var(--accent);
-                font-size: 1.2em;
-                margin-top: 1.2em;
-                margin-bottom: 0.5em;
-                padding: 0.3em 0;
-                border-bottom: 1px solid var(--primary-light);
-            }
-
-            /* Role container */
-            h4 {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin: 0.8em 0 0.2em 0;
-                padding: 0.2em 0;
-            }
-
-            /* Role title */
-            h4 span:first-child {
-                color: var(--secondary);
-                font-size: 1.1em;
-                font-weight: 600;
-            }
-
-            /* Convert h4 text to a flex container */
-            h4::after {
-                content: attr(data-date);
-                color: var(--primary);
-                font-size: 0.9em;
-                font-style: italic;
-                font-weight: normal;
-            }
-
-            /* Remove original date paragraph */
-            h4 + p {
-                display: none;
-            }
-
-            /* Role description bullets */
-            ul {
-                margin: 0.6em 0 1em 0.8em;
-            }
-
-            li {
-                margin: 0.35em 0;
-                line-height: 1.5;
-                color: var(--text-dark);
-            }
-
-            /* Technologies emphasis */
-            li strong {
-                color: var(--secondary);
-                font-weight: 600;
-            }
-
-            /* Employer section styling */
-            #experience ~ h3 {
-                color: var(--accent);
-                font-size: 1.1em;
-                margin: 1em 0 0.6em 0;
-                padding: 0.2em 0.6em;
-                background: none;
-                border-left: 3px solid var(--accent);
-                font-weight: 500;
-                letter-spacing: 0.02em;
-            }
-
-            /* Role content indentation */
-            #experience ~ h3 ~ h4,
-            #experience ~ h3 ~ p,
-            #experience ~ h3 ~ ul {
-                margin-left: 1em;
-            }
-
-            /* Special styling for the first employer */
-            h3:first-of-type {
-                margin-top: 0.6em;
-            }
-
-            /* Add a subtle line between employers */
-            h3:not(:first-of-type) {
-                border-top: 1px solid rgba(0, 255, 255, 0.1);
-                padding-top: 0.4em;
-            }
-
-            /* Name styling - gradient background bar */
-            h1 {
-                font-family: 'Space Grotesk', 'Outfit', sans-serif;
-                font-size: 2.2em;
-                text-align: center;
-                margin: 0.5em 0;
-                padding: 0.5em 1em;
-                text-transform: uppercase;
-                letter-spacing: 0.1em;
-                background: linear-gradient(90deg, #00a0a0 0%, #8800aa 50%, #cc00cc 100%);
-                color: #ffffff;
-                border-radius: 6px;
-                font-weight: 600;
-            }
-
-            /* Name text styling - no background */
-            h1 span {
-                color: #ffffff;
-                font-weight: 600;
-                background: transparent;
-            }
-
-            /* Summary section */
-            #summary + p {
-                text-align: justify;
-                line-height: 1.5;
-                margin: 0.8em 0;
-            }
-
-            /* Skills list styling */
-            .skills-list {
-                display: flex;
-                flex-wrap: wrap;
-                gap: 0.4em;
-                align-items: center;
-                margin: 0.5em 0;
-                padding-left: 1.2em;
-            }
-
-            .skill-category {
-                font-weight: 600;
-                color: var(--secondary);
-                margin-right: 0.3em;
-                white-space: nowrap;
-                width: 100%;
-                padding-left: 0;
-                margin-left: -1.2em;
-                margin-top: 0.3em;
-            }
-
-            .skill-category:first-child {
-                margin-top: 0;
-            }
-
-            .skill-tag {
-                display: inline-block;
-                background: var(--background-light);
-                border: 1px solid var(--primary-light);
-                padding: 0.15em 0.5em;
-                border-radius: 4px;
-                font-size: 0.9em;
-                color: var(--text-dark);
-                text-decoration: none;
-            }
-
-            a.skill-tag {
-                border-bottom: none;
-            }
-
-            /* Experience section indentation */
-            /* Only indent content under h3 (employers) */
-            #experience ~ h3 ~ h4,
-            #experience ~ h3 ~ p,
-            #experience ~ h3 ~ ul {
-                margin-left: 1.2em;
-            }
-
-            /* Keep employers (h3) and section headers (h2) at full width */
-            #experience ~ h2,
-            #experience ~ h3 {
-                margin-left: 0;
-            }
-
-            /* Adjust employer headers styling */
-            #experience ~ h3 {
-                width: 100%;  /* Full width for employers */
-            }
-        </style>
-    </head>
-    <body>
-        {{ content }}
-    </body>
-    </html>
-    """  # noqa: E501
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Pages rendered at once in batch mode (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        default=DEFAULT_MAX_RENDERS,
+        help=f"Rebuild a page's browser context after N renders (default: {DEFAULT_MAX_RENDERS})",
+    )
+    parser.add_argument(
+        "--max-heap-mb",
+        type=float,
+        default=None,
+        help="Rebuild a page's browser context once its JS heap exceeds this many MB",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a localhost render server that keeps Chromium warm",
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="Serve a live-reloading HTML preview without launching a browser",
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Host for --serve and --preview (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Port for --serve (default: 8765) or --preview (default: 8766)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep a browser open and regenerate the outputs whenever the input changes",
+    )
+    parser.add_argument(
+        "--watch-path",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Extra file to watch in --watch or --preview mode (repeatable)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Render even when the cached output is already up to date",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for the render cache manifest (default: ~/.cache/resume-pdf)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Render with the bundled fonts and block all network requests",
     )
+    parser.add_argument(
+        "--cdp-endpoint",
+        default=os.environ.get(CDP_ENDPOINT_ENV),
+        metavar="URL",
+        help="Attach to a running Chromium over CDP (http:// or ws://) instead of launching "
+        f"one; falls back to launching if unreachable (default: ${CDP_ENDPOINT_ENV})",
+    )
+    parser.add_argument(
+        "--fetch-fonts",
+        action="store_true",
+        help="Refresh the committed web font bundle used by --offline, then exit",
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Subset fonts, merge duplicate streams and linearize the PDF (needs pikepdf)",
+    )
+    parser.add_argument(
+        "--variants",
+        metavar="FILE",
+        help="TOML file of tailored variants to render concurrently from one parse",
+    )
+    parser.add_argument(
+        "--formats",
+        default="pdf",
+        help=(
+            "Comma-separated exports from one parse: pdf, pdf-a4, html, png, txt, json "
+            "(default: pdf)"
+        ),
+    )
+    parser.add_argument(
+        "--fit-pages",
+        type=int,
+        metavar="N",
+        help="Scale the type so the PDF fills at most N pages, measured in the live page",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Print each PDF as up to N shards split at its h2s, in parallel, and merge them "
+        "(needs pikepdf; 0: one per CPU core; default: 1)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream each PDF from Chromium to its file in chunks instead of buffering it "
+        "(ignored with --optimize, --reproducible, --fit-pages or other --formats, "
+        "which need the whole PDF)",
+    )
+    parser.add_argument(
+        "--thumbnail-widths",
+        default="1200,600,300",
+        help="Pixel widths of the page-one PNG thumbnails (default: 1200,600,300)",
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        default="SOURCE_DATE_EPOCH" in os.environ,
+        help="Pin PDF timestamps and IDs and write an ETag sidecar "
+        "(default: on when SOURCE_DATE_EPOCH is set)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=DEFAULT_TRACE_PATH,
+        metavar="TRACE",
+        help="Time every stage, print a summary table and write a Chrome trace to TRACE "
+        f"(default: {DEFAULT_TRACE_PATH})",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=(AUTO, *BACKENDS),
+        default="playwright",
+        help="Print with headless Chromium, WeasyPrint, or whichever suits the job best "
+        "(default: playwright)",
+    )
+    parser.add_argument(
+        "--compare-backends",
+        action="store_true",
+        help="Render the input with every backend and report latency, memory and page count",
+    )
+    args = parser.parse_args(argv)
 
-    # Render the template
-    html_output = template.render(content=html_content)
-
-    # Generate output path
-    if output_path is None:
-        # Find project root by looking for public/ directory
-        # Start from input file's directory and walk up
-        current_dir = os.path.dirname(os.path.abspath(input_path))
-        output_dir = None
-        for _ in range(5):  # Look up to 5 levels
-            potential_public = os.path.join(current_dir, "public")
-            if os.path.isdir(potential_public):
-                output_dir = potential_public
-                break
-            parent = os.path.dirname(current_dir)
-            if parent == current_dir:  # Reached root
-                break
-            current_dir = parent
-
-        if output_dir is None:
-            # Fallback: create public/ next to input file
-            output_dir = os.path.join(os.path.dirname(input_path), "public")
-
-        # Create public directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-        base_name = os.path.splitext(os.path.basename(input_path))[0]
-        output_path = os.path.join(output_dir, f"{base_name}.pdf")
-
-    # Convert HTML to PDF using Playwright
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-
-        # Write HTML to a temp file for proper file:// URL loading
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".html", delete=False) as f:
-            f.write(html_output)
-            temp_html_path = f.name
+    if args.profile and (args.serve or args.preview or args.watch):
+        print("Error: --profile applies to one-off renders, not --serve, --preview or --watch")
+        return 1
+    if args.watch and args.variants:
+        parser.error("--variants renders once; it can't be combined with --watch")
+    if args.reproducible:
+        try:
+            source_date_epoch()
+        except ValueError as e:
+            parser.error(str(e))
 
+    if args.fetch_fonts:
         try:
-            await page.goto(f"file://{temp_html_path}")
-            await page.pdf(
-                path=output_path,
-                format="Letter",
-                margin={"top": "0.5in", "bottom": "0.5in", "left": "0.5in", "right": "0.5in"},
-                print_background=True,
-            )
-        finally:
-            os.unlink(temp_html_path)
-            await browser.close()
+            count = fetch_fonts()
+        except OSError as e:
+            print(f"Error fetching fonts: {e}")
+            return 1
+        print(f"Fetched {count} font file(s)")
+        return 0
 
-    print(f"PDF generated: {output_path}")
+    try:
+        if args.offline:
+            font_bundle()
+        if args.optimize:
+            require_libraries()
+        formats = tuple(dict.fromkeys(name.strip() for name in args.formats.split(",")))
+        thumbnail_widths = tuple(int(width) for width in args.thumbnail_widths.split(","))
+    except (FileNotFoundError, RuntimeError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    from exports import EXPORT_FORMATS
+
+    unknown = set(formats) - set(EXPORT_FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    if args.fit_pages is not None and args.fit_pages < 1:
+        parser.error("--fit-pages must be at least 1")
+    if args.shards < 0:
+        parser.error("--shards must be 0 or more")
+    options = RenderOptions(
+        offline=args.offline,
+        optimize=args.optimize,
+        reproducible=args.reproducible,
+        formats=formats,
+        thumbnail_widths=thumbnail_widths,
+        fit_pages=args.fit_pages,
+        shards=args.shards or os.cpu_count() or 1,
+        stream=args.stream,
+        cdp_endpoint=args.cdp_endpoint or None,
+    )
 
+    if args.serve:
+        from render_server import run_server
 
-def create_styled_resume(input_path, output_path=None):
-    """Sync wrapper for create_styled_resume_async."""
-    asyncio.run(create_styled_resume_async(input_path, output_path))
+        backend, _ = choose_backend(args.backend, warm=True)
+        error = backend_error(backend, options)
+        if error:
+            print(f"Error: {error}")
+            return 1
+        options = replace(options, backend=backend)
+        run_server(args.host, args.port or 8765, args.concurrency, options)
+        return 0
 
+    if not args.input_files:
+        parser.error("at least one input file is required")
 
-def main():
-    """Main function to parse arguments and generate the PDF resume."""
-    parser = argparse.ArgumentParser(description="Convert markdown resume to PDF")
-    parser.add_argument("input_file", help="Path to the markdown resume file")
-    parser.add_argument(
-        "-o",
-        "--output",
-        help="Output path for the PDF file (default: public/[input_name].pdf)",
-        default=None,
-    )
-    args = parser.parse_args()
+    input_files = expand_inputs(args.input_files)
+    missing = [path for path in input_files if not os.path.isfile(path)]
+    if missing or not input_files:
+        print(f"Error: File not found: {', '.join(missing) or ' '.join(args.input_files)}")
+        return 1
 
-    if not os.path.exists(args.input_file):
-        print(f"Error: File not found: {args.input_file}")
+    if (args.watch or args.preview or args.compare_backends) and len(input_files) > 1:
+        print("Error: --watch, --preview and --compare-backends take a single input file")
         return 1
 
-    try:
-        create_styled_resume(args.input_file, args.output)
+    if args.compare_backends:
+        return compare_inputs(input_files[0], options)
+
+    if args.preview:
+        from preview_server import run_preview
+
+        run_preview(input_files[0], args.host, args.port or 8766, args.watch_path)
         return 0
-    except Exception as e:
-        print(f"Error generating PDF: {str(e)}")
+
+    backend, reason = choose_backend(
+        args.backend,
+        [os.path.getsize(path) for path in input_files],
+        options,
+        warm=bool(args.watch or args.variants),
+    )
+    if args.backend == AUTO:
+        print(f"Backend: {backend} ({reason})")
+    error = backend_error(backend, options)
+    if error:
+        print(f"Error: {error}")
         return 1
+    options = replace(options, backend=backend)
+
+    if args.watch:
+        from watcher import run_watch
+
+        run_watch(input_files[0], args.output, args.watch_path, options)
+        return 0
+
+    if args.profile is None:
+        return render_inputs(args, input_files, options)
+    with Profiler() as profiler:
+        status = render_inputs(args, input_files, options)
+    profiler.write_trace(args.profile)
+    print(profiler.summary())
+    print(f"Profile trace written to {args.profile}")
+    return status
 
 
 if __name__ == "__main__":
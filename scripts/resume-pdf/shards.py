@@ -0,0 +1,225 @@
+"""Print a long document as shards on several pages at once, then merge them.
+
+One page lays a document out on one core, so a long one (the whole posts
+archive as a single PDF, say) prints serially however many pages the pool
+keeps warm. split_shards() cuts the templated HTML at top-level h2s into
+contiguous groups of sections of about equal size, each wrapped in the
+same head. print_sharded() prints the groups concurrently on pooled pages,
+each in its own browser context, and merge_shards() joins the PDFs in
+order with pikepdf.
+
+Each shard starts on a new page. The merged PDF keeps what a single print
+would have, or more:
+
+- page numbering: one 1..N page label range over all shards
+- outline: h2 and h3 headings as a two-level outline; every heading is
+  given an id for it, if it had none
+- internal links: ``href="#id"`` links work across shards
+
+Chromium only writes a named destination for an id that some link in the
+same document points at, and only links to an id the document contains.
+So every shard gets hidden links to its own heading ids and link targets,
+and display:none placeholders for targets living in other shards. The
+shards' destinations are then merged into one table.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import html
+import io
+import re
+import warnings
+
+from pipeline import print_pdf
+from profiling import profile_stage
+
+# Heading levels that split shards (h2) and make up the outline
+SPLIT_TAG = "h2"
+OUTLINE_TAGS = ("h2", "h3")
+
+
+def _partition(sizes, count):
+    """Split sizes into count contiguous runs of about equal total, as slices."""
+    total = sum(sizes)
+    runs, start, running = [], 0, 0
+    for index, size in enumerate(sizes):
+        running += size
+        remaining = len(sizes) - index - 1
+        wanted = count - len(runs) - 1
+        if wanted and (running >= total * (len(runs) + 1) / count or remaining == wanted):
+            runs.append(slice(start, index + 1))
+            start = index + 1
+    runs.append(slice(start, len(sizes)))
+    return runs
+
+
+def split_shards(html_output, shards):
+    """Cut html_output into at most shards documents at h2 boundaries.
+
+    Returns the shard documents and the outline headings, in order, as
+    (tag, id, title) tuples. The body is parsed once to find the cuts,
+    and sliced out of the original string rather than re-serialized.
+    """
+    from bs4 import BeautifulSoup, Tag
+
+    start = html_output.index("<body>") + len("<body>")
+    end = html_output.rindex("</body>")
+    head, body, tail = html_output[:start], html_output[start:end], html_output[end:]
+    soup = BeautifulSoup(body, "html.parser")
+    line_starts = [0, *(match.end() for match in re.finditer("\n", body))]
+
+    def offset(tag):
+        return line_starts[tag.sourceline - 1] + tag.sourcepos
+
+    # Sections start at the top-level h2s, the first also taking what precedes it
+    cuts = [offset(tag) for tag in soup.find_all(SPLIT_TAG, recursive=False)] or [0]
+    cuts[0] = 0
+
+    ids = {element["id"] for element in soup.find_all(id=True)}
+    headings, insertions = [], []
+    for number, heading in enumerate(soup.find_all(OUTLINE_TAGS), 1):
+        if not heading.get("id"):
+            heading["id"] = f"shard-{heading.name}-{number}"
+            while heading["id"] in ids:
+                heading["id"] += "-"
+            ids.add(heading["id"])
+            # After "<h2", so the tag is otherwise untouched
+            insertions.append((offset(heading) + 3, f' id="{heading["id"]}"'))
+        headings.append((heading.name, heading["id"], heading.get_text(" ", strip=True)))
+
+    # What each section defines and links to, from its top-level nodes
+    own = [set() for _ in cuts]
+    links = [set() for _ in cuts]
+    for node in soup.contents:
+        if not isinstance(node, Tag):
+            continue
+        section = bisect.bisect_right(cuts, offset(node)) - 1
+        elements = [node, *node.find_all(True)]
+        own[section].update(element["id"] for element in elements if element.get("id"))
+        links[section].update(
+            element["href"][1:]
+            for element in elements
+            if element.name == "a" and element.get("href", "").startswith("#")
+        )
+    targets = {target for linked in links for target in linked if target in ids}
+    targets.update(heading_id for _, heading_id, _ in headings)
+
+    # Heading ids go in back to front, shifting the cuts after them
+    for position, text in reversed(insertions):
+        body = body[:position] + text + body[position:]
+    cuts = [cut + sum(len(text) for position, text in insertions if position < cut) for cut in cuts]
+    bounds = [*cuts, len(body)]
+    sizes = [bounds[index + 1] - bounds[index] for index in range(len(cuts))]
+
+    documents = []
+    for run in _partition(sizes, min(shards, len(cuts))):
+        sections = range(len(cuts))[run]
+        defined = set().union(*(own[index] for index in sections))
+        linked = set().union(*(links[index] for index in sections)) & targets
+        # Hidden links make Chromium write destinations for this shard's
+        # targets; placeholders let links to other shards' targets be written
+        extra = "".join(
+            f'<a href="#{html.escape(target)}" style="display:none"></a>'
+            for target in sorted(targets & defined)
+        ) + "".join(
+            f'<span id="{html.escape(target)}" style="display:none"></span>'
+            for target in sorted(linked - defined)
+        )
+        shard = body[bounds[sections.start] : bounds[sections.stop]]
+        documents.append(head + shard + extra + tail)
+    return documents, headings
+
+
+def _destinations(pdf):
+    """Named destinations of pdf, from its /Dests dictionary and name tree."""
+    import pikepdf
+
+    found = {}
+    if "/Dests" in pdf.Root:
+        for key, dest in pdf.Root.Dests.items():
+            found[key[1:]] = dest
+    if "/Names" in pdf.Root and "/Dests" in pdf.Root.Names:
+        for key, dest in pikepdf.NameTree(pdf.Root.Names.Dests).items():
+            found[key] = dest
+    return {
+        name: dest.D if isinstance(dest, pikepdf.Dictionary) else dest
+        for name, dest in found.items()
+    }
+
+
+def merge_shards(pdfs, headings=()):
+    """Join shard PDFs into one, with its page labels, outline and links."""
+    import pikepdf
+
+    with contextlib.ExitStack() as stack:
+        merged = stack.enter_context(pikepdf.open(io.BytesIO(pdfs[0])))
+        destinations = _destinations(merged)
+        for pdf in pdfs[1:]:
+            shard = stack.enter_context(pikepdf.open(io.BytesIO(pdf)))
+            first = len(merged.pages)
+            with warnings.catch_warnings():
+                # pikepdf warns that named destinations are lost; they are
+                # carried over below
+                warnings.simplefilter("ignore")
+                merged.pages.extend(shard.pages)
+            copies = {
+                page.obj.objgen: merged.pages[first + index].obj
+                for index, page in enumerate(shard.pages)
+            }
+            for name, dest in _destinations(shard).items():
+                # [page /XYZ left top zoom], pointed at the page's copy
+                destinations.setdefault(
+                    name, pikepdf.Array([copies[dest[0].objgen], *list(dest)[1:]])
+                )
+
+        merged.Root.Dests = pikepdf.Dictionary(
+            {f"/{name}": dest for name, dest in destinations.items()}
+        )
+        tree = pikepdf.NameTree.new(merged)
+        for name, dest in sorted(destinations.items()):
+            tree[name] = dest
+        if "/Names" not in merged.Root:
+            merged.Root.Names = pikepdf.Dictionary()
+        merged.Root.Names.Dests = tree.obj
+        merged.Root.PageLabels = pikepdf.Dictionary(
+            Nums=pikepdf.Array([0, pikepdf.Dictionary(S=pikepdf.Name.D)])
+        )
+
+        with merged.open_outline() as outline:
+            outline.root.clear()
+            parent = None
+            for tag, heading_id, title in headings:
+                if heading_id not in destinations:
+                    continue
+                item = pikepdf.OutlineItem(title, destinations[heading_id])
+                if tag == OUTLINE_TAGS[0] or parent is None:
+                    outline.root.append(item)
+                    parent = item if tag == OUTLINE_TAGS[0] else None
+                else:
+                    parent.children.append(item)
+
+        output = io.BytesIO()
+        merged.save(output)
+    return output.getvalue()
+
+
+async def print_sharded(pool, html_output, shards, output_path=None):
+    """Print html_output as up to shards shards on pool, merged into one PDF.
+
+    A document without enough h2 sections to split prints as it is. The
+    PDF is also written to output_path when one is given.
+    """
+    with profile_stage("split shards"):
+        documents, headings = split_shards(html_output, shards)
+    if len(documents) == 1:
+        return await pool.run(lambda page: print_pdf(page, html_output, output_path))
+    pdfs = await asyncio.gather(
+        *(pool.run(lambda page, shard=shard: print_pdf(page, shard)) for shard in documents)
+    )
+    with profile_stage("merge shards", shards=len(pdfs)):
+        pdf = await asyncio.to_thread(merge_shards, pdfs, headings)
+    if output_path is not None:
+        with open(output_path, "wb") as file:
+            file.write(pdf)
+    return pdf
@@ -0,0 +1,365 @@
+"""Compile the resume stylesheet into one minimal sheet.
+
+The template CSS is written the way it evolved: later rules restate and
+override earlier ones for the same selector. compile_stylesheet() folds every
+selector's rules into one, drops declarations that a later one always
+overrides, and strips comments and whitespace, so the browser resolves each
+element against as few rules as possible.
+
+A rule is only moved past another when that cannot change which declaration
+wins: the one in between must not be able to match the same elements with
+the same specificity while setting a related property.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+# Whitespace outside string literals, which must be kept as written
+_STRING_OR_SPACE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|\s+""")
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_NAME = re.compile(r"-?[_a-zA-Z][\w-]*")
+_STYLE_BLOCK = re.compile(r"(<style[^>]*>)(.*?)(</style>)", re.S | re.I)
+
+_SIDES = ("top", "right", "bottom", "left")
+_BORDER_PARTS = ("width", "style", "color")
+
+# Shorthand properties and every longhand they reset
+SHORTHANDS = {
+    "margin": {f"margin-{side}" for side in _SIDES},
+    "padding": {f"padding-{side}" for side in _SIDES},
+    "border": {
+        *(f"border-{side}" for side in _SIDES),
+        *(f"border-{part}" for part in _BORDER_PARTS),
+        *(f"border-{side}-{part}" for side in _SIDES for part in _BORDER_PARTS),
+    },
+    **{f"border-{side}": {f"border-{side}-{part}" for part in _BORDER_PARTS} for side in _SIDES},
+    **{f"border-{part}": {f"border-{side}-{part}" for side in _SIDES} for part in _BORDER_PARTS},
+    "background": {
+        "background-color",
+        "background-image",
+        "background-position",
+        "background-size",
+        "background-repeat",
+        "background-attachment",
+        "background-origin",
+        "background-clip",
+    },
+}
+
+# Legacy pseudo-elements that may be written with a single colon
+_PSEUDO_ELEMENTS = {"before", "after", "first-line", "first-letter"}
+
+
+def squeeze(text):
+    """Collapse whitespace outside string literals to single spaces."""
+    return _STRING_OR_SPACE.sub(lambda match: match.group(1) or " ", text).strip()
+
+
+def split_top_level(text, separator):
+    """Split text on separator, ignoring any inside strings, brackets or parentheses."""
+    parts, depth, quote, start = [], 0, None, 0
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote and text[index - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _closing(text, start, opener, closer):
+    """Index of the closer matching the opener at start, skipping strings."""
+    depth, quote = 0, None
+    for index in range(start, len(text)):
+        char = text[index]
+        if quote:
+            if char == quote and text[index - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == opener:
+            depth += 1
+        elif char == closer:
+            depth -= 1
+            if depth == 0:
+                return index
+    raise ValueError(f"Unbalanced {opener!r} in stylesheet")
+
+
+def specificity(selector):
+    """(ids, classes, types) specificity of a single complex selector."""
+    ids = classes = types = 0
+    index = 0
+    while index < len(selector):
+        char = selector[index]
+        if char in "#.":
+            match = _NAME.match(selector, index + 1)
+            index = match.end() if match else index + 1
+            if char == "#":
+                ids += 1
+            else:
+                classes += 1
+        elif char == "[":
+            classes += 1
+            index = _closing(selector, index, "[", "]") + 1
+        elif selector.startswith("::", index):
+            types += 1
+            match = _NAME.match(selector, index + 2)
+            index = match.end() if match else index + 2
+        elif char == ":":
+            match = _NAME.match(selector, index + 1)
+            name = match.group().lower() if match else ""
+            index = match.end() if match else index + 1
+            if index < len(selector) and selector[index] == "(":
+                end = _closing(selector, index, "(", ")")
+                argument = selector[index + 1 : end]
+                index = end + 1
+                if name in ("not", "is", "has"):
+                    inner = max(
+                        specificity(part.strip()) for part in split_top_level(argument, ",")
+                    )
+                    ids, classes, types = ids + inner[0], classes + inner[1], types + inner[2]
+                elif name != "where":
+                    classes += 1
+            elif name in _PSEUDO_ELEMENTS:
+                types += 1
+            else:
+                classes += 1
+        elif _NAME.match(selector, index) and (index == 0 or selector[index - 1] in " >+~(,"):
+            types += 1
+            index = _NAME.match(selector, index).end()
+        else:
+            index += 1
+    return ids, classes, types
+
+
+def subject(selector):
+    """(tag, pseudo-element) of the compound selector an element is matched by."""
+    compound = re.split(r"\s*[\s>+~]\s*", _without_arguments(selector))[-1]
+    match = _NAME.match(compound)
+    tag = match.group().lower() if match else None
+    pseudo = re.search(r"::?([\w-]+)", compound)
+    is_element = pseudo and (compound[pseudo.start() + 1] == ":" or pseudo[1] in _PSEUDO_ELEMENTS)
+    return tag, pseudo[1].lower() if is_element else None
+
+
+def _without_arguments(selector):
+    """selector with the contents of any parentheses removed, for splitting."""
+    while "(" in selector:
+        start = selector.index("(")
+        selector = selector[:start] + selector[_closing(selector, start, "(", ")") + 1 :]
+    return selector
+
+
+@dataclass
+class Declaration:
+    name: str
+    value: str
+    important: bool = False
+
+    def __str__(self):
+        return f"{self.name}:{self.value}{'!important' if self.important else ''}"
+
+
+@dataclass
+class Rule:
+    selector: str
+    declarations: list[Declaration]
+    specificity: tuple[int, int, int] = field(init=False)
+    subject: tuple[str | None, str | None] = field(init=False)
+
+    def __post_init__(self):
+        self.specificity = specificity(self.selector)
+        self.subject = subject(self.selector)
+
+    def may_share_elements(self, other):
+        """False only if no element can be matched by both rules."""
+        (tag, pseudo), (other_tag, other_pseudo) = self.subject, other.subject
+        return pseudo == other_pseudo and (tag is None or other_tag is None or tag == other_tag)
+
+
+def _related(name, other):
+    """True if setting one property can affect the other's value."""
+    if name == other:
+        return True
+    family, other_family = name.split("-")[0], other.split("-")[0]
+    if family == other_family:
+        return True
+    return {family, other_family} == {"font", "line"}
+
+
+def parse_declarations(block):
+    declarations = []
+    for part in split_top_level(block, ";"):
+        if ":" not in part:
+            continue
+        name, value = part.split(":", 1)
+        value = squeeze(value)
+        important = value.lower().endswith("!important")
+        if important:
+            value = value[: -len("!important")].rstrip()
+        declarations.append(Declaration(squeeze(name).lower(), value, important))
+    return declarations
+
+
+def parse_stylesheet(css):
+    """Split css into at-rule strings and one Rule per selector, in source order."""
+    css = _COMMENT.sub("", css)
+    items: list[str | Rule] = []
+    index = 0
+    while True:
+        while index < len(css) and css[index].isspace():
+            index += 1
+        if index >= len(css):
+            return items
+        if css[index] == "@":
+            # Statement at-rules (@import) and blocks (@media) are kept as written
+            end = _at_rule_end(css, index)
+            items.append(squeeze(css[index : end + 1]))
+            index = end + 1
+            continue
+        brace = css.index("{", index)
+        end = _closing(css, brace, "{", "}")
+        declarations = parse_declarations(css[brace + 1 : end])
+        for selector in split_top_level(css[index:brace], ","):
+            items.append(Rule(squeeze(selector), [*declarations]))
+        index = end + 1
+
+
+def _at_rule_end(css, start):
+    """Index of the semicolon or closing brace that ends the at-rule at start."""
+    depth, quote = 0, None
+    for index in range(start, len(css)):
+        char = css[index]
+        if quote:
+            if char == quote and css[index - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and char == ";":
+            return index
+        elif depth == 0 and char == "{":
+            return _closing(css, index, "{", "}")
+    return len(css) - 1
+
+
+def dedupe(declarations):
+    """Keep only declarations that can still decide a property's value."""
+    winners: dict[str, int] = {}
+    for index, declaration in enumerate(declarations):
+        previous = winners.get(declaration.name)
+        if previous is None or declaration.important or not declarations[previous].important:
+            winners[declaration.name] = index
+    kept = []
+    for index, declaration in enumerate(declarations):
+        if winners[declaration.name] != index:
+            continue
+        # A longhand followed by its shorthand in the same rule never wins
+        if not _overridden(declaration, declarations[index + 1 :]):
+            kept.append(declaration)
+    return kept
+
+
+def _overridden(declaration, later):
+    """True if a declaration in the later list always wins over declaration."""
+    return any(
+        (other.name == declaration.name or declaration.name in SHORTHANDS.get(other.name, ()))
+        and (other.important or not declaration.important)
+        for other in later
+    )
+
+
+def _can_move(rule, declarations, between):
+    """Whether declarations of rule can move past the rules in between."""
+    if not declarations:
+        return True
+    for other in between:
+        if not isinstance(other, Rule):
+            return False
+        if other.specificity != rule.specificity or not rule.may_share_elements(other):
+            continue
+        for declaration in declarations:
+            for competing in other.declarations:
+                if competing.important == declaration.important and _related(
+                    declaration.name, competing.name
+                ):
+                    return False
+    return True
+
+
+def merge_rules(items):
+    """Fold each rule into the next rule with the same selector where that is safe."""
+    items = [
+        Rule(item.selector, dedupe(item.declarations)) if isinstance(item, Rule) else item
+        for item in items
+    ]
+    index = 0
+    while index < len(items):
+        rule = items[index]
+        if isinstance(rule, Rule):
+            later = next(
+                (
+                    position
+                    for position in range(index + 1, len(items))
+                    if isinstance(items[position], Rule)
+                    and items[position].selector == rule.selector
+                ),
+                None,
+            )
+            if later is not None:
+                target = items[later]
+                # Whatever the later rule overrides is dead wherever it sits
+                rule.declarations = [
+                    declaration
+                    for declaration in rule.declarations
+                    if not _overridden(declaration, target.declarations)
+                ]
+                if _can_move(rule, rule.declarations, items[index + 1 : later]):
+                    target.declarations = dedupe(rule.declarations + target.declarations)
+                    del items[index]
+                    continue
+        index += 1
+    return [item for item in items if not isinstance(item, Rule) or item.declarations]
+
+
+def serialize(items):
+    """One line per rule; adjacent rules with identical declarations share a line."""
+    lines: list[str] = []
+    previous = None
+    for item in items:
+        if not isinstance(item, Rule):
+            lines.append(item)
+            previous = None
+            continue
+        body = ";".join(str(declaration) for declaration in item.declarations)
+        if previous == body:
+            selectors, _ = lines[-1].split("{", 1)
+            lines[-1] = f"{selectors},{item.selector}{{{body}}}"
+        else:
+            lines.append(f"{item.selector}{{{body}}}")
+        previous = body
+    return "\n".join(lines)
+
+
+def compile_stylesheet(css):
+    """Return css merged, deduplicated and minified, with the same cascade result."""
+    return serialize(merge_rules(parse_stylesheet(css)))
+
+
+def compile_template_styles(template_source):
+    """Compile every <style> block of an HTML template."""
+    return _STYLE_BLOCK.sub(
+        lambda match: match[1] + compile_stylesheet(match[2]) + match[3], template_source
+    )
@@ -0,0 +1,116 @@
+"""Generate synthetic markdown resumes of arbitrary size for benchmarks."""
+
+import random
+
+EMOJI = ["🚀", "🤖", "📱", "⚡", "🌐", "🔧", "🎨", "🧪", "💡", "🛰️"]
+TECH = [
+    "C",
+    "C++",
+    "Go",
+    "Java",
+    "Kotlin",
+    "Python",
+    "Rust",
+    "TypeScript",
+    "React",
+    "Kubernetes",
+    "PostgreSQL",
+    "AWS",
+    "Linux Kernel",
+    "Android OS",
+]
+VERBS = ["Led", "Built", "Designed", "Shipped", "Scaled", "Mentored", "Launched", "Rewrote"]
+THINGS = [
+    "the device management platform",
+    "a realtime telemetry pipeline",
+    "the authentication and permissions system",
+    "firmware for a new hardware platform",
+    "developer tooling and CI workflows",
+    "an AI agent framework",
+]
+MONTHS = ["January", "March", "May", "July", "September", "November"]
+
+
+def _link(name):
+    slug = name.lower().replace(" ", "-").replace("+", "p")
+    return f"[{name}](https://example.com/{slug})"
+
+
+def synthetic_resume(
+    roles=100,
+    roles_per_employer=3,
+    skill_items=40,
+    emoji=True,
+    seed=0,
+    emoji_rate=0.3,
+    link_rate=0.5,
+):
+    """Return resume markdown with the given number of roles.
+
+    The output follows the structure of content/resume/resume.md: a name,
+    tagline and links header, summary, skills sections with pipe-separated
+    items, and employers with dated roles, bullets and technology lines.
+    emoji_rate and link_rate are the share of lines given an emoji and of
+    skills given a link.
+    """
+    rng = random.Random(seed)
+
+    def decorate(text):
+        return f"{text} {rng.choice(EMOJI)}" if emoji and rng.random() < emoji_rate else text
+
+    def tags(count):
+        items = []
+        for i in range(count):
+            name = f"{rng.choice(TECH)} {i}"
+            items.append(_link(name) if rng.random() < link_rate else name)
+        return " | ".join(items)
+
+    lines = [
+        "---",
+        "title: Resume",
+        "---",
+        "",
+        "# Synthetic Person",
+        "",
+        "**Engineer | Maker | Founder**",
+        "",
+        " | ".join(f"🔗 {_link(name)}" for name in ("Email", "GitHub", "LinkedIn", "Web")),
+        "",
+        "## 🌠 Summary",
+        "",
+        decorate("Two decades across the software stack, " * 8).strip(),
+        "",
+        "Let's build something amazing together!",
+        "",
+        "## 💻 Top Skills",
+        "",
+        "### Programming Languages",
+        "",
+        tags(skill_items),
+        "",
+        "### Technical Expertise",
+        "",
+    ]
+    for group in ("Mobile & Embedded", "Cloud & Infrastructure", "Specialized Domains"):
+        lines += [f"**{group}**: {tags(skill_items // 3)}", ""]
+    lines += ["### Engineering Leadership", "", tags(skill_items // 4), "", "## 🏢 Experience", ""]
+
+    year = 2025
+    for index in range(roles):
+        if index % roles_per_employer == 0:
+            lines += [f"### {_link(f'Employer {index // roles_per_employer}')}", ""]
+        start, end = rng.choice(MONTHS), rng.choice(MONTHS)
+        lines += [
+            f"#### {decorate(f'Role {index}')}",
+            "",
+            f"_({start} {year - 1} - {end} {year})_",
+            "",
+        ]
+        year -= 1
+        for _ in range(rng.randint(2, 6)):
+            lines.append(f"- {decorate(f'{rng.choice(VERBS)} {rng.choice(THINGS)}')}")
+        technologies = ", ".join(_link(rng.choice(TECH)) for _ in range(rng.randint(3, 8)))
+        lines += [f"- **Technologies:** {technologies}", ""]
+
+    lines += ["## 🎓 Education", "", "### Somewhere University", "", "B.S. Computer Science", ""]
+    return "\n".join(lines)
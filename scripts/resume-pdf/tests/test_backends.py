@@ -0,0 +1,55 @@
+import dataclasses
+
+import pytest
+
+import backends
+from backends import AUTO, AUTO_WEASYPRINT_MAX_BYTES, choose_backend
+from pipeline import DEFAULT_RENDER_OPTIONS
+
+SMALL = (1024,)
+
+
+def options(**changes):
+    return dataclasses.replace(DEFAULT_RENDER_OPTIONS, **changes)
+
+
+@pytest.fixture(autouse=True)
+def weasyprint_installed(monkeypatch):
+    monkeypatch.setattr(backends, "weasyprint_available", lambda: True)
+
+
+@pytest.mark.parametrize("requested", backends.BACKENDS)
+def test_explicit_backend_is_kept(requested):
+    assert choose_backend(requested, (10**9,), warm=True) == (requested, "requested")
+
+
+def test_one_small_document_takes_weasyprint():
+    assert choose_backend(AUTO, SMALL)[0] == "weasyprint"
+
+
+@pytest.mark.parametrize(
+    ("input_sizes", "render_options", "warm", "reason"),
+    [
+        (SMALL, DEFAULT_RENDER_OPTIONS, True, "warm browser"),
+        ((1024, 1024), DEFAULT_RENDER_OPTIONS, False, "warm browser"),
+        ((), DEFAULT_RENDER_OPTIONS, False, "warm browser"),
+        (SMALL, options(formats=("pdf", "png")), False, "PNG"),
+        (SMALL, options(fit_pages=2), False, "--fit-pages"),
+        (SMALL, options(shards=2), False, "--shards"),
+        ((AUTO_WEASYPRINT_MAX_BYTES + 1,), DEFAULT_RENDER_OPTIONS, False, "large documents"),
+    ],
+    ids=["warm", "batch", "no input", "png", "fit pages", "shards", "large"],
+)
+def test_auto_takes_chromium(input_sizes, render_options, warm, reason):
+    backend, why = choose_backend(AUTO, input_sizes, render_options, warm)
+    assert backend == "playwright"
+    assert reason in why
+
+
+def test_auto_takes_chromium_without_weasyprint(monkeypatch):
+    monkeypatch.setattr(backends, "weasyprint_available", lambda: False)
+    assert choose_backend(AUTO, SMALL) == ("playwright", "WeasyPrint is not installed")
+
+
+def test_largest_weasyprint_document_is_inclusive():
+    assert choose_backend(AUTO, (AUTO_WEASYPRINT_MAX_BYTES,))[0] == "weasyprint"
@@ -0,0 +1,106 @@
+import asyncio
+import contextlib
+
+import pytest
+
+from browser_pool import BrowserPool, playwright_api
+
+
+class FakeBrowser:
+    """Stands in for Chromium; a crashing render disconnects it."""
+
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.closed = True
+
+
+class StubPool(BrowserPool):
+    """A pool whose page() lends a plain object and whose launches are fake."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._browser = FakeBrowser()
+        self.launched = [self._browser]
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        await asyncio.sleep(0)
+        yield self._browser
+
+    async def _launch(self):
+        self._browser = FakeBrowser()
+        self.launched.append(self._browser)
+        self._generation += 1
+
+
+def failing(*errors, result="pdf"):
+    """A render raising each of errors in turn, then returning result."""
+    remaining = list(errors)
+    calls = []
+
+    async def render(browser):
+        calls.append(browser)
+        if remaining:
+            error = remaining.pop(0)
+            if error == "crash":
+                browser.connected = False
+                error = playwright_api().Error("Target closed")
+            raise error
+        return result
+
+    return render, calls
+
+
+def test_playwright_error_is_retried_on_the_same_browser():
+    pool = StubPool()
+    render, calls = failing(playwright_api().Error("Navigation failed"))
+    assert asyncio.run(pool.run(render)) == "pdf"
+    assert len(calls) == 2
+    assert (pool.stats.retries, pool.stats.relaunches) == (1, 0)
+    assert len(pool.launched) == 1
+
+
+def test_dead_browser_is_relaunched_before_the_retry():
+    pool = StubPool()
+    render, calls = failing("crash")
+    assert asyncio.run(pool.run(render)) == "pdf"
+    first, replacement = pool.launched
+    assert first.closed and not replacement.closed
+    assert calls == [first, replacement]
+    assert (pool.stats.retries, pool.stats.relaunches) == (1, 1)
+
+
+def test_concurrent_crashes_relaunch_once():
+    pool = StubPool()
+    renders = [failing("crash")[0] for _ in range(3)]
+
+    async def run():
+        return await asyncio.gather(*(pool.run(render) for render in renders))
+
+    assert asyncio.run(run()) == ["pdf"] * 3
+    assert len(pool.launched) == 2
+    assert (pool.stats.retries, pool.stats.relaunches) == (3, 1)
+
+
+def test_retries_give_up_after_max_retries():
+    pool = StubPool(max_retries=2)
+    render, calls = failing("crash", "crash", "crash")
+    with pytest.raises(playwright_api().Error, match="Target closed"):
+        asyncio.run(pool.run(render))
+    assert len(calls) == 3
+    assert (pool.stats.retries, pool.stats.relaunches) == (2, 2)
+
+
+def test_other_errors_are_not_retried():
+    pool = StubPool()
+    render, calls = failing(ValueError("bad markdown"))
+    with pytest.raises(ValueError):
+        asyncio.run(pool.run(render))
+    assert len(calls) == 1
+    assert pool.stats.retries == 0
@@ -0,0 +1,76 @@
+import resume_pdf
+from browser_pool import PoolStats
+
+RESUME = "# Jane Doe\n\n## Experience\n\n### Acme\n\n- Led the platform team\n"
+
+
+class FakeBackend:
+    """Stands in for the browser: writes a stand-in PDF and counts the prints."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.stats = PoolStats()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        pass
+
+    async def print_pdf(self, html_output, output_path=None, paper=None):
+        self.stats.renders += 1
+        pdf = b"%PDF-1.4\n%%EOF\n"
+        if output_path is not None:
+            with open(output_path, "wb") as file:
+                file.write(pdf)
+        return pdf
+
+
+def run_cli(monkeypatch, capsys, *args):
+    """Run resume-pdf with args; return the exit status, what it printed and the prints."""
+    backend = FakeBackend()
+    monkeypatch.setattr(resume_pdf, "open_backend", lambda options, *_, **__: backend)
+    status = resume_pdf.main(list(args))
+    return status, capsys.readouterr().out, backend.stats.renders
+
+
+def test_single_file_hit_miss_and_force(tmp_path, monkeypatch, capsys):
+    source = tmp_path / "resume.md"
+    source.write_text(RESUME)
+    output = tmp_path / "resume.pdf"
+    cli = ("--cache-dir", str(tmp_path / "cache"), str(source), "-o", str(output))
+
+    status, out, renders = run_cli(monkeypatch, capsys, *cli)
+    assert (status, renders) == (0, 1)
+    assert f"PDF generated: {output} (" in out and "cache miss)" in out
+
+    status, out, renders = run_cli(monkeypatch, capsys, *cli)
+    assert (status, renders) == (0, 0)
+    assert out == f"PDF up to date: {output} (cache hit)\n"
+
+    # --force skips the lookup, so there is no hit or miss to report
+    status, out, renders = run_cli(monkeypatch, capsys, *cli, "--force")
+    assert (status, renders) == (0, 1)
+    assert f"PDF generated: {output} (" in out and "cache" not in out
+
+
+def test_batch_reports_each_file(tmp_path, monkeypatch, capsys):
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.md").write_text(RESUME.replace("Jane", name))
+    out_dir = tmp_path / "out"
+    cli = ("--cache-dir", str(tmp_path / "cache"), "--output-dir", str(out_dir))
+
+    status, out, renders = run_cli(monkeypatch, capsys, *cli, str(tmp_path / "a.md"))
+    assert (status, renders) == (0, 1)
+
+    status, out, renders = run_cli(
+        monkeypatch, capsys, *cli, str(tmp_path / "a.md"), str(tmp_path / "b.md")
+    )
+    assert (status, renders) == (0, 1)
+    assert f"PDF up to date: {out_dir / 'a.pdf'} (cache hit)" in out
+    assert f"PDF generated: {out_dir / 'b.pdf'} (" in out
+    assert "Cache: 1 hit(s), 1 render(s)" in out
@@ -0,0 +1,76 @@
+import pytest
+
+import pipeline
+from exports import artifact_paths, resume_text
+
+RESUME = """# 🚀 Jane Doe
+
+**Staff Engineer**
+
+📧 [jane@example.com](mailto:jane@example.com) | 🐙 [GitHub](https://github.com/jane)
+
+## 💻 Skills
+
+### Programming Languages
+
+[Python](https://python.org) | Go | Rust
+
+## 💼 Experience
+
+### [Acme](https://acme.example)
+
+#### Staff Engineer
+
+_(2020 - Present)_
+
+- Led the **platform** team 🎉
+- **Technologies:** Python, Go
+"""
+
+
+def test_artifact_paths_sit_beside_the_pdf():
+    formats = ("pdf", "pdf-a4", "html", "txt", "json", "png")
+    assert artifact_paths("out/resume.pdf", formats, (400, 1200)) == {
+        "pdf": "out/resume.pdf",
+        "pdf-a4": "out/resume-a4.pdf",
+        "html": "out/resume.html",
+        "txt": "out/resume.txt",
+        "json": "out/resume.json",
+        "png-400": "out/resume-400w.png",
+        "png-1200": "out/resume-1200w.png",
+    }
+
+
+def test_artifact_paths_follow_the_requested_formats():
+    assert list(artifact_paths("resume.pdf", ("txt", "pdf"), (400,))) == ["txt", "pdf"]
+
+
+def test_unknown_format_is_refused():
+    with pytest.raises(ValueError, match="'docx'"):
+        artifact_paths("resume.pdf", ("pdf", "docx"), ())
+
+
+def test_resume_text_is_plain():
+    assert resume_text(pipeline.build_resume_html(RESUME)) == (
+        "JANE DOE\n"
+        "Staff Engineer\n"
+        "jane@example.com | GitHub (https://github.com/jane)\n"
+        "\n"
+        "SKILLS\n"
+        "======\n"
+        "\n"
+        "Programming Languages\n"
+        "Python, Go, Rust\n"
+        "\n"
+        "EXPERIENCE\n"
+        "==========\n"
+        "\n"
+        "Acme\n"
+        "Staff Engineer | 2020 - Present\n"
+        "- Led the platform team\n"
+        "- Technologies: Python, Go\n"
+    )
+
+
+def test_resume_text_of_an_empty_page():
+    assert resume_text("") == "\n"
@@ -0,0 +1,30 @@
+import sys
+
+import pytest
+
+import fit_pages
+from fit_pages import inches, pdf_page_count, printable_px
+
+
+def test_printable_area_inside_the_half_inch_margins():
+    assert printable_px("Letter") == (720, 960)
+    assert printable_px("A4") == (698, 1027)
+
+
+def test_printable_area_follows_the_margins(monkeypatch):
+    margin = {"top": "1in", "bottom": "0.25in", "left": "0.75in", "right": "0in"}
+    monkeypatch.setitem(fit_pages.PDF_OPTIONS, "margin", margin)
+    assert printable_px("Letter") == (744, 936)
+
+
+def test_margins_must_be_in_inches():
+    assert inches("0.5in") == 0.5
+    with pytest.raises(ValueError, match="12mm"):
+        inches("12mm")
+
+
+def test_page_count_without_pikepdf(monkeypatch):
+    # A None entry makes the import fail
+    monkeypatch.setitem(sys.modules, "pikepdf", None)
+    pdf = b"<< /Type /Pages /Count 2 >> << /Type /Page >> << /Type/Page >>"
+    assert pdf_page_count(pdf) == 2
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import re
+
+import pytest
+
+import pipeline
+from hermetic import FONT_URL, FONTS_CSS_FILE, FONTS_DIR, FontBundle, font_bundle, font_file_name
+
+# Every Google Fonts URL the template pulls in
+TEMPLATE_FONT_URLS = re.findall(
+    r"https://fonts\.googleapis\.com/[^'\")]+", pipeline.HTML_TEMPLATE_SOURCE
+)
+
+FONT_FILE = "https://fonts.gstatic.com/s/inter/v13/inter-latin-400.woff2"
+CSS = f"@font-face {{ font-family: 'Inter'; src: url({FONT_FILE}) format('woff2'); }}\n"
+
+
+class FakeRoute:
+    """Records how a request was answered."""
+
+    def __init__(self, url):
+        self.request = type("Request", (), {"url": url})()
+        self.answer = None
+
+    async def continue_(self):
+        self.answer = "continued"
+
+    async def abort(self, reason):
+        self.answer = reason
+
+    async def fulfill(self, status, body, headers):
+        self.answer = (status, body, headers["Content-Type"])
+
+
+def write_bundle(fonts_dir):
+    (fonts_dir / FONTS_CSS_FILE).write_text(CSS)
+    (fonts_dir / font_file_name(FONT_FILE)).write_bytes(b"wOF2")
+    return FontBundle(str(fonts_dir))
+
+
+@pytest.mark.skipif(
+    not os.path.isfile(os.path.join(FONTS_DIR, FONTS_CSS_FILE)),
+    reason="font bundle not in this checkout",
+)
+def test_committed_bundle_answers_the_template_fonts():
+    bundle = font_bundle()
+    assert TEMPLATE_FONT_URLS
+    font_urls = FONT_URL.findall(bundle.css.decode("utf-8"))
+    assert font_urls
+    for url in [*TEMPLATE_FONT_URLS, *font_urls]:
+        assert bundle.lookup(url) is not None, url
+
+
+def test_bundle_serves_fonts_and_blocks_the_rest(tmp_path):
+    bundle = write_bundle(tmp_path)
+    routes = [
+        FakeRoute(url)
+        for url in (*TEMPLATE_FONT_URLS, FONT_FILE, "https://example.com/x.png", "data:,x")
+    ]
+    for route in routes:
+        asyncio.run(bundle.handle(route))
+    answers = [route.answer for route in routes]
+    assert answers[: len(TEMPLATE_FONT_URLS)] == [
+        (200, CSS.encode(), "text/css; charset=utf-8")
+    ] * len(TEMPLATE_FONT_URLS)
+    assert answers[len(TEMPLATE_FONT_URLS) :] == [
+        (200, b"wOF2", "font/woff2"),
+        "blockedbyclient",
+        "continued",
+    ]
+    assert (bundle.served, bundle.blocked) == (len(TEMPLATE_FONT_URLS) + 1, 1)
+
+
+def test_inline_css_embeds_the_font_files(tmp_path):
+    assert write_bundle(tmp_path).inline_css() == CSS.replace(
+        FONT_FILE, "data:font/woff2;base64,d09GMg=="
+    )
+
+
+def test_license_texts_stay_out_of_the_digest(tmp_path):
+    bundle = write_bundle(tmp_path)
+    digest = bundle.digest
+    (tmp_path / "OFL-Inter.txt").write_text("Copyright")
+    assert FontBundle(str(tmp_path)).digest == digest
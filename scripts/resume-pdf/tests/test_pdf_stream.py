@@ -0,0 +1,47 @@
+import pytest
+
+from fit_pages import PAPER_INCHES
+from pdf_stream import print_to_pdf_params
+from pipeline import PDF_OPTIONS
+
+# What Playwright's Chromium backend sends for Page.printToPDF given page.pdf(**PDF_OPTIONS)
+PLAYWRIGHT_KEYS = {
+    "transferMode",
+    "landscape",
+    "displayHeaderFooter",
+    "headerTemplate",
+    "footerTemplate",
+    "printBackground",
+    "scale",
+    "paperWidth",
+    "paperHeight",
+    "marginTop",
+    "marginBottom",
+    "marginLeft",
+    "marginRight",
+    "pageRanges",
+    "preferCSSPageSize",
+    "generateTaggedPDF",
+    "generateDocumentOutline",
+}
+
+
+def test_params_cover_every_key_playwright_sends():
+    assert set(print_to_pdf_params(PDF_OPTIONS["format"])) == PLAYWRIGHT_KEYS
+
+
+@pytest.mark.parametrize("paper", sorted(PAPER_INCHES))
+def test_params_follow_pdf_options(paper):
+    params = print_to_pdf_params(paper)
+    assert (params["paperWidth"], params["paperHeight"]) == PAPER_INCHES[paper]
+    for side in ("top", "bottom", "left", "right"):
+        assert params[f"margin{side.title()}"] == float(PDF_OPTIONS["margin"][side][:-2])
+    assert params["printBackground"] is PDF_OPTIONS["print_background"]
+    assert params["transferMode"] == "ReturnAsStream"
+
+
+def test_tagging_and_outline_stay_off_as_in_page_pdf():
+    params = print_to_pdf_params(PDF_OPTIONS["format"])
+    assert params["generateTaggedPDF"] is False
+    assert params["generateDocumentOutline"] is False
+    assert params["scale"] == 1 and params["pageRanges"] == ""
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+import pipeline
+
+RESUME = "# {name}\n\n## Experience\n\n### Acme\n\n- Led the platform team\n"
+
+
+class FakeBackend:
+    """Writes a stand-in PDF; documents naming ``held`` wait for ``release``."""
+
+    def __init__(self, held=None):
+        self.held = held
+        self.release = asyncio.Event()
+        self.printed = []
+
+    async def close(self):
+        pass
+
+    async def print_pdf(self, html_output, output_path=None, paper=None):
+        if self.held is not None and self.held in html_output:
+            await self.release.wait()
+        if "Broken" in html_output:
+            raise RuntimeError("page crashed")
+        self.printed.append(output_path)
+        pdf = b"%PDF-1.4\n%%EOF\n"
+        if output_path is not None:
+            with open(output_path, "wb") as file:
+                file.write(pdf)
+        return pdf
+
+
+def write_resumes(directory, *names):
+    directory.mkdir(exist_ok=True)
+    paths = []
+    for name in names:
+        path = directory / f"{name.lower()}.md"
+        path.write_text(RESUME.format(name=name))
+        paths.append(str(path))
+    return paths
+
+
+async def collect(results):
+    return [result async for result in results]
+
+
+def test_duplicate_output_paths_are_refused(tmp_path):
+    paths = [*write_resumes(tmp_path / "a", "Jane"), *write_resumes(tmp_path / "b", "Jane")]
+    backend = FakeBackend()
+    results = pipeline.render_many(paths, output_dir=str(tmp_path / "out"), backend=backend)
+    with pytest.raises(ValueError, match="both map to"):
+        asyncio.run(collect(results))
+    assert not backend.printed
+
+
+def test_results_stream_as_each_file_finishes(tmp_path):
+    slow, fast = write_resumes(tmp_path, "Slow", "Fast")
+
+    async def run():
+        backend = FakeBackend(held="Slow")
+        finished = []
+        results = pipeline.render_many(
+            [slow, fast], output_dir=str(tmp_path), concurrency=2, backend=backend
+        )
+        async for result in results:
+            finished.append(result.input_path)
+            # The slow file only finishes once the fast one has been reported
+            backend.release.set()
+        return finished
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=10)) == [fast, slow]
+
+
+def test_a_failing_file_does_not_abort_the_batch(tmp_path):
+    paths = write_resumes(tmp_path, "Broken", "Jane")
+    backend = FakeBackend()
+    results = pipeline.render_many(paths, output_dir=str(tmp_path), backend=backend)
+    results = asyncio.run(collect(results))
+    errors = {result.input_path: result.error for result in results}
+    assert errors == {paths[0]: "page crashed", paths[1]: None}
+    assert backend.printed == [str(tmp_path / "jane.pdf")]
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import profiling
+from profiling import Profiler, profile_lane, profile_stage, profiled
+
+
+def test_stages_are_free_without_a_profiler():
+    def function():
+        return 1
+
+    assert profile_stage("x") is profile_lane("y")
+    assert profiled(function) is function
+
+
+def test_trace_has_one_complete_event_per_call(tmp_path):
+    async def render(name):
+        with profile_lane(name), profile_stage("print", paper="letter"):
+            await asyncio.sleep(0)
+
+    async def batch():
+        await asyncio.gather(render("a.md"), render("b.md"))
+
+    with Profiler(trace_memory=False) as profiler:
+        with profile_stage("markdown"):
+            pass
+        asyncio.run(batch())
+    path = tmp_path / "trace.json"
+    profiler.write_trace(str(path))
+    trace = json.loads(path.read_text())
+
+    assert trace["displayTimeUnit"] == "ms"
+    metadata = [event for event in trace["traceEvents"] if event["ph"] == "M"]
+    assert {event["tid"]: event["args"]["name"] for event in metadata} == {
+        0: "main",
+        1: "a.md",
+        2: "b.md",
+    }
+    stages = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert [(event["name"], event["tid"]) for event in stages] == [
+        ("markdown", 0),
+        ("print", 1),
+        ("print", 2),
+    ]
+    for event in stages:
+        assert event["cat"] == "stage" and event["pid"] == 1
+        assert event["ts"] >= 0 and event["dur"] >= 0
+        assert set(event["args"]) >= {"cpu_ms", "peak_kb"}
+    assert stages[1]["args"]["paper"] == "letter"
+
+
+def test_summary_is_slowest_first_with_calls_and_files():
+    with Profiler(trace_memory=False) as profiler:
+        for name in ("a.md", "b.md"):
+            with profile_lane(name), profile_stage("print"):
+                pass
+        with profile_stage("markdown"):
+            pass
+    profiler.stats["print"].wall = 2.0
+    profiler.stats["markdown"].wall = 0.5
+
+    header, *rows = profiler.summary().splitlines()
+    assert header.split() == [
+        "stage",
+        "calls",
+        "files",
+        "wall",
+        "ms",
+        "mean",
+        "ms",
+        "cpu",
+        "ms",
+        "peak",
+        "KB",
+    ]
+    assert [row.split()[:5] for row in rows] == [
+        ["print", "2", "2", "2000.0", "1000.00"],
+        ["markdown", "1", "1", "500.0", "500.00"],
+    ]
+
+
+def test_peak_memory_covers_nested_stages():
+    with Profiler() as profiler, profile_stage("outer"):
+        with profile_stage("inner"):
+            block = bytearray(1 << 20)
+        del block
+    assert profiler.stats["inner"].peak >= 1 << 20
+    assert profiler.stats["outer"].peak >= profiler.stats["inner"].peak
+    assert profiling._active is None
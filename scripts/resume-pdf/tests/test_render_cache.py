@@ -0,0 +1,125 @@
+import os
+
+import pipeline
+from render_cache import RenderCache, cache_key
+
+RESUME = """# Jane Doe
+
+jane@example.com | +1 555 0100
+
+## 💼 Experience
+
+### Acme Corp
+
+#### Staff Engineer | 2020 - Present
+
+- Led the platform team
+- **Tech:** Python, Go
+"""
+
+
+def render(cache_dir):
+    """Build the HTML through a fresh cache in cache_dir; return it and the stage hits."""
+    cache = RenderCache(str(cache_dir))
+    return pipeline.build_resume_html(RESUME, cache), cache.stage_hits
+
+
+def test_miss_then_hit(tmp_path):
+    cold, hits = render(tmp_path)
+    assert not hits
+    assert cold == pipeline.build_resume_html(RESUME)
+
+    warm, hits = render(tmp_path)
+    assert warm == cold
+    # The templated HTML is reused, so no earlier stage is even looked up
+    assert hits == {"html": 1}
+
+
+def test_changed_input_misses(tmp_path):
+    render(tmp_path)
+    cache = RenderCache(str(tmp_path))
+    pipeline.build_resume_html(RESUME.replace("Acme", "Initech"), cache)
+    assert not cache.stage_hits
+
+
+def test_template_change_reruns_only_the_template(tmp_path, monkeypatch):
+    render(tmp_path)
+    pipeline.stage_fingerprints.cache_clear()
+    monkeypatch.setattr(pipeline, "HTML_TEMPLATE_SOURCE", pipeline.HTML_TEMPLATE_SOURCE + " ")
+    try:
+        _, hits = render(tmp_path)
+    finally:
+        pipeline.stage_fingerprints.cache_clear()
+    # The title comes from the model, cached alongside the body
+    assert hits == {"body": 1, "model": 1}
+
+
+def test_code_change_invalidates_its_stage_and_later(tmp_path, monkeypatch):
+    render(tmp_path)
+    original = pipeline.preprocess_markdown
+
+    def preprocess_markdown(md_content):
+        return original(md_content)
+
+    pipeline.stage_fingerprints.cache_clear()
+    monkeypatch.setattr(pipeline, "preprocess_markdown", preprocess_markdown)
+    try:
+        html_output, hits = render(tmp_path)
+    finally:
+        pipeline.stage_fingerprints.cache_clear()
+    assert not hits
+    assert html_output == pipeline.build_resume_html(RESUME)
+
+
+def test_code_digest_follows_the_source(tmp_path, monkeypatch):
+    module = tmp_path / "digested.py"
+    module.write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    before = pipeline.code_digest("digested")
+    module.write_text("VALUE = 2\n")
+    assert pipeline.code_digest("digested") != before
+
+
+def test_output_hit_miss_and_edit(tmp_path):
+    output = tmp_path / "resume.pdf"
+    output.write_bytes(b"%PDF-1.7")
+    cache = RenderCache(str(tmp_path / "cache"))
+    assert not cache.is_fresh(output, "key")
+
+    cache.record(output, "key")
+    cache.save()
+    cache = RenderCache(str(tmp_path / "cache"))
+    assert cache.is_fresh(output, "key")
+    assert not cache.is_fresh(output, "other key")
+
+    # Edited by hand since it was rendered
+    output.write_bytes(b"%PDF-1.7 edited")
+    assert not cache.is_fresh(output, "key")
+
+
+def stage_blobs(cache):
+    return sorted(
+        name for _, _, names in os.walk(cache.stages_dir) for name in names if len(name) == 64
+    )
+
+
+def test_least_recently_used_stages_are_pruned(tmp_path):
+    cache = RenderCache(str(tmp_path), max_stage_bytes=250)
+    keys = [cache_key(str(number)) for number in range(3)]
+    for age, key in enumerate(keys):
+        cache.store_stage("body", key, "x" * 100)
+        # Oldest first, with mtimes a filesystem clock can tell apart
+        os.utime(cache._stage_path("body", key), ns=(age * 10**9, age * 10**9))
+    # Reading the oldest makes it the most recently used
+    assert cache.load_stage("body", keys[0]) == "x" * 100
+    cache.save()
+    assert stage_blobs(cache) == sorted([keys[0], keys[2]])
+
+
+def test_stages_under_the_cap_are_kept(tmp_path):
+    render(tmp_path)
+    cache = RenderCache(str(tmp_path))
+    assert len(stage_blobs(cache)) == 4
+    pipeline.build_resume_html(RESUME.replace("Acme", "Initech"), cache)
+    cache.save()
+    assert len(stage_blobs(cache)) == 8
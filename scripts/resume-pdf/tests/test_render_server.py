@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from render_server import RenderServer
+
+
+class FakeBackend:
+    """Prints a stand-in PDF, counting the calls."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def print_pdf(self, html_output, output_path=None, paper=None):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return b"%PDF-" + str(self.calls).encode()
+
+
+async def exchange(request, backend=None):
+    """Send raw requests to a RenderServer; return the response once it closes the connection."""
+    server = RenderServer(backend or FakeBackend())
+    listener = await asyncio.start_server(server.serve_connection, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return response
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        b"",
+        b"Content-Length: abc\r\n",
+        b"Content-Length: -5\r\n",
+        b"Content-Length: 1.5\r\n",
+    ],
+    ids=["missing", "malformed", "negative", "fractional"],
+)
+def test_bad_content_length_is_a_400(headers):
+    request = b"POST /render HTTP/1.1\r\nHost: localhost\r\n" + headers + b"\r\n# Jane"
+    response = asyncio.run(exchange(request))
+    assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert b"Connection: close" in response
+
+
+def test_get_needs_no_content_length():
+    request = b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n"
+    response = asyncio.run(exchange(request))
+    assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert response.endswith(b"\r\n\r\nok")
+
+
+class GatedBackend(FakeBackend):
+    """Holds every print until release is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def print_pdf(self, html_output, output_path=None, paper=None):
+        await self.release.wait()
+        return await super().print_pdf(html_output, output_path, paper)
+
+
+def test_identical_renders_share_one_print():
+    async def run():
+        backend = GatedBackend()
+        server = RenderServer(backend)
+        renders = [asyncio.create_task(server.render(md)) for md in ("# Jane", "# Jane", "# Joe")]
+        await asyncio.sleep(0)
+        backend.release.set()
+        pdfs = await asyncio.gather(*renders)
+        # Finished renders leave the in-flight table, so the next one prints again
+        again = await server.render("# Jane")
+        return backend.calls, server.coalesced, pdfs, again
+
+    calls, coalesced, pdfs, again = asyncio.run(run())
+    assert (calls, coalesced) == (3, 1)
+    assert pdfs[0] is pdfs[1]
+    assert again == b"%PDF-3"
+
+
+def test_a_cancelled_waiter_leaves_the_shared_render_running():
+    async def run():
+        backend = GatedBackend()
+        server = RenderServer(backend)
+        first = asyncio.create_task(server.render("# Jane"))
+        second = asyncio.create_task(server.render("# Jane"))
+        await asyncio.sleep(0)
+        first.cancel()
+        backend.release.set()
+        return await second, backend.calls
+
+    assert asyncio.run(run()) == (b"%PDF-1", 1)
@@ -0,0 +1,71 @@
+import pytest
+
+from reproducible import DOCUMENT_ID, pdf_date, pin_metadata, source_date, source_date_epoch
+
+EPOCH = 1_700_000_000
+
+
+def chromium_pdf(date=b"D:20240102030405+01'00'", modified=b"D:20240102030405Z", pdf_id=b"AB" * 16):
+    """A PDF shaped like Chromium's where metadata is concerned."""
+    return b"".join(
+        [
+            b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\n",
+            b"2 0 obj\n<< /Producer (Skia/PDF) /CreationDate (" + date + b")",
+            b" /ModDate (" + modified + b") >>\nendobj\n",
+            b"xref\n0 3\ntrailer\n<< /Size 3 /Root 1 0 R /Info 2 0 R",
+            b" /ID [<" + pdf_id + b"> <" + pdf_id + b">] >>\nstartxref\n9\n%%EOF\n",
+        ]
+    )
+
+
+def test_pinning_keeps_the_length_and_offsets():
+    pdf = chromium_pdf()
+    pinned = pin_metadata(pdf, EPOCH)
+    assert len(pinned) == len(pdf)
+    for marker in (b"2 0 obj", b"xref", b"trailer", b"startxref"):
+        assert pinned.index(marker) == pdf.index(marker)
+
+
+def test_dates_are_pinned_to_the_epoch():
+    pinned = pin_metadata(chromium_pdf(), EPOCH)
+    assert b"/CreationDate (" + pdf_date(EPOCH).encode() + b")" in pinned
+    # Too short for the full form: the UTC shorthand, padded to length
+    assert b"/ModDate (D:20231114221320Z)" in pinned
+
+
+def test_same_content_pins_to_the_same_bytes():
+    first = pin_metadata(chromium_pdf(), EPOCH)
+    second = pin_metadata(
+        chromium_pdf(
+            date=b"D:20250607080910+02'00'", modified=b"D:20250607080910Z", pdf_id=b"CD" * 16
+        ),
+        EPOCH,
+    )
+    assert first == second
+    assert b"AB" * 16 not in first
+
+
+def test_document_id_follows_the_content():
+    other = chromium_pdf().replace(b"Skia/PDF", b"Skia/PDX")
+    first = DOCUMENT_ID.search(pin_metadata(chromium_pdf(), EPOCH))
+    second = DOCUMENT_ID.search(pin_metadata(other, EPOCH))
+    assert first.group(2) != second.group(2)
+    assert first.group(2) == first.group(4)
+
+
+def test_pinning_is_idempotent():
+    pinned = pin_metadata(chromium_pdf(), EPOCH)
+    assert pin_metadata(pinned, EPOCH) == pinned
+
+
+def test_source_date_prefers_the_environment():
+    md_content = "---\ndate: 2024-01-02\n---\n# Post"
+    assert source_date(md_content, {}) == 1_704_153_600
+    assert source_date(md_content, {"SOURCE_DATE_EPOCH": "42"}) == 42
+    assert source_date("# Post", {}) == 0
+
+
+@pytest.mark.parametrize("value", ["abc", "-1", "1.5", " 42", "４２"])
+def test_malformed_source_date_epoch_is_rejected(value):
+    with pytest.raises(ValueError, match="SOURCE_DATE_EPOCH"):
+        source_date_epoch({"SOURCE_DATE_EPOCH": value})
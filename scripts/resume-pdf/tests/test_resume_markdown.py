@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import markdown
+import pytest
+
+import pipeline
+from resume_markdown import ResumeExtension
+from synthetic_resume import synthetic_resume
+
+RESUME_PATH = Path(__file__).resolve().parents[3] / "content" / "resume" / "resume.md"
+
+SYNTHETIC = {
+    f"synthetic-{roles}-{seed}": synthetic_resume(roles=roles, seed=seed)
+    for roles in (1, 5, 50, 300)
+    for seed in range(3)
+}
+SYNTHETIC["synthetic-plain"] = synthetic_resume(roles=20, emoji=False, link_rate=0)
+
+# Corners of the transforms the sample resumes do not reach; some of them
+# are left to BeautifulSoup
+EDGE_CASES = {
+    "line breaks": "# A **b**\n\nline1  \nline2 *x*  \n[l](u)\n\ntext",
+    "entities": "# x\n\n# y\n\n**a**\n\nAT&T > 3 < 4 \"q\" 'a'\n\n#### R\n\n_(2020)_",
+    "role attributes": "#### R2 {#id .c .d}\n\n_(x)_ tail\n\n#### R3\n\nno em\n\n_(late)_",
+    "skills": (
+        "a\n\nb\n\n### Programming Languages\n\n"
+        '**Cat**: a | [b](u "t\'\\"") | c:\n\n*em* | x\n\n## Other\n\n'
+        "### Technical Expertise {: .k title='a\"b' }\n\nx|y"
+    ),
+    "experience": (
+        "a\n\nb\n\n## X {: #experience}\n\npre\n\n### E {.k}\n\n#### R\n\n_(d)_\n\n"
+        "- **T:** x\n- a **b**\n- [**x**](u) y\n- q\n\n    - **n** nested\n\n"
+        "## Edu\n\n### S\n\np\n\n- x"
+    ),
+    "linked name": "# [Name](u)\n\n#### [**Lead**](x)\n\n_(**2020**)_\n\n#### A\n\n*2021*",
+}
+
+
+def soup_path(md_content):
+    """The body as the BeautifulSoup transforms build it."""
+    return pipeline.transform_html(
+        markdown.markdown(md_content, extensions=pipeline.MARKDOWN_EXTENSIONS)
+    )
+
+
+def tree_path(md_content):
+    """The body from the in-tree transforms, and whether they handled it."""
+    extension = ResumeExtension(skills_titles=pipeline.SKILLS_SECTION_TITLES)
+    body = markdown.Markdown(extensions=[*pipeline.MARKDOWN_EXTENSIONS, extension]).convert(
+        md_content
+    )
+    return body, extension.applied
+
+
+@pytest.mark.parametrize(
+    "md_content",
+    [RESUME_PATH.read_text(encoding="utf-8"), *SYNTHETIC.values()],
+    ids=["resume.md", *SYNTHETIC],
+)
+def test_in_tree_transforms_match_beautifulsoup(md_content):
+    md_content = pipeline.preprocess_markdown(md_content)
+    body, applied = tree_path(md_content)
+    assert applied
+    assert body == soup_path(md_content)
+
+
+@pytest.mark.parametrize("md_content", EDGE_CASES.values(), ids=EDGE_CASES)
+def test_edge_cases_match_beautifulsoup(md_content):
+    md_content = pipeline.preprocess_markdown(md_content)
+    assert pipeline.markdown_to_body(md_content) == soup_path(md_content)
+
+
+def test_raw_html_falls_back_to_beautifulsoup():
+    md_content = "# Name\n\n<div>raw</div>\n\n&copy; x"
+    _, applied = tree_path(md_content)
+    assert not applied
+    assert pipeline.markdown_to_body(md_content) == soup_path(md_content)
@@ -0,0 +1,82 @@
+import hashlib
+import html
+from pathlib import Path
+
+import pipeline
+from render_cache import RenderCache
+from resume_model import LIST_SECTIONS, Resume, page_data, parse_resume
+
+RESUME_PATH = Path(__file__).resolve().parents[3] / "content" / "resume" / "resume.md"
+RESUME = RESUME_PATH.read_text(encoding="utf-8")
+
+
+def resume_model():
+    return parse_resume(pipeline.build_resume_body(RESUME))
+
+
+def test_parse_resume_reads_every_section():
+    resume = resume_model()
+    assert resume.name == "Stefanie Jane"
+    assert resume.tagline.startswith("Engineering Leader")
+    assert set(resume.contact()) == {"email", "linkedin", "github", "links", "website"}
+    assert resume.summary
+    assert "Programming Languages" in [category.name for category in resume.skills]
+    assert all(
+        category.skills for category in resume.skills if category.name != "Technical Expertise"
+    )
+    assert resume.employers
+    for employer in resume.employers:
+        assert employer.roles, employer.name
+        for role in employer.roles:
+            assert role.title and role.period, employer.name
+    assert any(role.technologies for employer in resume.employers for role in employer.roles)
+    assert resume.projects and all(project.name for project in resume.projects)
+
+
+def test_parse_resume_reads_the_templated_page_alike():
+    assert parse_resume(pipeline.build_resume_html(RESUME)) == resume_model()
+
+
+def test_model_round_trips_through_json():
+    resume = resume_model()
+    assert Resume.from_json(resume.to_json()) == resume
+
+
+def test_title_drops_emoji():
+    resume = parse_resume(pipeline.build_resume_body("# 🚀 Jane  Doe ✨\n\n## Summary\n\nHi"))
+    assert resume.name == "🚀 Jane Doe ✨"
+    assert resume.title == "Jane Doe"
+
+
+def test_template_is_titled_from_the_model(tmp_path):
+    title = f"<title>{html.escape(resume_model().title)}</title>"
+    assert title in pipeline.build_resume_html(RESUME)
+    cache = RenderCache(str(tmp_path))
+    html_output, resume = pipeline.build_resume_page(RESUME, cache)
+    assert title in html_output
+    assert resume == resume_model()
+    # The export takes the model from the cache; it is not parsed again
+    assert pipeline.build_resume_model(RESUME, cache) == resume
+    assert cache.stage_hits == {"model": 1}
+
+
+def test_page_data_has_the_site_shape():
+    resume = resume_model()
+    data = page_data(resume, RESUME)
+    assert data["source"] == hashlib.sha256(RESUME.encode("utf-8")).hexdigest()
+    assert data["name"] == resume.name
+    assert data["contact"] == resume.contact()
+    assert data["summary"] == "\n\n".join(resume.summary)
+    assert all(section in data for section in LIST_SECTIONS)
+    experience = data["experience"]
+    assert len(experience) == sum(len(employer.roles) for employer in resume.employers)
+    first = resume.employers[0]
+    assert experience[0]["company"] == first.name
+    assert experience[0]["companyUrl"] == first.url
+    assert experience[0]["position"] == first.roles[0].title
+    assert [skill["name"] for skill in data["skills"]["Programming Languages"]] == [
+        skill.name
+        for category in resume.skills
+        if category.name == "Programming Languages"
+        for skill in category.skills
+    ]
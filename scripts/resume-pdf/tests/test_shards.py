@@ -0,0 +1,132 @@
+import re
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+import pipeline
+from shards import _partition, split_shards
+
+RESUME_PATH = Path(__file__).resolve().parents[3] / "content" / "resume" / "resume.md"
+
+HEAD = "<html><head><title>Posts</title></head><body>"
+TAIL = "</body></html>"
+BODY = (
+    "\n<h1>Posts</h1>"
+    '\n<h2 id="one">One</h2>'
+    '\n<p>See <a href="#three-x">three</a></p>'
+    "\n<h3>Sub</h3>"
+    f"\n<p>{'x' * 50}</p>"
+    "\n<h2>Two</h2>"
+    f"\n<p>{'y' * 50}</p>"
+    '\n<h2 id="three">Three</h2>'
+    '\n<h3 id="three-x">X</h3>'
+    f"\n<p>{'z' * 50}</p>\n"
+)
+HIDDEN = re.compile(
+    r'<a href="#[^"]*" style="display:none"></a>|<span id="[^"]*" style="display:none"></span>'
+)
+
+
+@pytest.mark.parametrize(
+    "sizes, count",
+    [
+        ([1, 1, 1, 1], 2),
+        ([10, 1, 1, 1], 2),
+        ([1, 1, 1, 10], 3),
+        ([3, 1, 4, 1, 5, 9, 2, 6], 4),
+        ([5], 1),
+    ],
+)
+def test_partition_covers_sizes_in_count_runs(sizes, count):
+    runs = _partition(sizes, count)
+    assert len(runs) == count
+    assert runs[0].start == 0 and runs[-1].stop == len(sizes)
+    for run, following in zip(runs, runs[1:], strict=False):
+        assert run.start < run.stop == following.start
+
+
+def test_partition_balances_totals():
+    assert _partition([1, 1, 1, 1], 2) == [slice(0, 2), slice(2, 4)]
+    assert _partition([10, 1, 1, 1], 2) == [slice(0, 1), slice(1, 4)]
+
+
+def test_shards_reassemble_the_body():
+    documents, _ = split_shards(HEAD + BODY + TAIL, 2)
+    assert len(documents) == 2
+    assert all(document.startswith(HEAD) and document.endswith(TAIL) for document in documents)
+    body = "".join(HIDDEN.sub("", document[len(HEAD) : -len(TAIL)]) for document in documents)
+    expected = BODY.replace("<h3>Sub", '<h3 id="shard-h3-2">Sub').replace(
+        "<h2>Two", '<h2 id="shard-h2-3">Two'
+    )
+    assert body == expected
+
+
+def test_shards_cut_at_h2_and_keep_the_preamble():
+    first, second = split_shards(HEAD + BODY + TAIL, 2)[0]
+    assert "<h1>Posts</h1>" in first
+    assert first.index("<h1>") < first.index('<h2 id="one">')
+    assert second.startswith(HEAD + '<h2 id="three">')
+
+
+def test_headings_make_the_outline():
+    _, headings = split_shards(HEAD + BODY + TAIL, 2)
+    assert headings == [
+        ("h2", "one", "One"),
+        ("h3", "shard-h3-2", "Sub"),
+        ("h2", "shard-h2-3", "Two"),
+        ("h2", "three", "Three"),
+        ("h3", "three-x", "X"),
+    ]
+
+
+def test_links_across_shards_get_destinations():
+    first, second = split_shards(HEAD + BODY + TAIL, 2)[0]
+    # The link's target is in the second shard: a placeholder stands in for it
+    assert '<span id="three-x" style="display:none"></span>' in first
+    # Each shard links to its own outline targets so Chromium names them
+    assert '<a href="#one" style="display:none"></a>' in first
+    assert '<a href="#three-x" style="display:none"></a>' in second
+    assert "<span" not in second
+
+
+def test_at_most_one_shard_per_section():
+    documents, _ = split_shards(HEAD + BODY + TAIL, 10)
+    assert len(documents) == 3
+
+
+def test_document_without_h2_is_one_shard():
+    html_output = HEAD + "<h1>Note</h1><p>text</p>" + TAIL
+    documents, headings = split_shards(html_output, 4)
+    assert documents == [html_output]
+    assert headings == []
+
+
+def heading_classes(html_output):
+    """(tag, text, classes) of every h2, h3 and p in html_output's body."""
+    soup = BeautifulSoup(html_output, "html.parser")
+    return [
+        (element.name, element.get_text(" ", strip=True), element.get("class", []))
+        for element in soup.body.find_all(["h2", "h3", "p"])
+    ]
+
+
+def test_shards_style_their_headings_as_the_whole_document():
+    html_output = pipeline.build_resume_html(RESUME_PATH.read_text(encoding="utf-8"))
+    documents, _ = split_shards(html_output, 4)
+    assert len(documents) == 4
+    whole = heading_classes(html_output)
+    # A later shard's first h2 and h3 keep the classes they have in one print
+    assert [entry for document in documents for entry in heading_classes(document)] == whole
+    first_h2 = [
+        next(classes for tag, _, classes in heading_classes(document) if tag == "h2")
+        for document in documents
+    ]
+    assert "first-section" in first_h2[0]
+    assert not any("first-section" in classes for classes in first_h2[1:])
+
+
+def test_stylesheet_does_not_depend_on_where_a_shard_starts():
+    css = re.search(r"<style[^>]*>(.*?)</style>", pipeline.HTML_TEMPLATE_SOURCE, re.S)[1]
+    assert ":first-of-type" not in css
+    assert not re.search(r"#summary\s*\+", css)
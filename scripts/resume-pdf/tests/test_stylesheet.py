@@ -0,0 +1,69 @@
+import re
+
+import pipeline
+from stylesheet import SHORTHANDS, Rule, compile_stylesheet, parse_stylesheet
+
+TEMPLATE_CSS = re.search(r"<style[^>]*>(.*?)</style>", pipeline.HTML_TEMPLATE_SOURCE, re.S)[1]
+
+
+def cascade(css):
+    """Each selector's winning declarations, as {selector: {property: (value, important)}}."""
+    resolved: dict[str, dict[str, tuple[str, bool]]] = {}
+    for item in parse_stylesheet(css):
+        if not isinstance(item, Rule):
+            continue
+        properties = resolved.setdefault(item.selector, {})
+        for declaration in item.declarations:
+            for name in (declaration.name, *SHORTHANDS.get(declaration.name, ())):
+                current = properties.get(name)
+                if current and current[1] and not declaration.important:
+                    continue
+                if name == declaration.name:
+                    properties[name] = (declaration.value, declaration.important)
+                else:
+                    properties.pop(name, None)
+    return resolved
+
+
+def at_rules(css):
+    return [item for item in parse_stylesheet(css) if not isinstance(item, Rule)]
+
+
+def test_template_css_keeps_its_cascade():
+    compiled = compile_stylesheet(TEMPLATE_CSS)
+    assert len(compiled) < len(TEMPLATE_CSS)
+    assert "/*" not in compiled
+    assert cascade(compiled) == cascade(TEMPLATE_CSS)
+    assert at_rules(compiled) == at_rules(TEMPLATE_CSS)
+
+
+def test_template_css_compiles_to_a_fixed_point():
+    compiled = compile_stylesheet(TEMPLATE_CSS)
+    assert compile_stylesheet(compiled) == compiled
+
+
+def test_template_is_rendered_with_the_compiled_css():
+    assert compile_stylesheet(TEMPLATE_CSS) in pipeline.compiled_template_source()
+
+
+def test_rules_for_one_selector_merge():
+    assert compile_stylesheet(".a { color: red } .a { margin: 0 }") == ".a{color:red;margin:0}"
+
+
+def test_overridden_declaration_is_dropped():
+    css = ".a { margin-top: 1px; color: red } .a { margin: 0; color: blue }"
+    assert compile_stylesheet(css) == ".a{margin:0;color:blue}"
+
+
+def test_same_specificity_rule_in_between_blocks_merge():
+    # .b could match the same elements, so moving color:red past it would
+    # let red win where blue does now
+    css = ".a { color: red } .b { color: blue } .a { margin: 0 }"
+    assert compile_stylesheet(css) == ".a{color:red}\n.b{color:blue}\n.a{margin:0}"
+
+
+def test_rule_in_between_that_cannot_compete_allows_merge():
+    # Higher specificity, an unrelated property, or a different element
+    for between in ("#b { color: blue }", ".b { margin: 1px }", "h2.b { color: blue }"):
+        css = f"p.a {{ color: red }} {between} p.a {{ margin: 0 }}"
+        assert "p.a{color:red;margin:0}" in compile_stylesheet(css).split("\n")
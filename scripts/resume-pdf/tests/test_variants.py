@@ -0,0 +1,116 @@
+import re
+
+from bs4 import BeautifulSoup
+
+import pipeline
+from render_cache import RenderCache
+from variants import fragment_nodes, select_variant
+
+BODY = """<h1>Jane</h1>
+<h2>Experience</h2>
+<h3>Acme</h3>
+<ul>
+<li tags="ai">Trained models</li>
+<li>Shipped</li>
+</ul>
+<h3 tags="backend">Initech</h3>
+<p>Built queues</p>
+<h3>Globex</h3>
+<ul>
+<li tags="backend">Sharded</li>
+</ul>
+<h2 tags="full">Side Projects</h2>
+<p>Tracing</p>
+"""
+
+
+def variant(include):
+    """BODY cut for include, with the whitespace between tags dropped."""
+    nodes = fragment_nodes(BeautifulSoup(BODY, "html.parser"))
+    html = select_variant(nodes, frozenset(include) if include is not None else None)
+    return re.sub(r">\s+<", "><", html).strip()
+
+
+def test_no_include_keeps_everything_without_tags():
+    assert (
+        variant(None)
+        == re.sub(r">\s+<", "><", BODY.replace(' tags="ai"', ""))
+        .replace(' tags="backend"', "")
+        .replace(' tags="full"', "")
+        .strip()
+    )
+
+
+def test_tagged_heading_takes_its_section():
+    assert variant({"backend"}) == (
+        "<h1>Jane</h1><h2>Experience</h2>"
+        "<h3>Acme</h3><ul><li>Shipped</li></ul>"
+        "<h3>Initech</h3><p>Built queues</p>"
+        "<h3>Globex</h3><ul><li>Sharded</li></ul>"
+    )
+
+
+def test_emptied_lists_and_headings_are_dropped():
+    # Globex's only role is cut, so its list and heading go too
+    assert variant({"ai", "full"}) == (
+        "<h1>Jane</h1><h2>Experience</h2>"
+        "<h3>Acme</h3><ul><li>Trained models</li><li>Shipped</li></ul>"
+        "<h2>Side Projects</h2><p>Tracing</p>"
+    )
+
+
+def test_untagged_content_is_always_kept():
+    assert variant(set()) == (
+        "<h1>Jane</h1><h2>Experience</h2><h3>Acme</h3><ul><li>Shipped</li></ul>"
+    )
+
+
+def test_parsed_body_is_left_unchanged():
+    soup = BeautifulSoup(BODY, "html.parser")
+    nodes = fragment_nodes(soup)
+    for include in (None, frozenset(), frozenset({"ai"}), frozenset({"backend", "full"})):
+        select_variant(nodes, include)
+    assert str(soup) == BODY
+    assert [html for _, html, _ in nodes] == [str(node) for node in soup.contents]
+
+
+TAGGED = """# Jane
+
+## Experience
+
+### Acme
+
+- Trained models {: tags="ai" }
+- Shipped
+
+## Side Projects {: tags="full" }
+
+Tracing
+"""
+
+
+def test_renders_drop_the_tags_attribute():
+    md_content = pipeline.preprocess_markdown(TAGGED)
+    raw = md_content + "\n<div>raw HTML sends it through BeautifulSoup</div>\n"
+    for source in (md_content, raw):
+        body = pipeline.markdown_to_body(source)
+        assert "tags=" not in body
+        assert "Trained models" in body and "Side Projects" in body
+    assert "tags=" not in pipeline.build_resume_html(TAGGED)
+
+
+def test_variants_get_the_tags_attribute():
+    md_content = pipeline.preprocess_markdown(TAGGED)
+    raw = md_content + "\n<div>raw HTML sends it through BeautifulSoup</div>\n"
+    for source in (md_content, raw):
+        body = pipeline.markdown_to_body(source, keep_tags=True)
+        assert '<li tags="ai">' in body
+        assert 'tags="full"' in body
+
+
+def test_tagged_and_untagged_bodies_are_cached_apart(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    assert "tags=" not in pipeline.build_resume_body(TAGGED, cache)
+    assert 'tags="ai"' in pipeline.build_resume_body(TAGGED, cache, keep_tags=True)
+    assert "tags=" not in pipeline.build_resume_body(TAGGED, cache)
+    assert cache.stage_hits["body"] == 1
@@ -0,0 +1,68 @@
+import asyncio
+import contextlib
+import os
+
+import watcher
+from pipeline import RenderOptions
+
+POST = "---\ntitle: Post\ndate: {date}\n---\n# Post\n\nBody text.\n"
+
+
+class FakeBackend:
+    """Prints a stand-in PDF, counting the calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def print_pdf(self, html_output, output_path=None, paper=None):
+        self.calls += 1
+        pdf = b"%PDF-1.4\n/CreationDate (D:20240101000000Z)\n%%EOF\n"
+        if output_path is not None:
+            with open(output_path, "wb") as file:
+                file.write(pdf)
+        return pdf
+
+
+async def watch_edits(tmp_path, monkeypatch, options, edits):
+    """Watch a post through each edit in turn; return how many times it printed."""
+    backend = FakeBackend()
+
+    @contextlib.asynccontextmanager
+    async def open_backend(options, size):
+        yield backend
+
+    monkeypatch.setattr(watcher, "open_backend", open_backend)
+    source = tmp_path / "post.md"
+    source.write_text(POST.format(date="2024-01-02"))
+    task = asyncio.create_task(
+        watcher.watch(str(source), poll_interval=0.01, debounce=0.01, options=options)
+    )
+    try:
+        await asyncio.sleep(0.1)
+        for number, text in enumerate(edits, 1):
+            source.write_text(text)
+            # Distinct mtimes even on coarse filesystem clocks
+            os.utime(source, ns=(number * 10**9, number * 10**9))
+            await asyncio.sleep(0.1)
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    return backend.calls
+
+
+def test_frontmatter_only_edit_is_skipped(tmp_path, monkeypatch):
+    edits = [POST.format(date="2025-06-07"), POST.format(date="2025-06-07") + "\n"]
+    calls = asyncio.run(watch_edits(tmp_path, monkeypatch, RenderOptions(), edits))
+    assert calls == 1
+
+
+def test_reproducible_rebuilds_when_the_date_moves(tmp_path, monkeypatch):
+    options = RenderOptions(reproducible=True)
+    edits = [
+        POST.format(date="2025-06-07"),
+        POST.format(date="2025-06-07").replace("Post\n", "Post \n", 1),
+    ]
+    calls = asyncio.run(watch_edits(tmp_path, monkeypatch, options, edits))
+    # The date change rebuilds; the second edit changes nothing that is printed
+    assert calls == 2
@@ -0,0 +1,303 @@
+"""Render tailored variants of one resume from a single parse.
+
+Headings, bullets and paragraphs in the markdown can carry tags with
+attr_list syntax:
+
+    ## 🚀 Side Projects {: tags="full" }
+    - Built a distributed tracing pipeline {: tags="backend ai" }
+
+A tagged heading covers everything up to the next heading of the same or a
+higher level. A variants file (TOML) names each output and the tags it
+includes; anything tagged with none of them is left out, untagged content is
+always kept, and a variant without ``include`` keeps everything:
+
+    [onepage]
+    include = ["core"]
+
+    [ai]
+    include = ["core", "ai"]
+    output = "resume-ai.pdf"
+
+    [full]
+
+The markdown is parsed and transformed once. Each variant is cut from that
+tree, copying only the parts that carry tags, and all of them print
+concurrently on pages of one browser.
+"""
+
+import asyncio
+import copy
+import inspect
+import json
+import os
+import re
+import time
+import tomllib
+from dataclasses import dataclass
+
+from bs4 import BeautifulSoup, Tag
+
+from pipeline import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RENDER_OPTIONS,
+    TAGS_ATTRIBUTE,
+    RenderResult,
+    build_resume_body,
+    build_resume_model,
+    code_digest,
+    open_backend,
+    outputs_fresh,
+    record_outputs,
+    render_key,
+    render_template,
+    report_result,
+    resolve_output_path,
+    write_outputs,
+)
+from profiling import profile_lane
+from render_cache import cache_key
+
+HEADING_LEVELS = {f"h{level}": level for level in range(1, 7)}
+
+
+@dataclass(frozen=True)
+class Variant:
+    """One tailored output: its name, the tags it keeps and where it goes."""
+
+    name: str
+    include: frozenset[str] | None = None
+    output: str | None = None
+
+
+def load_variants(path):
+    """Read the variants defined in a TOML file, in file order."""
+    with open(path, "rb") as file:
+        config = tomllib.load(file)
+    variants = []
+    for name, settings in config.items():
+        if not isinstance(settings, dict):
+            raise ValueError(f"{path}: [{name}] must be a table")
+        include = settings.get("include")
+        variants.append(
+            Variant(
+                name,
+                frozenset(include) if include is not None else None,
+                settings.get("output"),
+            )
+        )
+    if not variants:
+        raise ValueError(f"{path} defines no variants")
+    return variants
+
+
+def element_tags(element):
+    return set(re.split(r"[\s,]+", element.get(TAGS_ATTRIBUTE, "").strip())) - {""}
+
+
+def fragment_nodes(soup):
+    """The top-level nodes of a parsed body, each with its HTML and whether it has tags.
+
+    select_variant() reuses the HTML of every node it keeps untouched, so
+    the body is serialized once however many variants are cut from it.
+    """
+    nodes = []
+    for node in soup.contents:
+        tagged = isinstance(node, Tag) and (
+            node.has_attr(TAGS_ATTRIBUTE) or node.find(attrs={TAGS_ATTRIBUTE: True}) is not None
+        )
+        nodes.append((node, str(node), tagged))
+    return nodes
+
+
+def select_variant(nodes, include):
+    """The body HTML keeping only what include allows, from fragment_nodes().
+
+    Lists and headings left with nothing in them are dropped as well, so an
+    employer whose roles were all cut does not linger. The tags attributes
+    themselves never reach the output. Only the top-level nodes that carry
+    tags are copied and serialized again; the parsed tree is left as it is.
+    """
+    # (tag name, or None for text, and HTML) of each node kept
+    kept = []
+    removed = False
+    excluded_level = None
+    for node, html, tagged in nodes:
+        if not isinstance(node, Tag):
+            kept.append((None, html))
+            continue
+        level = HEADING_LEVELS.get(node.name)
+        if level is not None and excluded_level is not None and level <= excluded_level:
+            excluded_level = None
+        if excluded_level is None and include is not None:
+            tags = element_tags(node)
+            if tags and not tags & include and level is not None:
+                # The heading's whole section goes with it
+                excluded_level = level
+            elif tags and not tags & include:
+                removed = True
+                continue
+        if excluded_level is not None:
+            removed = True
+            continue
+        if tagged:
+            node = copy.copy(node)
+            if include is not None and _cut_tagged(node, include):
+                removed = True
+                for element in [node, *node.find_all(["ul", "ol"])]:
+                    if element.name in ("ul", "ol") and element.find("li") is None:
+                        element.decompose()
+                if node.decomposed:
+                    continue
+            for element in [node, *node.find_all(attrs={TAGS_ATTRIBUTE: True})]:
+                if element.has_attr(TAGS_ATTRIBUTE):
+                    del element[TAGS_ATTRIBUTE]
+            html = str(node)
+        kept.append((node.name, html))
+
+    if removed:
+        following = None
+        for index in reversed(range(len(kept))):
+            name = kept[index][0]
+            if name is None:
+                continue
+            level = HEADING_LEVELS.get(name)
+            if level is not None and level > 1:
+                next_level = HEADING_LEVELS.get(following) if following else 0
+                if next_level is not None and next_level <= level:
+                    del kept[index]
+                    continue
+            following = name
+    return "".join(html for _, html in kept)
+
+
+def _cut_tagged(node, include):
+    """Remove the tagged elements under node outside include; True if any were."""
+    removed = False
+    for element in node.find_all(attrs={TAGS_ATTRIBUTE: True}):
+        tags = element_tags(element)
+        if tags and not tags & include and not element.decomposed:
+            element.decompose()
+            removed = True
+    return removed
+
+
+def variant_paths(input_path, variants, output_dir=None):
+    """Output path of each variant: its ``output`` or <input>-<name>.pdf."""
+    base = resolve_output_path(input_path, output_dir=output_dir)
+    directory, stem = os.path.dirname(base), os.path.splitext(os.path.basename(base))[0]
+    paths = {}
+    for variant in variants:
+        path = os.path.join(directory, variant.output or f"{stem}-{variant.name}.pdf")
+        if path in paths.values():
+            raise ValueError(f"Variant {variant.name} writes to {path}, as another does")
+        paths[variant.name] = path
+    return paths
+
+
+def variant_key(md_content, variant, options):
+    """Cache key for one variant's PDF."""
+    include = sorted(variant.include) if variant.include is not None else None
+    return cache_key(
+        render_key(md_content, options),
+        "variant",
+        json.dumps(include),
+        code_digest(inspect.getmodule(Variant)),
+    )
+
+
+async def render_variants(
+    input_path,
+    variants,
+    output_dir=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    cache=None,
+    force=False,
+    options=DEFAULT_RENDER_OPTIONS,
+):
+    """Render every variant of input_path; yields a RenderResult for each.
+
+    Variants already current in cache are yielded as hits. The rest share
+    one parse and one browser, printing up to ``concurrency`` at once.
+    """
+    with open(input_path, encoding="utf-8") as file:
+        md_content = file.read()
+    paths = variant_paths(input_path, variants, output_dir)
+    keys = {variant.name: variant_key(md_content, variant, options) for variant in variants}
+
+    checked = cache is not None and not force
+    pending = []
+    for variant in variants:
+        output_path = paths[variant.name]
+        if checked and outputs_fresh(cache, output_path, keys[variant.name], options):
+            yield RenderResult(input_path, output_path, 0.0, cached=True, cache_checked=True)
+            continue
+        pending.append(variant)
+    if not pending:
+        return
+
+    start = time.perf_counter()
+    body = build_resume_body(md_content, cache, keep_tags=True)
+    resume = build_resume_model(md_content, cache, body)
+    nodes = fragment_nodes(BeautifulSoup(body, "html.parser"))
+    # Untagged resumes print the same body for every variant
+    tagged = any(node_tagged for _, _, node_tagged in nodes)
+    base_dir = os.path.dirname(os.path.abspath(input_path))
+    size = max(1, min(concurrency, len(pending)))
+
+    async with open_backend(options, size) as backend:
+
+        async def run(variant):
+            output_path = paths[variant.name]
+            try:
+                with profile_lane(variant.name):
+                    content = select_variant(nodes, variant.include) if tagged else body
+                    html_output = render_template(content, resume)
+                    report, written = await write_outputs(
+                        backend, md_content, html_output, output_path, options, base_dir, cache
+                    )
+                    if cache is not None:
+                        record_outputs(cache, written, keys[variant.name], options)
+            except Exception as e:
+                return RenderResult(input_path, output_path, time.perf_counter() - start, str(e))
+            return RenderResult(
+                input_path,
+                output_path,
+                time.perf_counter() - start,
+                cache_checked=checked,
+                optimized=report,
+                artifacts=list(written.values()),
+            )
+
+        tasks = [asyncio.create_task(run(variant)) for variant in pending]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if cache is not None:
+                cache.save()
+
+
+async def create_variants_async(
+    input_path,
+    variants_path,
+    output_dir=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    cache=None,
+    force=False,
+    options=DEFAULT_RENDER_OPTIONS,
+):
+    """Render the variants in variants_path, printing each result.
+
+    Returns the number of variants that failed.
+    """
+    variants = load_variants(variants_path)
+    failures = 0
+    async for result in render_variants(
+        input_path, variants, output_dir, concurrency, cache, force, options
+    ):
+        report_result(result)
+        failures += not result.ok
+    return failures
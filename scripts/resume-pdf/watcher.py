@@ -0,0 +1,129 @@
+"""Regenerate a PDF whenever its markdown source changes."""
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import time
+
+from pipeline import (
+    DEFAULT_RENDER_OPTIONS,
+    build_resume_page,
+    open_backend,
+    resolve_output_path,
+    write_outputs,
+)
+from reproducible import source_date
+
+# How often file modification times are checked
+DEFAULT_POLL_INTERVAL = 0.05
+
+# Quiet period required after the last change before rendering
+DEFAULT_DEBOUNCE = 0.1
+
+
+def snapshot(paths):
+    """Return (mtime, size) for each path, or None where a path is missing."""
+    state = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            # Editors that save by rename briefly leave no file behind
+            state.append(None)
+        else:
+            state.append((stat.st_mtime_ns, stat.st_size))
+    return state
+
+
+async def wait_for_change(paths, previous, poll_interval, debounce):
+    """Wait until paths change, then until they stay unchanged for debounce seconds."""
+    current = previous
+    while current == previous:
+        await asyncio.sleep(poll_interval)
+        current = snapshot(paths)
+
+    while True:
+        await asyncio.sleep(debounce)
+        settled = snapshot(paths)
+        if settled == current:
+            return settled
+        current = settled
+
+
+async def watch(
+    input_path,
+    output_path=None,
+    extra_paths=(),
+    poll_interval=DEFAULT_POLL_INTERVAL,
+    debounce=DEFAULT_DEBOUNCE,
+    options=DEFAULT_RENDER_OPTIONS,
+):
+    """Render input_path once, then again after every effective change.
+
+    Every format in ``options`` is written on each rebuild, as a one-off
+    render would. ``extra_paths`` are watched alongside the markdown
+    (stylesheets, images and the like). A save that leaves the generated
+    HTML and the extra files' contents untouched, such as touching the file
+    or editing only the frontmatter, is skipped, unless it moves the date a
+    reproducible PDF is stamped with.
+    """
+    output_path = resolve_output_path(input_path, output_path)
+    paths = [input_path, *extra_paths]
+    base_dir = os.path.dirname(os.path.abspath(input_path))
+    last_digest = None
+
+    async with open_backend(options, size=1) as backend:
+
+        async def rebuild():
+            nonlocal last_digest
+            start = time.perf_counter()
+            try:
+                with open(input_path, encoding="utf-8") as file:
+                    md_content = file.read()
+                html_output, resume = build_resume_page(md_content)
+                hasher = hashlib.sha256(html_output.encode("utf-8"))
+                if options.reproducible:
+                    hasher.update(str(source_date(md_content)).encode("ascii"))
+                for path in extra_paths:
+                    with contextlib.suppress(FileNotFoundError), open(path, "rb") as extra:
+                        hasher.update(extra.read())
+                digest = hasher.digest()
+                if digest == last_digest:
+                    print("No effective change, skipped")
+                    return
+                report, artifacts = await write_outputs(
+                    backend, md_content, html_output, output_path, options, base_dir, resume=resume
+                )
+            except Exception as e:
+                print(f"Error generating PDF: {str(e)}")
+                return
+            last_digest = digest
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            optimized = f", {report.summary()}" if report is not None else ""
+            print(f"PDF generated: {output_path} ({elapsed_ms:.0f} ms{optimized})")
+            for path in artifacts.values():
+                if path != output_path:
+                    print(f"  {path}")
+
+        state = snapshot(paths)
+        await rebuild()
+        print(f"Watching {', '.join(paths)} for changes (Ctrl-C to stop)")
+        while True:
+            state = await wait_for_change(paths, state, poll_interval, debounce)
+            await rebuild()
+
+
+def run_watch(input_path, output_path=None, extra_paths=(), options=DEFAULT_RENDER_OPTIONS):
+    """Sync wrapper for watch() that exits quietly on Ctrl-C."""
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(
+            watch(
+                input_path,
+                output_path,
+                extra_paths,
+                DEFAULT_POLL_INTERVAL,
+                DEFAULT_DEBOUNCE,
+                options,
+            )
+        )
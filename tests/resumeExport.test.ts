@@ -0,0 +1,62 @@
+// The resume page loads the model resume-pdf exports, but only while its
+// source hash matches the markdown; otherwise it parses the markdown itself.
+
+import { createHash } from 'node:crypto'
+import { promises as fs } from 'node:fs'
+import os from 'node:os'
+import path from 'node:path'
+import { afterEach, beforeEach, describe, expect, it } from 'vitest'
+import { loadExport, loadResume } from '@/lib/resumeExport'
+import { parseResume } from '@/lib/resumeParser'
+
+const markdown = ['---', 'title: Resume', '---', '# Jane Doe', '', '## Summary', '', 'Hello.'].join('\n')
+
+const exported = {
+  contact: {},
+  experience: [],
+  name: 'Jane Exported',
+  projects: [],
+  skills: {},
+  summary: 'From the export.',
+  tagline: '',
+}
+
+function sha256(text: string) {
+  return createHash('sha256').update(text).digest('hex')
+}
+
+describe('resume export loading', () => {
+  let dir: string
+  let jsonPath: string
+
+  beforeEach(async () => {
+    dir = await fs.mkdtemp(path.join(os.tmpdir(), 'resume-export-'))
+    jsonPath = path.join(dir, 'resume.json')
+  })
+
+  afterEach(async () => {
+    await fs.rm(dir, { force: true, recursive: true })
+  })
+
+  it('returns the export when its source hash matches the markdown', async () => {
+    await fs.writeFile(jsonPath, JSON.stringify({ source: sha256(markdown), ...exported }))
+
+    expect(await loadExport(jsonPath, markdown)).toEqual(exported)
+    expect(await loadResume(jsonPath, markdown)).toEqual(exported)
+  })
+
+  it('falls back to parsing the markdown when the export is stale', async () => {
+    await fs.writeFile(jsonPath, JSON.stringify({ source: sha256(`${markdown}\nedited`), ...exported }))
+
+    expect(await loadExport(jsonPath, markdown)).toBeNull()
+
+    const resume = await loadResume(jsonPath, markdown)
+    expect(resume).toEqual(parseResume(markdown.replace(/^---[\s\S]*?---\n*/, '')))
+    expect(resume.name).toBe('Jane Doe')
+  })
+
+  it('falls back to parsing the markdown when there is no export', async () => {
+    expect(await loadExport(jsonPath, markdown)).toBeNull()
+    expect((await loadResume(jsonPath, markdown)).name).toBe('Jane Doe')
+  })
+})